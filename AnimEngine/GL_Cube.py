@@ -18,6 +18,7 @@ Nous remercions Rabbit76 pour sa contribution.
 
 from OpenGL.GL import *
 from OpenGL.GLU import *
+import numpy
 
 #Données de représentation 3D d'un cube
 edges = ((0,1),(0,3),(0,4),(2,1),(2,3),(2,7),(6,3),(6,4),(6,7),(5,1),(5,4),(5,7))
@@ -26,22 +27,122 @@ vertices = (( 1, -1, -1), ( 1,  1, -1), (-1,  1, -1), (-1, -1, -1),
 ( 1, -1,  1), ( 1,  1,  1), (-1, -1,  1), (-1,  1,  1))
 colors = ((1, 0, 0), (0, 1, 0), (1, 0.5, 0), (1, 1, 0), (1, 1, 1), (0, 0, 1))
 
+class CubeSet():
+    """
+    Classe modélisant l'état de plusieurs cubes sous forme de tableaux (un élément par cube) :
+    rotations (n x 3 x 3), positions (n x 3) et couleurs des faces (n x 6 x 3).
+    Les mouvements et les matrices de placement sont calculés pour tous les cubes à la fois.
+    """
+    def __init__(self, ids:list[tuple[int]], scale:float) -> None:
+        """
+        Instancie un objet CubeSet.
+        Paramètres:     ids (list[tuple[int]]) = position initiale de chaque cube.
+                        scale (float) = taille dans l'espace 3D.
+        Retourne:       rien.
+        """
+        self.scale = scale
+        self.init_pos = numpy.array(ids, dtype=numpy.int64).reshape(-1, 3)
+        self.pos = self.init_pos.copy()
+        self.rot = numpy.repeat(numpy.eye(3, dtype=numpy.int64)[None], len(self.pos), axis=0)
+        self.colors = numpy.repeat(numpy.array(colors, dtype=numpy.float32)[None], len(self.pos), axis=0)
+
+    def __len__(self) -> int:
+        return len(self.pos)
+
+    def affected(self, axis:int, slice:int) -> numpy.ndarray:
+        """
+        Renvoie le masque des cubes appartenant à une tranche.
+        Paramètres:     axis (int) = axe.
+                        slice (int) = tranche.
+        Retourne:       (numpy.ndarray) = tableau de booléens (un par cube).
+        """
+        return self.pos[:, axis] == slice
+
+    def update(self, axis:int, slice:int, dir:int, mask:numpy.ndarray|None=None) -> None:
+        """
+        Tourne d'un quart de tour les cubes d'une tranche.
+        Paramètres:     axis (int) = axe de rotation
+                        slice (int) = tranche en animation
+                        dir (int) = sens de rotation (1 ou -1)
+                        mask (numpy.ndarray|None) = cubes concernés (parmi ceux de la tranche) ; tous si None.
+        Retourne:       rien.
+        """
+        m = self.affected(axis, slice)
+        if mask is not None:
+            m &= mask
+        i, j = (axis+1) % 3, (axis+2) % 3
+        ri, rj = self.rot[m, :, i], self.rot[m, :, j]
+        self.rot[m, :, i], self.rot[m, :, j] = -rj*dir, ri*dir
+        pi, pj = self.pos[m, i], self.pos[m, j]
+        self.pos[m, i] = pj if dir < 0 else 3 - 1 - pj
+        self.pos[m, j] = pi if dir > 0 else 3 - 1 - pi
+
+    def model_matrices(self) -> numpy.ndarray:
+        """
+        Calcule les matrices de placement de tous les cubes.
+        Paramètres:     aucun.
+        Retourne:       (numpy.ndarray) = tableau n x 16 (matrices 4x4, ordre OpenGL).
+        """
+        m = numpy.zeros((len(self.pos), 4, 4), dtype=numpy.float32)
+        m[:, :3, :3] = self.rot*self.scale
+        m[:, 3, :3] = (self.pos-(3-1)/2)*2.1*self.scale
+        m[:, 3, 3] = 1
+        return m.reshape(-1, 16)
+
+    def draw(self, surf:tuple[tuple], axis:int, angle:float, spins:numpy.ndarray) -> None:
+        """
+        Dessine tous les cubes avec OpenGL, en mode immédiat.
+        Paramètres:     surf (tuple[tuple]) = surfaces du cube
+                        axis (int) = axe de rotation
+                        angle (float) = angle de rotation des tranches
+                        spins (numpy.ndarray) = part de l'angle appliquée à chaque cube (0 si immobile, signe = sens)
+        Retourne:       rien.
+        """
+        models = self.model_matrices()
+        rotation_axis = [1 if i==axis else 0 for i in range(3)]
+        for n in range(len(self.pos)):
+            glPushMatrix()
+            if spins[n]:
+                glRotatef(angle*spins[n], *rotation_axis)
+            glMultMatrixf(models[n])
+            glBegin(GL_QUADS)
+            for i in range(len(surf)):
+                glColor3fv(self.colors[n, i])
+                for j in surf[i]:
+                    glVertex3fv(vertices[j])
+            glEnd()
+            glPopMatrix()
+
 class Cube():
     """
-    Classe modélisant un cube unique en 3D
+    Classe modélisant un cube unique en 3D.
+    Ses données sont une ligne des tableaux d'un objet CubeSet (partagé par les 27 cubes d'un Rubik's Cube).
     """
-    def __init__(self, id:int, scale:float) -> None:
+    def __init__(self, id:int, scale:float, cube_set:CubeSet|None=None, index:int=0) -> None:
         """
         Instancie un objet Cube.
         Paramètres:     id (int) = identifiant du cube.
                         scale (float) = taille dans l'espace 3D.
+                        cube_set (CubeSet|None) = tableaux contenant les données du cube ; tableaux propres au cube si None.
+                        index (int) = indice du cube dans cube_set.
         Retourne:       rien.
         """
         self.scale = scale
+        self.set = CubeSet([id], scale) if cube_set is None else cube_set
+        self.index = 0 if cube_set is None else index
         self.init_i = [*id]
-        self.current_i = [*id]
-        self.rot = [[1 if i==j else 0 for i in range(3)] for j in range(3)]
-        self._colors = colors
+
+    @property
+    def current_i(self) -> list:
+        return self.set.pos[self.index].tolist()
+
+    @property
+    def rot(self) -> list:
+        return self.set.rot[self.index].tolist()
+
+    @property
+    def _colors(self) -> tuple:
+        return tuple(tuple(c) for c in self.set.colors[self.index].tolist())
 
     def isAffected(self, axis:int, slice:int) -> None:
         """
@@ -50,7 +151,7 @@ class Cube():
                         slice (int) = tranche en animation.
         Retourne:       (bool) = True si le cube est affecté à un axe, False sinon.
         """
-        return self.current_i[axis] == slice
+        return self.set.pos[self.index, axis] == slice
 
     def get_position(self) -> list:
         """
@@ -68,14 +169,9 @@ class Cube():
                         dir (int) = sens de rotation (1 ou -1)
         Retourne:       rien.
         """
-        if not self.isAffected(axis, slice):
-            return
-        i, j = (axis+1) % 3, (axis+2) % 3
-        for k in range(3):
-            self.rot[k][i], self.rot[k][j] = -self.rot[k][j]*dir, self.rot[k][i]*dir
-        self.current_i[i], self.current_i[j] = (
-            self.current_i[j] if dir < 0 else 3 - 1 - self.current_i[j],
-            self.current_i[i] if dir > 0 else 3 - 1 - self.current_i[i] )
+        mask = numpy.zeros(len(self.set), dtype=bool)
+        mask[self.index] = True
+        self.set.update(axis, slice, dir, mask)
 
     def transformMat(self) -> list:
         """
@@ -94,7 +190,7 @@ class Cube():
                         Exemple :  ((1, 0, 0), (0, 1, 0), (1, 0.5, 0), (1, 1, 0), (1, 1, 1), (0, 0, 1))
         Retourne:       rien.
         """
-        self._colors = _colors
+        self.set.colors[self.index] = _colors
 
     def get_color(self) -> tuple[tuple]:
         """
@@ -121,7 +217,7 @@ class Cube():
         glMultMatrixf(self.transformMat())
         glBegin(GL_QUADS)
         for i in range(len(surf)):
-            glColor3fv(self._colors[i])
+            glColor3fv(self.set.colors[self.index, i])
             for j in surf[i]:
                 glVertex3fv(vertices[j])
         glEnd()
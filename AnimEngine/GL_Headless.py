@@ -0,0 +1,263 @@
+"""
+Rendu du Rubik's Cube sans fenêtre ni carte graphique, pour produire des vidéos de résolution en série (serveur).
+Les 27 cubes d'un EntireCube sont rastérisés avec numpy (tampon de profondeur), avec la même caméra que AnimEngine.main
+(gluPerspective(45, ...), cube à 40 unités), puis les images sont envoyées au fur et à mesure à une vidéo ou à des fichiers PNG.
+L'animation suit l'horloge de EntireCube, avancée d'une image à chaque fois : la vidéo a la durée de la lecture réelle.
+Plusieurs séquences peuvent être rendues en parallèle (un processus par séquence, voir render_many).
+"""
+
+from AnimEngine import EntireCube
+from AnimEngine.GL_Cube import surfaces, vertices
+
+from functools import partial
+import math
+import multiprocessing
+import os
+import cv2
+import numpy
+
+SOLVED_MATRIX = [[[c]*3 for _ in range(3)] for c in "yrgobw"] # cube résolu (ordre U, L, F, R, B, D)
+
+# Triangles d'un cube : deux par face (sommets des quadrilatères de GL_Cube), et face de chaque triangle
+_TRIANGLES = numpy.array([[quad[j] for j in t] for quad in surfaces for t in ((0, 1, 2), (0, 2, 3))])
+_TRIANGLE_FACES = numpy.repeat(numpy.arange(len(surfaces)), 2)
+_VERTICES = numpy.hstack([numpy.array(vertices, dtype=numpy.float64), numpy.ones((len(vertices), 1))])
+
+def perspective(fovy:float, aspect:float, near:float, far:float) -> numpy.ndarray:
+    """
+    Matrice de projection, identique à celle de gluPerspective.
+    Paramètres:     fovy (float) = angle de vue vertical (degrés).
+                    aspect (float) = largeur / hauteur.
+                    near (float) = distance du plan proche.
+                    far (float) = distance du plan éloigné.
+    Retourne:       (numpy.ndarray) = matrice 4x4.
+    """
+    f = 1/math.tan(math.radians(fovy)/2)
+    return numpy.array([[f/aspect, 0, 0, 0],
+                        [0, f, 0, 0],
+                        [0, 0, (far+near)/(near-far), 2*far*near/(near-far)],
+                        [0, 0, -1, 0]])
+
+def rotation(angle:float, axis:tuple[float]) -> numpy.ndarray:
+    """
+    Matrice de rotation, identique à celle de glRotatef.
+    Paramètres:     angle (float) = angle (degrés).
+                    axis (tuple[float]) = vecteur unitaire de l'axe.
+    Retourne:       (numpy.ndarray) = matrice 4x4.
+    """
+    x, y, z = axis
+    c, s = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+    k = 1 - c
+    return numpy.array([[x*x*k+c, x*y*k-z*s, x*z*k+y*s, 0],
+                        [y*x*k+z*s, y*y*k+c, y*z*k-x*s, 0],
+                        [z*x*k-y*s, z*y*k+x*s, z*z*k+c, 0],
+                        [0, 0, 0, 1]])
+
+def camera(x_rot:float, y_rot:float, z_rot:float) -> numpy.ndarray:
+    """
+    Matrice de la caméra, identique à celle de EntireCube.load_camera.
+    Paramètres:     x_rot (float) = Rotation sur l'axe x
+                    y_rot (float) = Rotation sur l'axe y
+                    z_rot (float) = Rotation sur l'axe z
+    Retourne:       (numpy.ndarray) = matrice 4x4.
+    """
+    translation = numpy.eye(4)
+    translation[2, 3] = -40
+    return translation @ rotation(z_rot, (0, 0, 1)) @ rotation(y_rot, (0, 1, 0)) @ rotation(x_rot, (1, 0, 0))
+
+class SoftwareRenderer():
+    """
+    Classe modélisant le rendu logiciel (numpy) d'un EntireCube dans une image.
+    """
+    def __init__(self, width:int=640, height:int=480) -> None:
+        """
+        Instancie un objet SoftwareRenderer.
+        Paramètres:     width (int) = largeur de l'image (pixels).
+                        height (int) = hauteur de l'image (pixels).
+        Retourne:       rien.
+        """
+        self.width, self.height = width, height
+        self.projection = perspective(45, width/height, 0.1, 50.0)
+
+    def transforms(self, cube:EntireCube, alpha:float=1.0) -> numpy.ndarray:
+        """
+        Calcule la transformation complète (projection, caméra, tranche animée, placement) de chaque cube.
+        Paramètres:     cube (EntireCube) = Rubik's Cube à dessiner.
+                        alpha (float) = position entre les deux derniers pas de simulation (voir EntireCube.interpolate).
+        Retourne:       (numpy.ndarray) = tableau 27x4x4.
+        """
+        x_rot, y_rot, z_rot, angle = cube.interpolate(alpha)
+        view = self.projection @ camera(x_rot, y_rot, z_rot)
+        models = cube.state.model_matrices().astype(numpy.float64).reshape(-1, 4, 4).transpose(0, 2, 1) # ordre OpenGL -> matrices
+        spins = cube.get_cube_spins()
+        axis = [1 if i == (cube.actions[0][0] if cube.actions else 0) else 0 for i in range(3)]
+        slices = numpy.array([rotation(angle*spin, axis) if spin else numpy.eye(4) for spin in spins])
+        return view @ slices @ models
+
+    def render(self, cube:EntireCube, alpha:float=1.0) -> numpy.ndarray:
+        """
+        Dessine un Rubik's Cube.
+        Paramètres:     cube (EntireCube) = Rubik's Cube à dessiner.
+                        alpha (float) = position entre les deux derniers pas de simulation (voir EntireCube.interpolate).
+        Retourne:       (numpy.ndarray) = image RGB (hauteur x largeur x 3, octets), première ligne en haut.
+        """
+        clip = numpy.einsum("nij,vj->nvi", self.transforms(cube, alpha), _VERTICES) # 27x8x4
+        ndc = clip[..., :3] / clip[..., 3:]
+        screen = numpy.empty_like(ndc)
+        screen[..., 0] = (ndc[..., 0]+1) * self.width/2
+        screen[..., 1] = (1-ndc[..., 1]) * self.height/2
+        screen[..., 2] = ndc[..., 2]
+        triangles = screen[:, _TRIANGLES].reshape(-1, 3, 3) # 324 triangles, 3 sommets (x, y, profondeur)
+        colors = numpy.rint(cube.state.colors[:, _TRIANGLE_FACES]*255).astype(numpy.uint8).reshape(-1, 3)
+
+        # Élimination des faces arrière (sommets dans le sens inverse à l'écran)
+        (x0, y0), (x1, y1), (x2, y2) = (triangles[:, i, :2].T for i in range(3))
+        area = (x1-x0)*(y2-y0) - (x2-x0)*(y1-y0)
+        front = area > 1e-9
+
+        image = numpy.zeros((self.height, self.width, 3), dtype=numpy.uint8)
+        depth = numpy.full((self.height, self.width), numpy.inf)
+        for t in numpy.nonzero(front)[0]:
+            self._fill(image, depth, triangles[t], area[t], colors[t])
+        return image
+
+    def _fill(self, image:numpy.ndarray, depth:numpy.ndarray, triangle:numpy.ndarray, area:float, color:numpy.ndarray) -> None:
+        """
+        Remplit un triangle dans l'image, aux pixels où il est plus proche que ce qui est déjà dessiné.
+        Paramètres:     image (numpy.ndarray) = image RGB.
+                        depth (numpy.ndarray) = tampon de profondeur.
+                        triangle (numpy.ndarray) = sommets (3x3 : x, y, profondeur), en pixels.
+                        area (float) = double de l'aire signée du triangle.
+                        color (numpy.ndarray) = couleur RGB.
+        Retourne:       rien.
+        """
+        x_min, y_min = numpy.maximum(numpy.floor(triangle[:, :2].min(axis=0)).astype(int), 0)
+        x_max = min(int(math.ceil(triangle[:, 0].max())), self.width)
+        y_max = min(int(math.ceil(triangle[:, 1].max())), self.height)
+        if x_min >= x_max or y_min >= y_max:
+            return
+        x = numpy.arange(x_min, x_max) + 0.5 # centres des pixels
+        y = (numpy.arange(y_min, y_max) + 0.5)[:, None]
+        (x0, y0, z0), (x1, y1, z1), (x2, y2, z2) = triangle
+        w0 = ((x1-x)*(y2-y) - (x2-x)*(y1-y)) / area # coordonnées barycentriques
+        w1 = ((x2-x)*(y0-y) - (x0-x)*(y2-y)) / area
+        w2 = 1 - w0 - w1
+        z = w0*z0 + w1*z1 + w2*z2
+        region = depth[y_min:y_max, x_min:x_max]
+        visible = (w0 >= 0) & (w1 >= 0) & (w2 >= 0) & (z < region)
+        region[visible] = z[visible]
+        image[y_min:y_max, x_min:x_max][visible] = color
+
+class FrameWriter():
+    """
+    Classe modélisant la sortie des images : vidéo (OpenCV) ou suite de fichiers PNG.
+    """
+    def __init__(self, path:str, fps:float, size:tuple[int]) -> None:
+        """
+        Instancie un objet FrameWriter.
+        Paramètres:     path (str) = fichier vidéo (.mp4, .avi...), ou modèle de fichiers PNG ("images/%05d.png" ;
+                                     "images/cube.png" donne images/cube_00000.png, images/cube_00001.png...) ;
+                                     le dossier est créé s'il n'existe pas.
+                        fps (float) = images par seconde de la vidéo.
+                        size (tuple[int]) = largeur et hauteur des images.
+        Retourne:       rien.
+        """
+        self.count = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True) # dossier de sortie créé au besoin
+        if path.lower().endswith(".png"):
+            self.video = None
+            self.path = path if "%" in path else path[:-4] + "_%05d.png"
+        else:
+            self.video = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, size)
+            if not self.video.isOpened():
+                raise ValueError(f"Impossible d'écrire la vidéo : {path}")
+            self.path = path
+
+    def write(self, frame:numpy.ndarray) -> None:
+        """
+        Ajoute une image.
+        Paramètres:     frame (numpy.ndarray) = image RGB.
+        Retourne:       rien.
+        """
+        bgr = numpy.ascontiguousarray(frame[:, :, ::-1]) # OpenCV : ordre BGR
+        if self.video is not None:
+            self.video.write(bgr)
+        elif not cv2.imwrite(self.path % self.count, bgr):
+            raise ValueError(f"Impossible d'écrire l'image : {self.path % self.count}")
+        self.count += 1
+
+    def close(self) -> None:
+        """
+        Termine la vidéo.
+        Paramètres:     aucun.
+        Retourne:       rien.
+        """
+        if self.video is not None:
+            self.video.release()
+
+def render_sequence(path:str, sequence:list[str], matrix:list|None=None, size:tuple[int]=(640, 480), fps:float=30,
+                    anim_speed:int=2, view:tuple[float]=(30, 45, 0), animation_mode:int=3, camera_speed:float=0.15,
+                    hold:float=0.5) -> int:
+    """
+    Rend l'animation d'une séquence de mouvements dans une vidéo ou des fichiers PNG.
+    Paramètres:     path (str) = fichier de sortie (voir FrameWriter).
+                    sequence (list[str]) = mouvements à animer (voir EntireCube.play_sequence).
+                    matrix (list|None) = représentation en liste de matrices du cube de départ ; cube résolu si None.
+                    size (tuple[int]) = largeur et hauteur des images.
+                    fps (float) = images par seconde.
+                    anim_speed (int) = vitesse d'animation (comme EntireCube.play_sequence non bloquant).
+                    view (tuple[float]) = angles initiaux de la caméra (x, y, z).
+                    animation_mode (int) = animation de caméra (voir EntireCube.set_animation_mode).
+                    camera_speed (float) = vitesse de la caméra.
+                    hold (float) = durée (secondes) de l'image finale.
+    Retourne:       (int) = nombre d'images écrites.
+    """
+    cube = EntireCube(2)
+    cube.load_color_matrix(SOLVED_MATRIX if matrix is None else matrix)
+    cube.set_camera_mode("animation")
+    cube.set_animation_mode(animation_mode, camera_speed)
+    cube.ang_x, cube.ang_y, cube.ang_z = view
+    cube.previous = (*view, 0)
+    time = [0.0]
+    cube.clock = lambda: time[0] # horloge avancée d'une image à chaque fois
+    if cube.play_sequence(sequence, anim_speed, awaited=False) == -1:
+        raise ValueError(f"Séquence invalide : {' '.join(sequence)}")
+
+    renderer = SoftwareRenderer(*size)
+    writer = FrameWriter(path, fps, size)
+    try:
+        end = None
+        while end is None or time[0] < end:
+            writer.write(renderer.render(cube, cube.advance()))
+            time[0] += 1/fps
+            if end is None and not cube.animate and cube.async_slices_moves == []:
+                end = time[0] + hold
+    finally:
+        writer.close()
+    return writer.count
+
+def _render_job(job:tuple, options:dict) -> int:
+    """
+    Rend une séquence dans un processus de render_many.
+    Paramètres:     job (tuple) = (fichier de sortie, séquence) ou (fichier de sortie, séquence, matrice de départ).
+                    options (dict) = paramètres supplémentaires de render_sequence.
+    Retourne:       (int) = nombre d'images écrites.
+    """
+    return render_sequence(*job, **options)
+
+def render_many(jobs:list[tuple], workers:int|None=None, **options) -> list[int]:
+    """
+    Rend plusieurs séquences en parallèle, une par processus à la fois.
+    Paramètres:     jobs (list[tuple]) = (fichier de sortie, séquence) ou (fichier de sortie, séquence, matrice de départ).
+                    workers (int|None) = nombre de processus ; nombre de processeurs si None.
+                    options = paramètres communs de render_sequence (size, fps, anim_speed...).
+    Retourne:       (list[int]) = nombre d'images écrites pour chaque séquence.
+    """
+    if workers == 1:
+        return [_render_job(job, options) for job in jobs]
+    pool = multiprocessing.Pool(workers)
+    try:
+        return pool.map(partial(_render_job, options=options), jobs, chunksize=1)
+    finally: # fermeture sans terminate() : SDL (pygame) détourne SIGTERM dans les processus
+        pool.close()
+        pool.join()
@@ -0,0 +1,173 @@
+"""
+Rendu du Rubik's Cube sur la carte graphique (mode "retenu").
+La géométrie d'un cube est envoyée une seule fois dans un VBO ; la matrice de placement, les 6 couleurs
+et la participation à la rotation de tranche de chacun des 27 cubes sont stockées dans un second VBO (instanciation).
+La rotation de la tranche animée est un uniform du shader : une image se dessine en quelques appels OpenGL.
+Si le contexte OpenGL ne le permet pas (OpenGL < 3.3), create() renvoie None et le rendu immédiat de GL_Cube est utilisé.
+"""
+
+from OpenGL.GL import *
+from OpenGL.GL import shaders
+import ctypes
+import math
+import numpy
+
+from AnimEngine.GL_Cube import surfaces, vertices
+
+VERTEX_SHADER = """
+#version 130
+in vec3 position;
+in float face;
+in vec4 model0, model1, model2, model3;
+in vec3 color0, color1, color2, color3, color4, color5;
+in float spin;
+uniform vec3 axis;
+uniform float angle;
+out vec3 v_color;
+
+mat4 rotation(vec3 a, float t) {
+    float c = cos(t), s = sin(t), k = 1.0 - c;
+    return mat4(a.x*a.x*k + c,     a.y*a.x*k + a.z*s, a.z*a.x*k - a.y*s, 0.0,
+                a.x*a.y*k - a.z*s, a.y*a.y*k + c,     a.z*a.y*k + a.x*s, 0.0,
+                a.x*a.z*k + a.y*s, a.y*a.z*k - a.x*s, a.z*a.z*k + c,     0.0,
+                0.0,               0.0,               0.0,               1.0);
+}
+
+void main() {
+    vec3 colors[6] = vec3[6](color0, color1, color2, color3, color4, color5);
+    v_color = colors[int(face + 0.5)];
+    mat4 model = mat4(model0, model1, model2, model3);
+    gl_Position = gl_ModelViewProjectionMatrix * rotation(axis, angle*spin) * model * vec4(position, 1.0);
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 130
+in vec3 v_color;
+
+void main() {
+    gl_FragColor = vec4(v_color, 1.0);
+}
+"""
+
+INSTANCE_FLOATS = 16 + 18 + 1 # matrice 4x4, 6 couleurs RGB, participation à la rotation
+AXES = ((1.0, 0.0, 0.0), (0.0, 1.0, 0.0), (0.0, 0.0, 1.0))
+
+def _geometry() -> numpy.ndarray:
+    """
+    Construit les triangles d'un cube : pour chaque sommet, sa position et le numéro de sa face.
+    Paramètres:     aucun.
+    Retourne:       (numpy.ndarray) = tableau 36x4 (x, y, z, face).
+    """
+    data = []
+    for face, quad in enumerate(surfaces):
+        for j in (0, 1, 2, 0, 2, 3): # un quadrilatère = deux triangles
+            data.append((*vertices[quad[j]], face))
+    return numpy.array(data, dtype=numpy.float32)
+
+class InstancedRenderer():
+    """
+    Classe modélisant le rendu instancié des 27 cubes.
+    """
+    def __init__(self, count:int=27) -> None:
+        """
+        Instancie un objet InstancedRenderer : compile les shaders et crée les buffers (contexte OpenGL requis).
+        Paramètres:     count (int) = nombre de cubes.
+        Retourne:       rien.
+        """
+        self.count = count
+        self.program = shaders.compileProgram(
+            shaders.compileShader(VERTEX_SHADER, GL_VERTEX_SHADER),
+            shaders.compileShader(FRAGMENT_SHADER, GL_FRAGMENT_SHADER))
+        self.u_axis = glGetUniformLocation(self.program, "axis")
+        self.u_angle = glGetUniformLocation(self.program, "angle")
+        self.uploaded = None # identifiant des données envoyées (voir upload)
+
+        self.vao = glGenVertexArrays(1)
+        glBindVertexArray(self.vao)
+        geometry = _geometry()
+        self.vertex_count = len(geometry)
+        self.geometry_vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.geometry_vbo)
+        glBufferData(GL_ARRAY_BUFFER, geometry.nbytes, geometry, GL_STATIC_DRAW)
+        self._attribute("position", 3, 16, 0, 0)
+        self._attribute("face", 1, 16, 12, 0)
+
+        self.instance_vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, self.instance_vbo)
+        glBufferData(GL_ARRAY_BUFFER, count*INSTANCE_FLOATS*4, None, GL_DYNAMIC_DRAW)
+        stride = INSTANCE_FLOATS*4
+        for i in range(4):
+            self._attribute(f"model{i}", 4, stride, 16*i, 1)
+        for i in range(6):
+            self._attribute(f"color{i}", 3, stride, 64 + 12*i, 1)
+        self._attribute("spin", 1, stride, 136, 1)
+        glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def _attribute(self, name:str, size:int, stride:int, offset:int, divisor:int) -> None:
+        """
+        Associe un attribut du shader au buffer lié.
+        Paramètres:     name (str) = nom de l'attribut.
+                        size (int) = nombre de flottants.
+                        stride (int) = taille d'un élément du buffer (octets).
+                        offset (int) = position de l'attribut dans l'élément (octets).
+                        divisor (int) = 0 : par sommet ; 1 : par cube.
+        Retourne:       rien.
+        """
+        location = glGetAttribLocation(self.program, name)
+        if location < 0: # attribut inutilisé, supprimé par le compilateur
+            return
+        glEnableVertexAttribArray(location)
+        glVertexAttribPointer(location, size, GL_FLOAT, GL_FALSE, stride, ctypes.c_void_p(offset))
+        glVertexAttribDivisor(location, divisor)
+
+    def upload(self, models:numpy.ndarray, colors:numpy.ndarray, spins:numpy.ndarray, key:object=None) -> None:
+        """
+        Envoie les données des cubes à la carte graphique, si elles ont changé depuis le dernier envoi.
+        Paramètres:     models (numpy.ndarray) = matrices de placement (count x 16, ordre OpenGL).
+                        colors (numpy.ndarray) = couleurs des faces (count x 6 x 3).
+                        spins (numpy.ndarray) = participation de chaque cube à la rotation de tranche (count), 0 si immobile.
+                        key (object) = identifiant des données ; pas d'envoi s'il est égal au précédent (None : envoi systématique).
+        Retourne:       rien.
+        """
+        if key is not None and key == self.uploaded:
+            return
+        data = numpy.empty((self.count, INSTANCE_FLOATS), dtype=numpy.float32)
+        data[:, :16] = models
+        data[:, 16:34] = numpy.reshape(colors, (self.count, 18))
+        data[:, 34] = spins
+        glBindBuffer(GL_ARRAY_BUFFER, self.instance_vbo)
+        glBufferSubData(GL_ARRAY_BUFFER, 0, data.nbytes, data)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        self.uploaded = key
+
+    def draw(self, axis:int, angle:float) -> None:
+        """
+        Dessine les cubes.
+        Paramètres:     axis (int) = axe de la rotation de tranche.
+                        angle (float) = angle de rotation (degrés), multiplié par la participation de chaque cube.
+        Retourne:       rien.
+        """
+        glUseProgram(self.program)
+        glUniform3f(self.u_axis, *AXES[axis])
+        glUniform1f(self.u_angle, math.radians(angle))
+        glBindVertexArray(self.vao)
+        glDrawArraysInstanced(GL_TRIANGLES, 0, self.vertex_count, self.count)
+        glBindVertexArray(0)
+        glUseProgram(0)
+
+def create(count:int=27) -> InstancedRenderer|None:
+    """
+    Crée le rendu instancié si le contexte OpenGL le permet.
+    Paramètres:     count (int) = nombre de cubes.
+    Retourne:       (InstancedRenderer|None) = rendu instancié, ou None (utiliser le rendu immédiat).
+    """
+    try:
+        version = glGetString(GL_VERSION)
+        major, minor = (int(x) for x in version.split()[0].split(b".")[:2])
+        if (major, minor) < (3, 3): # glVertexAttribDivisor : OpenGL 3.3
+            return None
+        return InstancedRenderer(count)
+    except Exception: # pilote ou PyOpenGL sans shaders / instanciation
+        return None
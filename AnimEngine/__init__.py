@@ -1,7 +1,9 @@
 """
 Regroupe les scripts nécessaires à l'affichage d'un Rubik's Cube en 3D.
 __init__.py : contient les fonctions nécessaires à l'intégration des mouvements, de l'affichage  du cube et des entrées au clavier.
-GL_Cube.py : contient les éléments permettant le rendu d'un cube sur OpenGL, dont la couleur et le placement.
+GL_Cube.py : contient les éléments permettant le rendu d'un cube sur OpenGL, dont la couleur et le placement (données des 27 cubes en tableaux : CubeSet).
+GL_Renderer.py : rendu des 27 cubes sur la carte graphique (VBO, instanciation, shader) ; le rendu immédiat de GL_Cube sert de repli.
+GL_Headless.py : rendu sans fenêtre ni carte graphique (rastérisation numpy) des animations, vers une vidéo ou des images PNG ; rendu de plusieurs séquences en parallèle.
 """
 
 import pygame
@@ -9,7 +11,50 @@ from pygame.locals import *
 from OpenGL.GL import *
 from OpenGL.GLU import *
 from AnimEngine.GL_Cube import *
+from AnimEngine import GL_Renderer
 import Musique
+import numpy
+import itertools
+import time
+
+renderer = None # rendu sur carte graphique (GL_Renderer.InstancedRenderer), None : rendu immédiat
+_versions = itertools.count(1) # numéros de version uniques, tous objets EntireCube confondus
+display_version = 0 # change à chaque création de fenêtre (tout est à redessiner)
+
+# Simulation à pas fixe, indépendante du nombre d'images par seconde
+STEP_RATE = 60 # pas de simulation par seconde : animate_speed et camera_speed sont exprimés en degrés par pas
+STEP = 1/STEP_RATE
+MAX_STEPS = 15 # nombre maximal de pas simulés avant une image : au-delà, le retard est abandonné
+
+# Fréquence de rafraîchissement réduite quand rien ne bouge (ni tranche, ni caméra, ni entrée récente) ou que la fenêtre est réduite
+IDLE_FPS = 15
+INPUT_DELAY = 1.0 # durée (secondes) à pleine fréquence après une entrée clavier/souris
+
+# Axe de rotation de chaque face ou tranche (les mouvements d'un même axe commutent)
+MOVE_AXIS = {"L": 0, "M": 0, "R": 0, "D": 1, "E": 1, "U": 1, "B": 2, "S": 2, "F": 2}
+QUARTERS = {"": 1, "2": 2, "'": 3} # suffixe du mouvement -> nombre de quarts de tour horaires
+SUFFIXES = {1: "", 2: "2", 3: "'"}
+
+def fuse_moves(sequence:list[str]) -> list[str]:
+    """
+    Simplifie une séquence de mouvements : fusionne les mouvements d'une même face séparés uniquement
+    par des mouvements du même axe (R L R -> R2 L), et supprime ceux qui s'annulent (U U' -> rien).
+    Paramètres:     sequence (list[str]) = mouvements (exemple : ["R", "U2", "U", "L'"]).
+    Retourne:       (list[str]) = séquence équivalente simplifiée.
+    """
+    fused = [] # liste de [face, nombre de quarts de tour]
+    for movement in sequence:
+        face, quarters = movement[0], QUARTERS[movement[1:]]
+        j = len(fused) - 1
+        while j >= 0 and fused[j][0] != face and MOVE_AXIS[fused[j][0]] == MOVE_AXIS[face]: # mouvements qui commutent
+            j -= 1
+        if j >= 0 and fused[j][0] == face:
+            fused[j][1] = (fused[j][1] + quarters) % 4
+            if fused[j][1] == 0:
+                del fused[j]
+        else:
+            fused.append([face, quarters])
+    return [face + SUFFIXES[quarters] for face, quarters in fused]
 
 class EntireCube():
     """
@@ -23,19 +68,31 @@ class EntireCube():
         """
         self.ang_x, self.ang_y,self.ang_z, self.rot_cube = 0, 0, 0, (0, 0, 0)
         self.animate, self.animate_ang, self.animate_speed = False, 0, 5
-        self.action = (0, 0, 0)
+        self.actions = [] # tranches en animation : (axe, tranche, sens, nombre de quarts de tour), toutes sur le même axe
+        self.animate_target = 90 # angle final de l'animation en cours
+        self.version = next(_versions) # change à chaque changement de couleur ou de position des cubes (renvoi des données au rendu)
+
+        self.clock = time.perf_counter # horloge monotone (secondes), remplaçable pour un rendu image par image
+        self.last_time = None # instant de la dernière image
+        self.accumulator = 0.0 # temps écoulé pas encore simulé
+        self.previous = (0, 0, 0, 0) # angles de caméra (x, y, z) et de tranche au pas précédent, pour l'interpolation
+        self.drawn = None # fenêtre, version et angles de la dernière image dessinée (None : image à redessiner)
 
         self.async_slices_moves = []
         self.index_move = 0
         self.async_sound = False
+        self.async_debug = False
         self.sound_volume = 1.0
         
         self.camera_mode = "manual"     #(manual,static,animation)
         self.camera_speed = 2.0
         self.anim_mode = 0      #(0=static, 1=x, 2=y, 3=xy, 4=xyz, 5=z)
 
-        #Création des cubes individuels
-        self.cubes = [Cube((x, y, z), scale) for x in range(3) for y in range(3) for z in range(3)]
+        #Création des cubes individuels : données en tableaux (CubeSet), un objet Cube par ligne
+        self.state = CubeSet([(x, y, z) for x in range(3) for y in range(3) for z in range(3)], scale)
+        self.cubes = [Cube(tuple(self.state.init_pos[i]), scale, self.state, i) for i in range(len(self.state))]
+        self.location_index = numpy.zeros((3, 3, 3), dtype=numpy.intp) # position (x, y, z) -> indice du cube qui l'occupe
+        self.update_location_index()
 
         self.faces = ["U","L","F","R","B","D"]
         self.face_L = [(0,2,0),(0,2,1),(0,2,2),(0,1,0),(0,1,1),(0,1,2),(0,0,0),(0,0,1),(0,0,2)]
@@ -50,6 +107,13 @@ class EntireCube():
             "U'": (1, 2, 1), "B": (2, 0, 1), "S'": (2, 1, 1), "F'": (2, 2, 1),
             "L'": (0, 0, -1), "M'": (0, 1, -1), "R": (0, 2, -1), "D'": (1, 0, -1), "E'": (1, 1, -1),
             "U": (1, 2, -1), "B'": (2, 0, -1), "S": (2, 1, -1), "F": (2, 2, -1)}
+
+        #Correspondance case de la représentation en liste de matrices -> (position du cube, face du cube)
+        self.color_dict = {"w":(1,1,1),"b":(0,0,1),"r":(1,0,0),"g":(0,1,0),"y":(1,1,0),"o":(1,0.5,0),"u":(0,0,0)}
+        face_index = {0:"U",1:"R",2:"F",3:"L",4:"B",5:"D"}
+        sides = [self.get_side(face_index[i]) for i in range(6)]
+        self.facelet_locations = tuple(numpy.array([loc for face, _id in sides for loc in face]).T)
+        self.facelet_faces = numpy.array([_id for face, _id in sides for loc in face])
         self.rot_cube_map  = { "up": (-1, 0, 0), "down": (1, 0 ,0), "left": (0, -1, 0), "right": (0, 1, 0),
         "ur": (-1, 1, 0),"ul": (-1, -1, 0),"dr": (1, 1, 0),"dl": (1, -1, 0),"stop":(0, 0, 0),"urz":(-1,1,1),"z":(0,0,1)}
 
@@ -72,22 +136,75 @@ class EntireCube():
         Fonction asynchrone.
         Effectue un mouvement d'une tranche sur la représentation 3D du Rubik's Cube.
         Tableau des mouvements : 
-        L,L',D,D',M,M',E,E',R,R',U,U',B,B',S,S',F,F'
+        L,L',D,D',M,M',E,E',R,R',U,U',B,B',S,S',F,F' (et demi-tours L2, D2... animés en une seule rotation de 180°)
         Paramètres:     mouvement (str) = Nom du mouvement
                         animate_speed (int) = Vitesse du mouvement
                         debug (bool) = Affiche le mouvement réalisé
         Retourne:       (str|int) = mouvement (str), si l'action a été effectué
                                     -1 (int) si une action est déjà en cours, ou le mouvement est invalide
         """
+        if self.move_slices([mouvement], animate_speed, debug) == -1:
+            return -1
+        return mouvement
+
+    def move_slices(self, mouvements:list[str], animate_speed:int=5, debug:bool=False) -> list[str]|int:
+        """
+        Fonction asynchrone.
+        Anime simultanément plusieurs mouvements de tranches différentes d'un même axe (exemple : R L', U D2).
+        Toutes les tranches finissent en même temps : jouée avec un demi-tour, un quart de tour est deux fois plus lent
+        (play_sequence ne groupe que des mouvements de même amplitude, voir next_moves_group).
+        Paramètres:     mouvements (list[str]) = Noms des mouvements
+                        animate_speed (int) = Vitesse du mouvement
+                        debug (bool) = Affiche les mouvements réalisés
+        Retourne:       (list[str]|int) = mouvements (list[str]), si l'action a été effectuée
+                                          -1 (int) si une action est déjà en cours, ou si les mouvements sont invalides ou incompatibles
+        """
         self.animate_speed = animate_speed
-        if not self.animate and mouvement in self.rot_map:
-            self.animate = True
-            self.action = self.rot_map[mouvement]
-            if debug == True :
-                print(mouvement)
-            return mouvement
-        else :
+        if self.animate:
+            return -1
+        actions = self.get_actions(mouvements)
+        if actions == -1:
             return -1
+        if len({a[0] for a in actions}) != 1 or len({a[1] for a in actions}) != len(actions): # même axe, tranches différentes
+            return -1
+        self.animate = True
+        self.actions = actions
+        self.version = next(_versions)
+        self.animate_target = 90 * max(a[3] for a in actions)
+        if debug == True :
+            print(*mouvements)
+        return mouvements
+
+    def get_actions(self, mouvements:list[str]) -> list[tuple]|int:
+        """
+        Traduit des mouvements en rotations de tranches.
+        Paramètres:     mouvements (list[str]) = noms des mouvements (L, L', L2...).
+        Retourne:       (list[tuple]|int) = liste de (axe, tranche, sens, nombre de quarts de tour), -1 si un mouvement est invalide.
+        """
+        actions = []
+        for mouvement in mouvements:
+            quarters = 2 if mouvement.endswith("2") else 1
+            base = mouvement[:-1] if quarters == 2 else mouvement
+            if base not in self.rot_map:
+                return -1
+            actions.append((*self.rot_map[base], quarters))
+        return actions
+
+    def apply_moves(self, sequence:list[str]) -> int:
+        """
+        Applique des mouvements instantanément (sans animation) sur la représentation 3D.
+        Paramètres:     sequence (list[str]) = mouvements (mêmes noms que move_slice).
+        Retourne:       (int) = 0 si les mouvements ont été appliqués, -1 si un mouvement est invalide (aucun n'est appliqué).
+        """
+        actions = self.get_actions(sequence)
+        if actions == -1:
+            return -1
+        for axis, slice, dir, quarters in actions:
+            for _ in range(quarters):
+                self.state.update(axis, slice, dir)
+        self.update_location_index()
+        self.version = next(_versions)
+        return 0
 
     def set_camera_mode(self, mode:str) -> None:
         """
@@ -108,34 +225,51 @@ class EntireCube():
         self.anim_mode = mode
         self.camera_speed = speed
 
-    def play_sequence(self, sequence:list[str], anim_speed:int=2, awaited:bool=True, debug:bool=False, enable_sound:bool=False) -> int:
+    def play_sequence(self, sequence:list[str], anim_speed:int=2, awaited:bool=True, debug:bool=False, enable_sound:bool=False, fuse:bool=True) -> int:
         """
         Effectue tous les mouvements dans la liste "sequence" à la suite sur la représentation 3D.
+        Les mouvements redondants sont fusionnés, et les mouvements consécutifs de tranches parallèles sont animés ensemble.
         Paramètres:     sequence (list[str]) = Chaîne de mouvements à réaliser
                         anim_speed (int) = Vitesse d'animation
                         awaited (bool) = Détermine si l'execution doit être bloqué jusqu'à la terminaison de la fonction
                         debug (bool) = Affiche le mouvement réalisé
                         enable_sound (bool) = Joue le son correspondant au mouvement
+                        fuse (bool) = Simplifie la séquence avant de la jouer (voir fuse_moves)
         Retourne:       (int) = 0 si l'action a été effectuée, -1 sinon.
         """
+        move_table = ["L","L'","D","D'","M","M'","E","E'","R","R'","U","U'","B","B'","S","S'","F","F'","L2","D2","M2","E2","R2","U2","B2","S2","F2"]
+        for movement in sequence :
+            if movement not in move_table :
+                return -1
+        self.async_slices_moves = fuse_moves(sequence) if fuse else list(sequence)
+        self.index_move = 0
+        self.async_sound = enable_sound
+        self.async_debug = debug
         if awaited == False :
-            self.async_slices_moves = sequence
             self.animate_speed = anim_speed+1
-            self.async_sound = enable_sound
         else :
-            move_table = ["L","L'","D","D'","M","M'","E","E'","R","R'","U","U'","B","B'","S","S'","F","F'","L2","D2","M2","E2","R2","U2","B2","S2","F2"]
-            for movement in sequence :
-                if movement in move_table :
-                    self.move_slice(movement,animate_speed=anim_speed,debug=debug)
-                    if enable_sound == True :
-                        Musique.mixer.music.set_volume(self.sound_volume)
-                        Musique.play_mvt(movement,self.sound_volume)
-                    self.tick()
-                    while self.animate != False :
-                        pygame.display.flip()
-                        self.tick()
-                else :
-                    return -1
+            self.animate_speed = anim_speed
+            drawn = self.tick()
+            while self.animate != False or self.async_slices_moves != [] :
+                if drawn:
+                    pygame.display.flip()
+                drawn = self.tick()
+        return 0
+
+    def next_moves_group(self) -> list[str]:
+        """
+        Renvoie les prochains mouvements à jouer ensemble : mouvements consécutifs d'un même axe, sur des tranches différentes,
+        et de même amplitude (U D' ensemble, mais U puis D2) : toutes les tranches tournent ainsi à la vitesse choisie.
+        Paramètres:     aucun.
+        Retourne:       (list[str]) = groupe de mouvements.
+        """
+        group = [self.async_slices_moves[self.index_move]]
+        half_turn = group[0].endswith("2")
+        for movement in self.async_slices_moves[self.index_move+1:]:
+            if MOVE_AXIS[movement[0]] != MOVE_AXIS[group[0][0]] or movement[0] in [m[0] for m in group] or movement.endswith("2") != half_turn:
+                break
+            group.append(movement)
+        return group
 
     def update_camera_anim(self) -> None:
         """
@@ -164,12 +298,13 @@ class EntireCube():
         Retourne:       rien.
         """
         if self.async_slices_moves != [] :
-            result = self.move_slice(self.async_slices_moves[self.index_move],self.animate_speed)
+            group = self.next_moves_group()
+            result = self.move_slices(group, self.animate_speed, debug=self.async_debug)
             if result != -1 and self.index_move <= len(self.async_slices_moves)-1 :
-                if self.async_sound == True : 
+                if self.async_sound == True and Musique.available : 
                     Musique.mixer.music.set_volume(self.sound_volume)
-                    Musique.play_mvt(self.async_slices_moves[self.index_move],self.sound_volume)
-                self.index_move += 1
+                    Musique.play_mvt(group[0],self.sound_volume)
+                self.index_move += len(group)
             if self.index_move >= len(self.async_slices_moves) :
                 self.async_slices_moves = []
                 self.index_move = 0 
@@ -181,10 +316,15 @@ class EntireCube():
         Paramètres:     location (tuple[int]) = couple position dans le Rubik's Cube
         Retourne:       (GL_Cube.Cube) = objet 3D correspondant au Cube.
         """
-        positions = {}
-        for i in self.cubes :
-            positions[tuple(i.get_position())] = i
-        return positions[location]
+        return self.cubes[self.location_index[location]]
+
+    def update_location_index(self) -> None:
+        """
+        Met à jour la table position -> cube (après un mouvement).
+        Paramètres:     aucun.
+        Retourne:       rien.
+        """
+        self.location_index[tuple(self.state.pos.T)] = numpy.arange(len(self.state))
 
     def set_entire_color(self, color:tuple[float|int]) -> None:
         """
@@ -192,8 +332,8 @@ class EntireCube():
         Paramètres:     color (tuple[float|int]) = 0 <= RGB <= 1
         Retourne:       rien.
         """
-        for i in self.cubes :
-            i.set_color((color,color,color,color,color,color))
+        self.state.colors[:] = color
+        self.version = next(_versions)
 
     def get_side(self, side:str) -> tuple[list|int]:
         """
@@ -231,11 +371,8 @@ class EntireCube():
         Retourne:       rien.
         """
         face,_id = self.get_side(side)
-        for i in face :
-            cube_ = self.get_cube_by_location(i)
-            colors = list(cube_.get_color())               
-            colors[_id] = color
-            cube_.set_color(tuple(colors))      
+        self.state.colors[self.location_index[tuple(numpy.array(face).T)], _id] = color
+        self.version = next(_versions)
             
     def color_face(self, side:str, color:list[tuple[float|int]]=[(0,1,0),(0,1,0),(0,1,0),(0,1,0),(0,1,0),(0,1,0),(0,1,0),(0,1,0),(0,1,0)]) -> None:
         """
@@ -245,29 +382,18 @@ class EntireCube():
         Retourne:       rien.
         """
         face,_id = self.get_side(side)
-        index=0
-        for i in face :
-            cube_ = self.get_cube_by_location(i)
-            colors = list(cube_.get_color())               
-            colors[_id] = color[index]
-            cube_.set_color(tuple(colors))  
-            index+=1
+        self.state.colors[self.location_index[tuple(numpy.array(face).T)], _id] = color
+        self.version = next(_versions)
 
     def load_color_matrix(self, matrix:list[list[str]]) -> None:
         """
-        Lecture d'une matrice représentant un cube.
+        Lecture d'une matrice représentant un cube (les 54 cases sont colorées en une seule opération ; la matrice n'est pas modifiée).
         Paramètres:     matrix (list[list[str]]) = Matrice à lire
         Retourne:       rien.
         """
-        color_dict = {"w":(1,1,1),"b":(0,0,1),"r":(1,0,0),"g":(0,1,0),"y":(1,1,0),"o":(1,0.5,0),"u":(0,0,0)}
-        face_index = {0:"U",1:"R",2:"F",3:"L",4:"B",5:"D"}
-        for i in range (0,len(matrix)) :
-            mtx = matrix[i][0]
-            mtx.extend(matrix[i][1])
-            mtx.extend(matrix[i][2])
-            for x in range(0,len(mtx)) :
-                mtx[x] = color_dict[mtx[x]]
-            self.color_face(face_index[i],mtx) 
+        colors = [self.color_dict[c] for face in matrix for row in face for c in row]
+        self.state.colors[self.location_index[self.facelet_locations], self.facelet_faces] = colors
+        self.version = next(_versions)
 
     def set_camera_rotation(self, x_rot:float, y_rot:float, z_rot:float = 0) -> None:
         """
@@ -278,6 +404,17 @@ class EntireCube():
         Retourne:       rien.
         """
         self.ang_x,self.ang_y,self.ang_z = x_rot,y_rot,z_rot
+        self.previous = (x_rot, y_rot, z_rot, self.previous[3])
+        self.load_camera(x_rot, y_rot, z_rot)
+
+    def load_camera(self, x_rot:float, y_rot:float, z_rot:float) -> None:
+        """
+        Place la caméra et efface l'image, sans modifier les angles du cube.
+        Paramètres:     x_rot (float) = Rotation sur l'axe x
+                        y_rot (float) = Rotation sur l'axe y
+                        z_rot (float) = Rotation sur l'axe z
+        Retourne:       rien.
+        """
         glMatrixMode(GL_MODELVIEW)
         glLoadIdentity()
         glTranslatef(0, 0, -40)
@@ -286,27 +423,152 @@ class EntireCube():
         glRotatef(x_rot, 1, 0, 0)
         glClear(GL_COLOR_BUFFER_BIT|GL_DEPTH_BUFFER_BIT)
 
-    def tick(self) -> None:
+    def get_slice_spins(self) -> dict:
         """
-        Rafraichissement des fonctions (animations, mouvements...) du cube.
+        Renvoie, pour chaque tranche animée, la part de l'angle d'animation qu'elle parcourt (signée selon le sens).
+        Toutes les tranches finissent en même temps (voir move_slices) : le coefficient vaut ±1 pour des mouvements de même amplitude.
         Paramètres:     aucun.
+        Retourne:       (dict) = tranche (int) -> coefficient (float).
+        """
+        return {slice: dir*quarters*90/self.animate_target for axis, slice, dir, quarters in self.actions}
+
+    def get_cube_spins(self) -> numpy.ndarray:
+        """
+        Renvoie, pour chaque cube, la part de l'angle d'animation qu'il parcourt (0 si sa tranche est immobile).
+        Paramètres:     aucun.
+        Retourne:       (numpy.ndarray) = tableau d'un coefficient (float) par cube.
+        """
+        spins = numpy.zeros(len(self.state), dtype=numpy.float32)
+        if self.animate:
+            for axis, slice, dir, quarters in self.actions:
+                spins[self.state.affected(axis, slice)] = dir*quarters*90/self.animate_target
+        return spins
+
+    def draw_immediate(self, angle:float|None=None) -> None:
+        """
+        Dessine les cubes un par un en mode immédiat (glBegin/glEnd).
+        Paramètres:     angle (float|None) = angle d'animation des tranches ; animate_ang si None.
         Retourne:       rien.
         """
+        axis = self.actions[0][0] if self.actions else 0
+        self.state.draw(surfaces, axis, self.animate_ang if angle is None else angle, self.get_cube_spins())
+
+    def draw_instanced(self, renderer:GL_Renderer.InstancedRenderer, angle:float|None=None) -> None:
+        """
+        Dessine les cubes en une seule commande avec le rendu sur carte graphique.
+        Les données des cubes ne sont renvoyées que si elles ont changé.
+        Paramètres:     renderer (GL_Renderer.InstancedRenderer) = rendu instancié.
+                        angle (float|None) = angle d'animation des tranches ; animate_ang si None.
+        Retourne:       rien.
+        """
+        axis = self.actions[0][0] if self.actions else 0
+        if renderer.uploaded != self.version:
+            renderer.upload(self.state.model_matrices(), self.state.colors, self.get_cube_spins(), key=self.version)
+        renderer.draw(axis, self.animate_ang if angle is None else angle)
+
+    def step(self) -> None:
+        """
+        Avance la simulation d'un pas de durée STEP (mouvements, animation des tranches, caméra), sans dessiner.
+        Paramètres:     aucun.
+        Retourne:       rien.
+        """
+        self.previous = (self.ang_x, self.ang_y, self.ang_z, self.animate_ang)
         self.update_async_slices()
         self.update_camera_anim()
         self.ang_x += self.rot_cube[0]*self.camera_speed
         self.ang_y += self.rot_cube[1]*self.camera_speed
         self.ang_z += self.rot_cube[2]*self.camera_speed
-        self.set_camera_rotation(self.ang_x,self.ang_y,self.ang_z)
-        if self.animate:
-            if self.animate_ang >= 90:
-                for cube in self.cubes:
-                    cube.update(*self.action)
-                self.animate, self.animate_ang = False, 0
-        for cube in self.cubes:
-            cube.draw(surfaces,self.animate, self.animate_ang, *self.action)
         if self.animate:
             self.animate_ang += self.animate_speed
+            if self.animate_ang >= self.animate_target:
+                for axis, slice, dir, quarters in self.actions:
+                    for _ in range(quarters):
+                        self.state.update(axis, slice, dir)
+                self.update_location_index()
+                self.animate, self.animate_ang, self.actions = False, 0, []
+                self.previous = (*self.previous[:3], 0) # pas d'interpolation avec le mouvement terminé
+                self.version = next(_versions)
+
+    def interpolate(self, alpha:float) -> tuple[float]:
+        """
+        Calcule les angles à afficher entre l'état du pas précédent et l'état actuel.
+        Paramètres:     alpha (float) = position entre les deux pas (0 : pas précédent, 1 : pas actuel).
+        Retourne:       (tuple[float]) = angles de caméra (x, y, z) et angle d'animation des tranches.
+        """
+        current = (self.ang_x, self.ang_y, self.ang_z, self.animate_ang)
+        return tuple(p+(c-p)*alpha for p, c in zip(self.previous, current))
+
+    def render(self, alpha:float=1.0) -> bool:
+        """
+        Dessine le cube entre l'état du pas précédent et l'état actuel, s'il a changé depuis la dernière image
+        (angles de caméra, angle de tranche, couleurs ou positions des cubes).
+        Paramètres:     alpha (float) = position entre les deux pas (0 : pas précédent, 1 : pas actuel).
+        Retourne:       (bool) = True si une image a été dessinée, False si la précédente est toujours valable.
+        """
+        view = self.interpolate(alpha)
+        key = (display_version, self.version, view)
+        if key == self.drawn:
+            return False
+        x_rot, y_rot, z_rot, angle = view
+        self.load_camera(x_rot, y_rot, z_rot)
+        if renderer is not None:
+            self.draw_instanced(renderer, angle)
+        else:
+            self.draw_immediate(angle)
+        self.drawn = key
+        return True
+
+    def force_redraw(self) -> None:
+        """
+        Force le dessin de la prochaine image (fenêtre découverte...).
+        Paramètres:     aucun.
+        Retourne:       rien.
+        """
+        self.drawn = None
+
+    def is_idle(self) -> bool:
+        """
+        Indique si rien ne bouge : ni tranche en animation ou en attente, ni rotation de caméra.
+        Paramètres:     aucun.
+        Retourne:       (bool) = True si l'image ne change pas d'un pas à l'autre.
+        """
+        camera_still = self.rot_cube == (0, 0, 0) or self.camera_speed == 0
+        return not self.animate and self.async_slices_moves == [] and camera_still
+
+    def tick(self, draw:bool=True) -> bool:
+        """
+        Rafraichissement des fonctions (animations, mouvements...) du cube.
+        Simule autant de pas que le temps écoulé depuis la dernière image (les images en retard sont sautées),
+        puis dessine une image interpolée : la vitesse de lecture ne dépend pas du nombre d'images par seconde.
+        Paramètres:     draw (bool) = dessine l'image (False : simulation seule, par exemple fenêtre réduite).
+        Retourne:       (bool) = True si une image a été dessinée (à afficher avec pygame.display.flip).
+        """
+        alpha = self.advance()
+        if not draw:
+            self.drawn = None
+            return False
+        return self.render(alpha)
+
+    def advance(self) -> float:
+        """
+        Simule autant de pas que le temps écoulé (horloge self.clock) depuis le dernier appel, sans dessiner.
+        Paramètres:     aucun.
+        Retourne:       (float) = position de l'image à dessiner entre les deux derniers pas (voir render).
+        """
+        now = self.clock()
+        if self.last_time is None: # première image : un pas
+            self.accumulator = STEP
+        else:
+            self.accumulator += now - self.last_time
+        self.last_time = now
+        steps = 0
+        while self.accumulator >= STEP and steps < MAX_STEPS:
+            self.step()
+            self.accumulator -= STEP
+            steps += 1
+        if self.accumulator >= STEP: # trop de retard (fenêtre bloquée...) : on ne le rattrape pas
+            self.accumulator = 0.0
+        return self.accumulator/STEP
 
 rot_cube_map  = {K_UP: "up", K_DOWN: "down", K_LEFT: "left", K_RIGHT: "right"}
 rot_keys = {
@@ -341,19 +603,27 @@ def init(Debug_:bool=False, fps_:int=60) -> EntireCube:
 
     return Rubix
 
-def update(Rubix:EntireCube) -> None: 
+def update(Rubix:EntireCube, wait:bool=True) -> float: 
     """
     Mise à jour du rendu pour chaque image (actualise Rubix, pygame, et touches de debug si actif)
     Paramètres:     Rubix (EntireCube) = Objet EntireCube.
-    Retourne:       rien.
+                    wait (bool) = attend l'heure de l'image suivante (False : l'appelant planifie lui-même l'appel suivant).
+    Retourne:       (float) = intervalle (secondes) souhaité avant l'image suivante.
     """
-    Rubix.tick()
-        
+    global last_input
+    visible = pygame.display.get_active() # False si la fenêtre est réduite
+    drawn = Rubix.tick(draw=visible)
+
     for event in pygame.event.get():
         if event.type == pygame.QUIT:
             pygame.quit()
             quit()
 
+        if event.type in (KEYDOWN, MOUSEBUTTONDOWN, MOUSEMOTION):
+            last_input = time.perf_counter()
+        if event.type in (VIDEOEXPOSE, WINDOWEXPOSED): # fenêtre découverte : image à redessiner
+            Rubix.force_redraw()
+
         #Mouvements avec les touches
         if event.type == KEYDOWN and Debug == True:
             if event.key in rot_keys:
@@ -364,8 +634,14 @@ def update(Rubix:EntireCube) -> None:
         else :
             Rubix.rotation("stop")
 
-    pygame.display.flip()
-    clock.tick(fps)
+    if drawn:
+        pygame.display.flip()
+    # Pleine fréquence tant que quelque chose bouge, même si la fenêtre n'a pas le focus (résolution lancée depuis l'interface)
+    busy = not Rubix.is_idle() or time.perf_counter() - last_input < INPUT_DELAY
+    rate = fps if visible and busy else min(fps, IDLE_FPS)
+    if wait:
+        clock.tick(rate)
+    return 1/rate
 
 def stop() -> None:
     """
@@ -373,6 +649,8 @@ def stop() -> None:
     Paramètres:     aucun.
     Retourne:       rien.
     """
+    global renderer
+    renderer = None # le contexte OpenGL est détruit avec la fenêtre
     pygame.quit()
 
 def initInterface(path_logo:str, name:str) -> None:
@@ -386,13 +664,13 @@ def initInterface(path_logo:str, name:str) -> None:
     WINDOW_NAME = name
     PATH_LOGO = path_logo
 
-def main() -> None:
+def main(gpu:bool=True) -> None:
     """
     Initialisation de pygame et OpenGL.
-    Paramètres:     aucun.
+    Paramètres:     gpu (bool) = rendu sur carte graphique si possible ; rendu immédiat sinon.
     Retourne:       rien.
     """
-    global clock, WINDOW_NAME
+    global clock, WINDOW_NAME, renderer, display_version, last_input
     pygame.init()
     pygame.display.set_caption(WINDOW_NAME)
     pygame.display.set_icon(pygame.image.load(PATH_LOGO))
@@ -401,4 +679,7 @@ def main() -> None:
     pygame.display.set_mode(display, DOUBLEBUF|OPENGL)
     glEnable(GL_DEPTH_TEST) 
     glMatrixMode(GL_PROJECTION)
-    gluPerspective(45, (display[0]/display[1]), 0.1, 50.0)
\ No newline at end of file
+    gluPerspective(45, (display[0]/display[1]), 0.1, 50.0)
+    renderer = GL_Renderer.create() if gpu else None
+    display_version = next(_versions)
+    last_input = time.perf_counter()
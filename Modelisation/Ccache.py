@@ -0,0 +1,186 @@
+"""
+Cache des formules de résolution.
+Deux cubes identiques à une rotation du cube entier et à un changement de couleurs près ont la même clé (forme canonique) :
+la formule n'est calculée qu'une fois, puis traduite dans l'orientation de chaque cube équivalent.
+Le changement de couleurs est atteignable depuis l'application : la validation (Cvalid) et la chaîne kociemba
+(Cutils.get_k_string) acceptent tout jeu de 6 couleurs de centres, et les cubes standard équivalents à une symétrie près
+(couleurs échangées comme par une rotation du cube) partagent aussi leur clé.
+"""
+
+from Exceptions import CombinaisonError
+from Modelisation.Cstate import State, FACES, ROTATIONS, CENTERS
+
+from collections import OrderedDict
+from collections.abc import Callable
+import dbm
+import numpy
+
+KOCIEMBA_ORDER = [FACES.index(f) for f in "URFDLB"] # ordre des faces attendu par kociemba
+_ROWS = numpy.arange(len(ROTATIONS))
+_LETTERS = numpy.frombuffer(FACES.encode(), dtype=numpy.uint8)
+
+def canonical_form(state:State) -> tuple[str, numpy.ndarray]|None:
+    """
+    Calcule la forme canonique d'un état : parmi les 24 rotations du cube entier, où chaque case est renommée
+    d'après la face dont le centre a sa couleur, on garde la plus petite chaîne.
+    Paramètres:     state (State) = état du cube.
+    Retourne:       (tuple[str, numpy.ndarray]|None) = forme canonique (54 lettres U, L, F, R, B, D) et rotation utilisée ;
+                    None si les centres ne sont pas de 6 couleurs différentes.
+    """
+    rotated = state.facelets[ROTATIONS] # 24x54
+    centers = rotated[:, CENTERS]
+    if len(set(centers[0].tolist())) != 6:
+        return None
+    lut = numpy.full((len(ROTATIONS), 256), ord("?"), dtype=numpy.uint8) # couleur inconnue : "?"
+    lut[_ROWS[:, None], centers] = _LETTERS
+    relabeled = lut[_ROWS[:, None], rotated]
+    keys = [row.tobytes() for row in relabeled]
+    best = min(range(len(keys)), key=keys.__getitem__)
+    return keys[best].decode("ascii"), ROTATIONS[best]
+
+def relabel(state:State) -> str:
+    """
+    Renomme chaque case d'après la face dont le centre a sa couleur.
+    Paramètres:     state (State) = état du cube (centres de 6 couleurs différentes).
+    Retourne:       (str) = chaîne de 54 lettres U, L, F, R, B, D (ordre U, L, F, R, B, D).
+    """
+    lut = numpy.full(256, ord("?"), dtype=numpy.uint8)
+    lut[state.facelets[CENTERS]] = _LETTERS
+    return lut[state.facelets].tobytes().decode("ascii")
+
+def face_map(rotation:numpy.ndarray) -> dict:
+    """
+    Correspondance entre les faces de l'orientation tournée et celles de l'orientation d'origine.
+    Paramètres:     rotation (numpy.ndarray) = table de permutation d'une rotation du cube entier.
+    Retourne:       (dict) = face dans l'orientation tournée (str) -> face dans l'orientation d'origine (str).
+    """
+    return {FACES[i]: FACES[rotation[CENTERS[i]] // 9] for i in range(6)}
+
+def map_formula(formula:str, faces:dict) -> str:
+    """
+    Renomme les faces des mouvements d'une formule.
+    Paramètres:     formula (str) = formule aux conventions internationales.
+                    faces (dict) = face (str) -> nouvelle face (str).
+    Retourne:       (str) = formule traduite.
+    """
+    return " ".join(faces[step[0]] + step[1:] for step in formula.split())
+
+def to_k_string(canonical:str) -> str:
+    """
+    Réordonne une chaîne de 54 lettres (ordre U, L, F, R, B, D) dans l'ordre de kociemba (U, R, F, D, L, B).
+    Paramètres:     canonical (str) = chaîne de 54 lettres.
+    Retourne:       (str) = chaîne de représentation d'un cube avec kociemba.
+    """
+    return str().join(canonical[i*9:i*9+9] for i in KOCIEMBA_ORDER)
+
+class SolutionCache():
+    """
+    Classe modélisant un cache LRU de formules de résolution, indexé par forme canonique.
+    Un second niveau, optionnel, conserve les formules sur le disque d'une exécution à l'autre.
+    """
+    def __init__(self, solver:Callable[[str], str], maxsize:int=4096, path:str|None=None, namespace:str="") -> None:
+        """
+        Instancie un objet SolutionCache.
+        Paramètres:     solver (Callable[[str], str]) = fonction de résolution d'une chaîne kociemba (lève CombinaisonError si invalide).
+                        maxsize (int) = nombre maximal de formules gardées en mémoire.
+                        path (str|None) = fichier du cache sur disque ; aucun si None.
+                        namespace (str) = préfixe des clés sur disque (nom du solveur : un même fichier sert à plusieurs solveurs).
+        Retourne:       rien.
+        """
+        self.solver = solver
+        self.maxsize = maxsize
+        self.namespace = namespace
+        self.memory = OrderedDict()
+        self.disk = None
+        self.hits, self.disk_hits, self.misses = 0, 0, 0
+        if path is not None:
+            self.open_disk(path)
+
+    def open_disk(self, path:str) -> None:
+        """
+        Active le cache sur disque (créé s'il n'existe pas).
+        Paramètres:     path (str) = chemin du fichier de cache.
+        Retourne:       rien.
+        """
+        self.close_disk()
+        self.disk = dbm.open(path, "c")
+
+    def close_disk(self) -> None:
+        """
+        Ferme le cache sur disque.
+        Paramètres:     aucun.
+        Retourne:       rien.
+        """
+        if self.disk is not None:
+            self.disk.close()
+            self.disk = None
+
+    def lookup(self, key:str) -> str|None:
+        """
+        Cherche la formule (orientation canonique) d'une forme canonique, en mémoire puis sur disque.
+        Paramètres:     key (str) = forme canonique.
+        Retourne:       (str|None) = formule, ou None si absente.
+        """
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return self.memory[key]
+        if self.disk is not None and self.namespace + key in self.disk:
+            self.disk_hits += 1
+            formula = self.disk[self.namespace + key].decode("ascii")
+            self.store(key, formula, persist=False)
+            return formula
+        return None
+
+    def store(self, key:str, formula:str, persist:bool=True) -> None:
+        """
+        Enregistre une formule (orientation canonique) ; la moins récemment utilisée est oubliée si le cache est plein.
+        Paramètres:     key (str) = forme canonique.
+                        formula (str) = formule de résolution.
+                        persist (bool) = enregistre aussi sur disque (si activé).
+        Retourne:       rien.
+        """
+        self.memory[key] = formula
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+        if persist and self.disk is not None:
+            self.disk[self.namespace + key] = formula
+
+    def solve(self, state:State) -> str:
+        """
+        Obtient la formule de résolution d'un cube, depuis le cache si un cube équivalent a déjà été résolu.
+        Paramètres:     state (State) = état du cube.
+        Retourne:       (str) = formule de résolution, dans l'orientation du cube.
+        """
+        canonical = canonical_form(state)
+        if canonical is None:
+            raise CombinaisonError("Le cube saisi n'est pas valide")
+        key, rotation = canonical
+        faces = face_map(rotation)
+        formula = self.lookup(key)
+        if formula is not None:
+            return map_formula(formula, faces)
+        self.misses += 1
+        # Résolution dans l'orientation du cube (cases renommées d'après les centres), puis traduction vers l'orientation canonique
+        formula = self.solver(to_k_string(relabel(state)))
+        inverse = {v: k for k, v in faces.items()}
+        self.store(key, map_formula(formula, inverse))
+        return formula
+
+    def cache_info(self) -> dict:
+        """
+        Renvoie les statistiques du cache.
+        Paramètres:     aucun.
+        Retourne:       (dict) = succès en mémoire, succès sur disque, échecs, taille actuelle et maximale.
+        """
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses, "size": len(self.memory), "maxsize": self.maxsize}
+
+    def clear(self) -> None:
+        """
+        Vide le cache en mémoire et remet les compteurs à zéro.
+        Paramètres:     aucun.
+        Retourne:       rien.
+        """
+        self.memory.clear()
+        self.hits, self.disk_hits, self.misses = 0, 0, 0
@@ -0,0 +1,474 @@
+"""
+Solveur en deux phases (algorithme de Kociemba), indépendant de la librairie kociemba.
+Phase 1 : amener le cube dans le sous-groupe <U, D, R2, L2, F2, B2> (orientations correctes, tranche du milieu en place).
+Phase 2 : résoudre le cube avec les seuls mouvements de ce sous-groupe.
+Les tables de mouvements et d'élagage sont construites une fois avec numpy, enregistrées dans un fichier binaire,
+puis projetées en mémoire (mmap) : le chargement est quasi instantané et la mémoire est partagée entre processus.
+"""
+
+from Exceptions import CombinaisonError
+
+from itertools import permutations
+from os import path
+import mmap
+import os
+import tempfile
+import time
+import numpy
+
+G_path = path.realpath(__file__).replace("Csolver.py","")
+
+# Constantes
+TABLES_PATH = G_path + "twophase.bin" # fichier des tables (généré au premier appel)
+MAX_LENGTH = 21 # longueur de solution suffisante pour arrêter la recherche (quelques secondes en moyenne)
+MAGIC = b"RUBIX2PH\x01\x00\x00\x00" # identifiant et version du format
+
+N_TWIST = 2187  # orientations des coins : 3^7
+N_FLIP = 2048   # orientations des arêtes : 2^11
+N_SLICE = 495   # positions des 4 arêtes de la tranche du milieu : C(12, 4)
+N_PERM8 = 40320 # permutations des 8 coins, ou des 8 arêtes U/D : 8!
+N_PERM4 = 24    # permutations des 4 arêtes de la tranche du milieu : 4!
+
+# Coins : URF, UFL, ULB, UBR, DFR, DLF, DBL, DRB ; arêtes : UR, UF, UL, UB, DR, DF, DL, DB, FR, FL, BL, BR
+# Quart de tour horaire de chaque face : (permutation des coins, orientation des coins, permutation des arêtes, orientation des arêtes)
+_BASIC_MOVES = {
+    "U": ([3, 0, 1, 2, 4, 5, 6, 7], [0]*8, [3, 0, 1, 2, 4, 5, 6, 7, 8, 9, 10, 11], [0]*12),
+    "R": ([4, 1, 2, 0, 7, 5, 6, 3], [2, 0, 0, 1, 1, 0, 0, 2], [8, 1, 2, 3, 11, 5, 6, 7, 4, 9, 10, 0], [0]*12),
+    "F": ([1, 5, 2, 3, 0, 4, 6, 7], [1, 2, 0, 0, 2, 1, 0, 0], [0, 9, 2, 3, 4, 8, 6, 7, 1, 5, 10, 11], [0, 1, 0, 0, 0, 1, 0, 0, 1, 1, 0, 0]),
+    "D": ([0, 1, 2, 3, 5, 6, 7, 4], [0]*8, [0, 1, 2, 3, 5, 6, 7, 4, 8, 9, 10, 11], [0]*12),
+    "L": ([0, 2, 6, 3, 4, 1, 5, 7], [0, 1, 2, 0, 0, 2, 1, 0], [0, 1, 10, 3, 4, 5, 9, 7, 8, 2, 6, 11], [0]*12),
+    "B": ([0, 1, 3, 7, 4, 5, 2, 6], [0, 0, 1, 2, 0, 0, 2, 1], [0, 1, 2, 11, 4, 5, 6, 10, 8, 9, 3, 7], [0, 0, 0, 1, 0, 0, 0, 1, 0, 0, 1, 1]),
+}
+
+# Cases de chaque coin et de chaque arête dans une chaîne kociemba (faces U, R, F, D, L, B ; 9 cases chacune)
+U, R, F, D, L, B = 0, 9, 18, 27, 36, 45
+CORNER_FACELETS = [(U+8, R+0, F+2), (U+6, F+0, L+2), (U+0, L+0, B+2), (U+2, B+0, R+2),
+                   (D+2, F+8, R+6), (D+0, L+8, F+6), (D+6, B+8, L+6), (D+8, R+8, B+6)]
+EDGE_FACELETS = [(U+5, R+1), (U+7, F+1), (U+3, L+1), (U+1, B+1), (D+5, R+7), (D+1, F+7),
+                 (D+3, L+7), (D+7, B+7), (F+5, R+3), (F+3, L+5), (B+5, L+3), (B+3, R+5)]
+CORNER_COLORS = ["URF", "UFL", "ULB", "UBR", "DFR", "DLF", "DBL", "DRB"]
+EDGE_COLORS = ["UR", "UF", "UL", "UB", "DR", "DF", "DL", "DB", "FR", "FL", "BL", "BR"]
+
+MOVE_NAMES = [face + power for face in "URFDLB" for power in ("", "2", "'")]
+PHASE2_MOVES = [0, 1, 2, 9, 10, 11, 4, 13, 7, 16] # U, U2, U', D, D2, D', R2, L2, F2, B2
+FACTORIALS = [1, 1, 2, 6, 24, 120, 720, 5040]
+
+# Tables du fichier binaire : (nom, type, dimensions), dans l'ordre d'enregistrement
+_TABLES = [
+    ("twist_move", numpy.uint16, (N_TWIST, 18)),
+    ("flip_move", numpy.uint16, (N_FLIP, 18)),
+    ("slice_move", numpy.uint16, (N_SLICE, 18)),
+    ("corner_move", numpy.uint16, (N_PERM8, 10)),
+    ("edge_move", numpy.uint16, (N_PERM8, 10)),
+    ("sperm_move", numpy.uint8, (N_PERM4, 10)),
+    ("twist_slice_prun", numpy.int8, (N_TWIST*N_SLICE,)),
+    ("flip_slice_prun", numpy.int8, (N_FLIP*N_SLICE,)),
+    ("corner_sperm_prun", numpy.int8, (N_PERM8*N_PERM4,)),
+    ("edge_sperm_prun", numpy.int8, (N_PERM8*N_PERM4,)),
+]
+
+def multiply(a:tuple[list], b:tuple[list]) -> tuple[list]:
+    """
+    Compose deux cubes au niveau des pièces (a puis b).
+    Paramètres:     a (tuple[list]) = (permutation des coins, orientation des coins, permutation des arêtes, orientation des arêtes).
+                    b (tuple[list]) = idem.
+    Retourne:       (tuple[list]) = cube a*b.
+    """
+    acp, aco, aep, aeo = a
+    bcp, bco, bep, beo = b
+    return ([acp[i] for i in bcp], [(aco[bcp[i]] + bco[i]) % 3 for i in range(8)],
+            [aep[i] for i in bep], [(aeo[bep[i]] + beo[i]) % 2 for i in range(12)])
+
+def _build_moves() -> list[tuple[list]]:
+    """
+    Construit les 18 mouvements au niveau des pièces (ordre MOVE_NAMES).
+    Paramètres:     aucun.
+    Retourne:       (list[tuple[list]]) = liste des 18 mouvements.
+    """
+    moves = []
+    for face in "URFDLB":
+        cube = _BASIC_MOVES[face]
+        for _ in range(3): # quart de tour, demi-tour, trois quarts de tour
+            moves.append(cube)
+            cube = multiply(cube, _BASIC_MOVES[face])
+    return moves
+
+MOVES = _build_moves()
+SOLVED = (list(range(8)), [0]*8, list(range(12)), [0]*12)
+
+def from_k_string(k:str) -> tuple[list]:
+    """
+    Convertit une chaîne kociemba en cube au niveau des pièces.
+    Paramètres:     k (str) = chaîne de représentation d'un cube avec kociemba.
+    Retourne:       (tuple[list]) = (permutation des coins, orientation des coins, permutation des arêtes, orientation des arêtes).
+    """
+    cp, co, ep, eo = [-1]*8, [0]*8, [-1]*12, [0]*12
+    for i, facelets in enumerate(CORNER_FACELETS):
+        colors = [k[f] for f in facelets]
+        for ori in range(3):
+            if colors[ori] in "UD":
+                break
+        else:
+            raise CombinaisonError("Le cube saisi n'est pas valide")
+        name = colors[ori] + colors[(ori+1) % 3] + colors[(ori+2) % 3]
+        if name not in CORNER_COLORS:
+            raise CombinaisonError("Le cube saisi n'est pas valide")
+        cp[i], co[i] = CORNER_COLORS.index(name), ori
+    for i, facelets in enumerate(EDGE_FACELETS):
+        name = k[facelets[0]] + k[facelets[1]]
+        if name in EDGE_COLORS:
+            ep[i], eo[i] = EDGE_COLORS.index(name), 0
+        elif name[::-1] in EDGE_COLORS:
+            ep[i], eo[i] = EDGE_COLORS.index(name[::-1]), 1
+        else:
+            raise CombinaisonError("Le cube saisi n'est pas valide")
+    return cp, co, ep, eo
+
+def parity(p:list) -> int:
+    """
+    Calcule la parité d'une permutation.
+    Paramètres:     p (list) = permutation.
+    Retourne:       (int) = 0 si paire, 1 si impaire.
+    """
+    return sum(p[j] < p[i] for i in range(len(p)) for j in range(i+1, len(p))) % 2
+
+def is_solvable(cube:tuple[list]) -> bool:
+    """
+    Vérifie qu'un cube au niveau des pièces est atteignable depuis le cube résolu.
+    Paramètres:     cube (tuple[list]) = cube au niveau des pièces.
+    Retourne:       (bool) = True si le cube est soluble, False sinon.
+    """
+    cp, co, ep, eo = cube
+    return (sorted(cp) == list(range(8)) and sorted(ep) == list(range(12))
+            and sum(co) % 3 == 0 and sum(eo) % 2 == 0 and parity(cp) == parity(ep))
+
+# --- Coordonnées ---
+
+_SLICE_MASKS = [m for m in range(4096) if bin(m).count("1") == 4] # positions des arêtes FR, FL, BL, BR (masque sur 12 bits)
+_SLICE_INDEX = {m: i for i, m in enumerate(_SLICE_MASKS)}
+SLICE_GOAL = _SLICE_INDEX[0b111100000000]
+
+def twist_coord(co:list) -> int:
+    """
+    Coordonnée d'orientation des coins.
+    Paramètres:     co (list) = orientation des 8 coins.
+    Retourne:       (int) = coordonnée (0 à 2186).
+    """
+    t = 0
+    for i in range(7):
+        t = 3*t + co[i]
+    return t
+
+def flip_coord(eo:list) -> int:
+    """
+    Coordonnée d'orientation des arêtes.
+    Paramètres:     eo (list) = orientation des 12 arêtes.
+    Retourne:       (int) = coordonnée (0 à 2047).
+    """
+    f = 0
+    for i in range(11):
+        f = 2*f + eo[i]
+    return f
+
+def slice_coord(ep:list) -> int:
+    """
+    Coordonnée de position des arêtes de la tranche du milieu (FR, FL, BL, BR).
+    Paramètres:     ep (list) = permutation des 12 arêtes.
+    Retourne:       (int) = coordonnée (0 à 494).
+    """
+    return _SLICE_INDEX[sum(1 << i for i in range(12) if ep[i] >= 8)]
+
+def perm_coord(p:list) -> int:
+    """
+    Rang (ordre lexicographique) d'une permutation.
+    Paramètres:     p (list) = permutation de 0..n-1.
+    Retourne:       (int) = rang (0 à n!-1).
+    """
+    n = len(p)
+    return sum(sum(p[j] < p[i] for j in range(i+1, n)) * FACTORIALS[n-1-i] for i in range(n))
+
+def _perm_rank(p:numpy.ndarray) -> numpy.ndarray:
+    """
+    Rang (ordre lexicographique) de chaque ligne d'un tableau de permutations.
+    Paramètres:     p (numpy.ndarray) = tableau N x n de permutations de 0..n-1.
+    Retourne:       (numpy.ndarray) = tableau des N rangs.
+    """
+    n = p.shape[1]
+    smaller_after = (p[:, None, :] < p[:, :, None]) & numpy.triu(numpy.ones((n, n), dtype=bool), 1)
+    return smaller_after.sum(axis=2) @ numpy.array([FACTORIALS[n-1-i] for i in range(n)])
+
+# --- Construction des tables ---
+
+def _move_tables() -> dict:
+    """
+    Construit les tables de mouvements : coordonnée après chaque mouvement, pour toutes les coordonnées à la fois.
+    Paramètres:     aucun.
+    Retourne:       (dict) = nom de la table -> numpy.ndarray.
+    """
+    twist = numpy.arange(N_TWIST)
+    co = numpy.zeros((N_TWIST, 8), dtype=numpy.int64)
+    for i in range(6, -1, -1):
+        co[:, i], twist = twist % 3, twist // 3
+    co[:, 7] = (-co[:, :7].sum(axis=1)) % 3
+    flip = numpy.arange(N_FLIP)
+    eo = numpy.zeros((N_FLIP, 12), dtype=numpy.int64)
+    for i in range(10, -1, -1):
+        eo[:, i], flip = flip % 2, flip // 2
+    eo[:, 11] = eo[:, :11].sum(axis=1) % 2
+    slices = (numpy.array(_SLICE_MASKS)[:, None] >> numpy.arange(12)) & 1
+    slice_index = numpy.zeros(4096, dtype=numpy.int64)
+    slice_index[_SLICE_MASKS] = numpy.arange(N_SLICE)
+    perms8 = numpy.array(list(permutations(range(8))))
+    perms4 = numpy.array(list(permutations(range(4))))
+
+    tables = {name: numpy.zeros(shape, dtype=dtype) for name, dtype, shape in _TABLES[:6]}
+    for m, (cp, mco, ep, meo) in enumerate(MOVES):
+        cp, mco, ep, meo = map(numpy.array, (cp, mco, ep, meo))
+        tables["twist_move"][:, m] = ((co[:, cp] + mco) % 3)[:, :7] @ (3 ** numpy.arange(6, -1, -1))
+        tables["flip_move"][:, m] = ((eo[:, ep] + meo) % 2)[:, :11] @ (2 ** numpy.arange(10, -1, -1))
+        tables["slice_move"][:, m] = slice_index[slices[:, ep] @ (1 << numpy.arange(12))]
+    for j, m in enumerate(PHASE2_MOVES):
+        cp, _, ep, _ = map(numpy.array, MOVES[m])
+        tables["corner_move"][:, j] = _perm_rank(perms8[:, cp])
+        tables["edge_move"][:, j] = _perm_rank(perms8[:, ep[:8]])
+        tables["sperm_move"][:, j] = _perm_rank(perms4[:, ep[8:] - 8])
+    return tables
+
+def _pruning_table(move_a:numpy.ndarray, move_b:numpy.ndarray, goal:int) -> numpy.ndarray:
+    """
+    Construit une table d'élagage par parcours en largeur : nombre minimal de mouvements pour atteindre le but,
+    pour chaque couple de coordonnées (a, b) d'indice a*nb + b.
+    Paramètres:     move_a (numpy.ndarray) = table de mouvements de la première coordonnée.
+                    move_b (numpy.ndarray) = table de mouvements de la seconde coordonnée.
+                    goal (int) = indice du couple but.
+    Retourne:       (numpy.ndarray) = table des distances.
+    """
+    na, nb = len(move_a), len(move_b)
+    table = numpy.full(na*nb, -1, dtype=numpy.int8)
+    table[goal] = 0
+    frontier, depth = numpy.array([goal]), 0
+    while len(frontier):
+        a, b = frontier // nb, frontier % nb
+        found = []
+        for m in range(move_a.shape[1]):
+            new = move_a[a, m].astype(numpy.int64) * nb + move_b[b, m]
+            new = new[table[new] == -1]
+            table[new] = depth + 1
+            found.append(new)
+        frontier, depth = numpy.unique(numpy.concatenate(found)), depth + 1
+    return table
+
+def generate_tables(filename:str=TABLES_PATH) -> None:
+    """
+    Construit toutes les tables et les enregistre dans un fichier binaire.
+    Le fichier est écrit sous un nom temporaire (même dossier) puis renommé : un fichier incomplet (arrêt pendant
+    l'écriture, plusieurs processus en même temps) n'est jamais lu.
+    Paramètres:     filename (str) = chemin du fichier.
+    Retourne:       rien.
+    """
+    tables = _move_tables()
+    tables["twist_slice_prun"] = _pruning_table(tables["twist_move"], tables["slice_move"], SLICE_GOAL)
+    tables["flip_slice_prun"] = _pruning_table(tables["flip_move"], tables["slice_move"], SLICE_GOAL)
+    tables["corner_sperm_prun"] = _pruning_table(tables["corner_move"], tables["sperm_move"], 0)
+    tables["edge_sperm_prun"] = _pruning_table(tables["edge_move"], tables["sperm_move"], 0)
+    fd, temp = tempfile.mkstemp(dir=path.dirname(path.abspath(filename)), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(MAGIC)
+            for name, dtype, shape in _TABLES:
+                file.write(numpy.ascontiguousarray(tables[name], dtype=dtype).tobytes())
+        os.replace(temp, filename)
+    except BaseException:
+        os.remove(temp)
+        raise
+
+class Tables():
+    """
+    Classe regroupant les tables du solveur, projetées en mémoire depuis le fichier binaire.
+    Chaque table est accessible sous forme de tableau numpy (même nom) et de memoryview à une dimension (nom préfixé par "_"),
+    plus rapide à indexer case par case pendant la recherche.
+    """
+    def __init__(self, filename:str=TABLES_PATH) -> None:
+        """
+        Instancie un objet Tables ; génère le fichier s'il n'existe pas.
+        Paramètres:     filename (str) = chemin du fichier des tables.
+        Retourne:       rien.
+        """
+        if not path.exists(filename):
+            generate_tables(filename)
+        with open(filename, "rb") as file:
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Fichier de tables invalide : {filename}")
+        offset = len(MAGIC)
+        for name, dtype, shape in _TABLES:
+            count = int(numpy.prod(shape))
+            array = numpy.frombuffer(self.mmap, dtype=dtype, count=count, offset=offset).reshape(shape)
+            setattr(self, name, array)
+            setattr(self, "_"+name, memoryview(array.reshape(-1)))
+            offset += array.nbytes
+
+_tables = None
+
+def get_tables() -> Tables:
+    """
+    Renvoie les tables du solveur (chargées au premier appel).
+    Paramètres:     aucun.
+    Retourne:       (Tables) = tables du solveur.
+    """
+    global _tables
+    if _tables is None:
+        _tables = Tables()
+    return _tables
+
+# --- Recherche ---
+
+# Après un mouvement d'une face, on ne tourne pas la même face, ni la face opposée d'indice inférieur (U avant D, R avant L, F avant B)
+_ALLOWED = [[m for m in range(18) if last < 0 or not (m//3 == last//3 or (m//3 % 3 == last//3 % 3 and m//3 < last//3))] for last in range(-1, 18)]
+_ALLOWED2 = [[j for j, m in enumerate(PHASE2_MOVES) if m in _ALLOWED[last+1]] for last in range(-1, 18)]
+# Dernier mouvement de la phase 1 : un mouvement de la phase 2 serait redondant
+_PHASE1_LAST = {3, 5, 6, 8, 12, 14, 15, 17} # R, R', F, F', L, L', B, B'
+
+class _Found(Exception):
+    """
+    Interrompt la recherche (solution assez courte ou temps écoulé).
+    """
+    pass
+
+class _Search():
+    """
+    Classe modélisant une recherche en deux phases pour un cube donné.
+    """
+    def __init__(self, tables:Tables, cube:tuple[list], max_length:int, timeout:float) -> None:
+        """
+        Instancie un objet _Search.
+        Paramètres:     tables (Tables) = tables du solveur.
+                        cube (tuple[list]) = cube au niveau des pièces.
+                        max_length (int) = longueur de solution suffisante pour arrêter la recherche.
+                        timeout (float) = durée au-delà de laquelle la recherche s'arrête (secondes).
+        Retourne:       rien.
+        """
+        self.t = tables
+        self.cube = cube
+        self.max_length = max_length
+        self.deadline = time.monotonic() + timeout
+        self.timeout = timeout
+        self.moves = []
+        self.best = None
+
+    def run(self) -> list[int]:
+        """
+        Lance la recherche en approfondissant la phase 1 ; lève TimeoutError si aucune solution n'est trouvée à temps.
+        Paramètres:     aucun.
+        Retourne:       (list[int]) = meilleure solution trouvée (indices dans MOVE_NAMES).
+        """
+        cp, co, ep, eo = self.cube
+        tw, fl, sl = twist_coord(co), flip_coord(eo), slice_coord(ep)
+        try:
+            for depth1 in range(13): # la phase 1 nécessite au plus 12 mouvements
+                if self.best is not None and depth1 >= len(self.best):
+                    break
+                self.phase1(tw, fl, sl, depth1, -1)
+        except _Found:
+            pass
+        if self.best is None:
+            raise TimeoutError(f"Aucune solution trouvée en {self.timeout:g} secondes")
+        return self.best
+
+    def phase1(self, tw:int, fl:int, sl:int, togo:int, last:int) -> None:
+        """
+        Recherche en profondeur (IDA*) des fins de phase 1 en exactement togo mouvements.
+        Paramètres:     tw, fl, sl (int) = coordonnées de phase 1.
+                        togo (int) = nombre de mouvements restants.
+                        last (int) = dernier mouvement (-1 si aucun).
+        Retourne:       rien.
+        """
+        if togo > 1 and time.monotonic() > self.deadline: # pas à chaque nœud : les feuilles sont les plus nombreuses
+            raise _Found()
+        t = self.t
+        if togo == 0:
+            if tw == 0 and fl == 0 and sl == SLICE_GOAL and (last < 0 or last in _PHASE1_LAST):
+                self.start_phase2(last)
+            return
+        if max(t._twist_slice_prun[tw*N_SLICE + sl], t._flip_slice_prun[fl*N_SLICE + sl]) > togo:
+            return
+        for m in _ALLOWED[last+1]:
+            self.moves.append(m)
+            self.phase1(t._twist_move[tw*18 + m], t._flip_move[fl*18 + m], t._slice_move[sl*18 + m], togo-1, m)
+            self.moves.pop()
+
+    def start_phase2(self, last:int) -> None:
+        """
+        Calcule les coordonnées de phase 2 à la fin d'une phase 1 et lance la phase 2.
+        Paramètres:     last (int) = dernier mouvement de la phase 1.
+        Retourne:       rien.
+        """
+        if time.monotonic() > self.deadline:
+            raise _Found()
+        depth1 = len(self.moves)
+        limit = 18 if self.best is None else len(self.best) - 1 - depth1
+        if limit < 0:
+            return
+        cube = self.cube
+        for m in self.moves:
+            cube = multiply(cube, MOVES[m])
+        cp, _, ep, _ = cube
+        c, e, s = perm_coord(cp), perm_coord(ep[:8]), perm_coord([x-8 for x in ep[8:]])
+        t = self.t
+        if max(t._corner_sperm_prun[c*N_PERM4 + s], t._edge_sperm_prun[e*N_PERM4 + s]) > limit:
+            return
+        for depth2 in range(limit+1):
+            if self.phase2(c, e, s, depth2, last):
+                self.best = list(self.moves)
+                self.moves = self.moves[:depth1]
+                if len(self.best) <= self.max_length:
+                    raise _Found()
+                return
+
+    def phase2(self, c:int, e:int, s:int, togo:int, last:int) -> bool:
+        """
+        Recherche en profondeur (IDA*) d'une solution de phase 2 en exactement togo mouvements.
+        Les mouvements trouvés sont ajoutés à self.moves.
+        Paramètres:     c, e, s (int) = coordonnées de phase 2.
+                        togo (int) = nombre de mouvements restants.
+                        last (int) = dernier mouvement.
+        Retourne:       (bool) = True si une solution a été trouvée, False sinon.
+        """
+        t = self.t
+        if togo == 0:
+            return c == 0 and e == 0 and s == 0
+        if max(t._corner_sperm_prun[c*N_PERM4 + s], t._edge_sperm_prun[e*N_PERM4 + s]) > togo:
+            return False
+        for j in _ALLOWED2[last+1]:
+            self.moves.append(PHASE2_MOVES[j])
+            if self.phase2(t._corner_move[c*10 + j], t._edge_move[e*10 + j], t._sperm_move[s*10 + j], togo-1, PHASE2_MOVES[j]):
+                return True
+            self.moves.pop()
+        return False
+
+def solve(k:str, max_length:int=MAX_LENGTH, timeout:float=10.0) -> str:
+    """
+    Résout un cube représenté par une chaîne kociemba (même usage que kociemba.solve).
+    Paramètres:     k (str) = chaîne de représentation d'un cube avec kociemba.
+                    max_length (int) = la recherche s'arrête dès qu'une solution de cette longueur au plus est trouvée.
+                    timeout (float) = au-delà de cette durée (secondes), la meilleure solution trouvée est renvoyée ;
+                                      TimeoutError est levée si aucune n'a encore été trouvée.
+    Retourne:       (str) = formule de résolution.
+    """
+    if len(k) != 54 or [k[4], k[13], k[22], k[31], k[40], k[49]] != list("URFDLB"):
+        raise CombinaisonError("Le cube saisi n'est pas valide")
+    cube = from_k_string(k)
+    if not is_solvable(cube):
+        raise CombinaisonError("Le cube saisi n'est pas valide")
+    return " ".join(MOVE_NAMES[m] for m in _Search(get_tables(), cube, max_length, timeout).run())
+
+def get_formula_to_solve(mtx:list, max_length:int=MAX_LENGTH, timeout:float=10.0) -> str:
+    """
+    Obtient la formule de résolution d'un cube avec le solveur en deux phases.
+    Paramètres:     mtx (list) = représentation en liste de matrices d'un cube (comme Cutils.get_formula_to_solve).
+                    max_length (int) = longueur de solution suffisante pour arrêter la recherche.
+                    timeout (float) = durée maximale de recherche d'une solution plus courte (secondes).
+    Retourne:       (str) = formule de résolution
+    """
+    from Modelisation.Cutils import get_k_string # import local : Cutils importe ce module
+    return solve(get_k_string(mtx), max_length, timeout)+" " # pour fomattage
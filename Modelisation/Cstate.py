@@ -0,0 +1,224 @@
+"""
+Représentation compacte de l'état d'un Rubik's Cube.
+Les 54 cases (facettes) sont stockées dans un tableau numpy d'octets, dans l'ordre de la représentation en liste de matrices :
+U (0-8), L (9-17), F (18-26), R (27-35), B (36-44), D (45-53) ; chaque face étant lue ligne par ligne.
+Chaque mouvement est une table de permutation d'indices précalculée : l'appliquer revient à une seule indexation numpy.
+"""
+
+import numpy
+
+FACES = "ULFRBD" # ordre des faces dans la représentation en liste de matrices
+SOLVED = "yrgobw" # couleur du centre de chaque face (même ordre que FACES)
+
+# Position (x, y, z) de la case (ligne r, colonne c) et normale de chaque face
+# x : vers R, y : vers U, z : vers F ; coordonnées dans {-1, 0, 1}
+_GEOMETRY = {
+    "U": (lambda r, c: (c-1, 1, r-1), (0, 1, 0)),
+    "L": (lambda r, c: (-1, 1-r, c-1), (-1, 0, 0)),
+    "F": (lambda r, c: (c-1, 1-r, 1), (0, 0, 1)),
+    "R": (lambda r, c: (1, 1-r, 1-c), (1, 0, 0)),
+    "B": (lambda r, c: (1-c, 1-r, -1), (0, 0, -1)),
+    "D": (lambda r, c: (c-1, -1, 1-r), (0, -1, 0)),
+}
+
+# Mouvements de base : (axe de rotation, tranches concernées) ; rotation horaire vue depuis l'axe
+_BASE_MOVES = {
+    "U": ((0, 1, 0), (1,)), "D": ((0, -1, 0), (1,)),
+    "R": ((1, 0, 0), (1,)), "L": ((-1, 0, 0), (1,)),
+    "F": ((0, 0, 1), (1,)), "B": ((0, 0, -1), (1,)),
+    "M": ((-1, 0, 0), (0,)), "E": ((0, -1, 0), (0,)), "S": ((0, 0, 1), (0,)),
+    "u": ((0, 1, 0), (1, 0)), "d": ((0, -1, 0), (1, 0)), # mouvements larges : face + tranche centrale
+    "r": ((1, 0, 0), (1, 0)), "l": ((-1, 0, 0), (1, 0)),
+    "f": ((0, 0, 1), (1, 0)), "b": ((0, 0, -1), (1, 0)),
+    "x": ((1, 0, 0), (-1, 0, 1)), "y": ((0, 1, 0), (-1, 0, 1)), "z": ((0, 0, 1), (-1, 0, 1)),
+}
+
+def _build_geometry() -> tuple[numpy.ndarray]:
+    """
+    Calcule la position et la normale de chacune des 54 cases.
+    Paramètres:     aucun.
+    Retourne:       (tuple[numpy.ndarray]) = positions (54x3) et normales (54x3).
+    """
+    positions, normals = [], []
+    for face in FACES:
+        pos, normal = _GEOMETRY[face]
+        for r in range(3):
+            for c in range(3):
+                positions.append(pos(r, c))
+                normals.append(normal)
+    return numpy.array(positions, dtype=numpy.int8), numpy.array(normals, dtype=numpy.int8)
+
+POSITIONS, NORMALS = _build_geometry()
+_INDEX = {(*POSITIONS[i], *NORMALS[i]): i for i in range(54)} # (position, normale) -> indice de la case
+
+def _quarter_turn(axis:tuple[int], layers:tuple[int]) -> numpy.ndarray:
+    """
+    Construit la table de permutation d'un quart de tour horaire.
+    Paramètres:     axis (tuple[int]) = vecteur unitaire de l'axe de rotation.
+                    layers (tuple[int]) = tranches tournées (produit scalaire position.axe).
+    Retourne:       (numpy.ndarray) = table p telle que nouvel_etat = etat[p].
+    """
+    a = numpy.array(axis, dtype=numpy.int8)
+    perm = numpy.arange(54, dtype=numpy.intp)
+    for i in range(54):
+        if POSITIONS[i] @ a not in layers:
+            continue
+        # rotation de -90° autour de a : v -> (a.v)a - a^v
+        pos = (POSITIONS[i] @ a) * a - numpy.cross(a, POSITIONS[i])
+        nrm = (NORMALS[i] @ a) * a - numpy.cross(a, NORMALS[i])
+        perm[_INDEX[(*pos, *nrm)]] = i # la case i arrive en (pos, nrm)
+    return perm
+
+def _build_moves() -> dict:
+    """
+    Précalcule les tables de permutation de tous les mouvements (X, X', X2), les mouvements larges étant aussi notés Xw.
+    Paramètres:     aucun.
+    Retourne:       (dict) = mouvement (str) -> table de permutation (numpy.ndarray).
+    """
+    moves = {}
+    for name, (axis, layers) in _BASE_MOVES.items():
+        p = _quarter_turn(axis, layers)
+        moves[name] = p
+        moves[name+"2"] = p[p]
+        moves[name+"'"] = p[p][p]
+        moves[name+"2'"] = moves[name+"'2"] = moves[name+"2"]
+    for face in "UDRLFB": # notation Rw équivalente à r
+        for suffix in ("", "2", "'", "2'", "'2"):
+            moves[face+"w"+suffix] = moves[face.lower()+suffix]
+    for table in moves.values():
+        table.flags.writeable = False
+    return moves
+
+def _build_rotations() -> numpy.ndarray:
+    """
+    Engendre les 24 rotations du cube entier à partir de x et y.
+    Paramètres:     aucun.
+    Retourne:       (numpy.ndarray) = tableau 24x54 des tables de permutation (l'identité en premier).
+    """
+    rotations = {IDENTITY.tobytes(): IDENTITY}
+    todo = [IDENTITY]
+    while todo:
+        p = todo.pop()
+        for g in (MOVES["x"], MOVES["y"]):
+            q = p[g]
+            if q.tobytes() not in rotations:
+                rotations[q.tobytes()] = q
+                todo.append(q)
+    return numpy.array(list(rotations.values()))
+
+MOVES = _build_moves()
+IDENTITY = numpy.arange(54, dtype=numpy.intp)
+ROTATIONS = _build_rotations()
+CENTERS = numpy.array([4, 13, 22, 31, 40, 49]) # indice du centre de chaque face (ordre FACES)
+
+def parse_formula(formula) -> list[str]:
+    """
+    Découpe une formule en liste de mouvements.
+    Paramètres:     formula (str|list|pc.Formula) = formule aux conventions internationales ("R U2 F'", mouvements larges
+                    "r" ou "Rw", tranches M E S, rotations x y z), ou itérable de mouvements.
+    Retourne:       (list[str]) = liste des mouvements.
+    """
+    if isinstance(formula, str):
+        steps = formula.split()
+    else:
+        steps = [str(step) for step in formula]
+    for step in steps:
+        if step not in MOVES:
+            raise ValueError(f"Mouvement invalide : {step}")
+    return steps
+
+def compile_formula(formula) -> numpy.ndarray:
+    """
+    Compose les permutations d'une formule en une seule table.
+    Paramètres:     formula (str|list) = formule aux conventions internationales.
+    Retourne:       (numpy.ndarray) = table p telle que etat_final = etat[p].
+    """
+    perm = IDENTITY
+    for step in parse_formula(formula):
+        perm = perm[MOVES[step]]
+    return perm
+
+class State():
+    """
+    Classe modélisant l'état d'un cube par ses 54 cases.
+    Chaque case contient le code ASCII du caractère de sa couleur (y, r, g, o, b, w...).
+    """
+    __slots__ = ("facelets",)
+
+    def __init__(self, facelets:numpy.ndarray|None=None) -> None:
+        """
+        Instancie un objet State.
+        Paramètres:     facelets (numpy.ndarray|None) = tableau de 54 octets ; cube résolu si None.
+        Retourne:       rien.
+        """
+        if facelets is None:
+            facelets = numpy.frombuffer(str().join(c*9 for c in SOLVED).encode(), dtype=numpy.uint8).copy()
+        self.facelets = facelets
+
+    @classmethod
+    def from_string(cls, string:str) -> "State":
+        """
+        Crée un état à partir d'une chaîne de 54 caractères (ordre U, L, F, R, B, D).
+        Paramètres:     string (str) = chaîne de 54 caractères.
+        Retourne:       (State) = état correspondant.
+        """
+        if len(string) != 54:
+            raise ValueError("Un cube est représenté par 54 cases")
+        return cls(numpy.frombuffer(string.encode("ascii"), dtype=numpy.uint8).copy())
+
+    @classmethod
+    def from_matrix(cls, m:list) -> "State":
+        """
+        Crée un état à partir de la représentation en liste de matrices d'un cube.
+        Paramètres:     m (list) = représentation en liste de matrices d'un cube.
+        Retourne:       (State) = état correspondant.
+        """
+        return cls.from_string(str().join(str().join(row) for face in m for row in face))
+
+    def copy(self) -> "State":
+        """
+        Copie l'état.
+        Paramètres:     aucun.
+        Retourne:       (State) = copie indépendante de l'état.
+        """
+        return State(self.facelets.copy())
+
+    def apply(self, formula) -> None:
+        """
+        Applique une formule à l'état.
+        Paramètres:     formula (str|list|pc.Formula) = formule aux conventions internationales.
+        Retourne:       rien.
+        """
+        self.facelets = self.facelets[compile_formula(formula)]
+
+    def to_string(self) -> str:
+        """
+        Convertit l'état en chaîne de 54 caractères (ordre U, L, F, R, B, D).
+        Paramètres:     aucun.
+        Retourne:       (str) = chaîne représentant le cube.
+        """
+        return self.facelets.tobytes().decode("ascii")
+
+    def to_matrix(self) -> list:
+        """
+        Convertit l'état en représentation en liste de matrices.
+        Paramètres:     aucun.
+        Retourne:       (list) = représentation en liste de matrices d'un cube.
+        """
+        s = self.to_string()
+        return [[list(s[f*9+r*3:f*9+r*3+3]) for r in range(3)] for f in range(6)]
+
+    def is_solved(self) -> bool:
+        """
+        Vérifie si chaque face est d'une seule couleur.
+        Paramètres:     aucun.
+        Retourne:       (bool) = True si le cube est résolu, False sinon.
+        """
+        faces = self.facelets.reshape(6, 9)
+        return bool((faces == faces[:, 4:5]).all())
+
+    def __eq__(self, other:object) -> bool:
+        return isinstance(other, State) and bool((self.facelets == other.facelets).all())
+
+    def __hash__(self) -> int:
+        return hash(self.facelets.tobytes())
@@ -1,27 +1,134 @@
 from Exceptions import CombinaisonError
+from Modelisation.Cstate import State, FACES, SOLVED
+from Modelisation.Ccache import SolutionCache
+from Modelisation import Csolver
+from Modelisation.Cvalid import validate
 
-import pycuber as pc
 import random
+import numpy
 import kociemba
+import atexit
+import signal
+import multiprocessing.pool
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Chaîne kociemba d'un cube résolu (sert à charger les tables de kociemba dans les processus de calcul)
+SOLVED_K_STRING = "U"*9 + "R"*9 + "F"*9 + "D"*9 + "L"*9 + "B"*9
+
+# Solveur utilisé : "kociemba" (librairie kociemba) ou "twophase" (Csolver, solveur du projet)
+BACKEND = "kociemba"
+
+# Processus de calcul persistants, par (nombre de processus, solveur)
+_pools = {}
+POOL_TIMEOUT = 5.0 # durée laissée aux processus de calcul pour finir leurs tâches à l'arrêt (secondes), avant de les interrompre
+
+# Fil d'exécution des résolutions en arrière-plan (une à la fois) ; kociemba libère le GIL pendant le calcul
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="resolution")
 
 # Les 18 actions possibles sur un cube (convention internationale)
 ACTION_LIST = ["F", "B", "L", "R", "D", "U", "F'", "R'", "U'", "L'", "B'", "D'", "L2", "D2", "B2", "R2", "U2", "F2"]
 
-def gen_formula(nb_step:int=24) -> pc.Formula:
+def gen_formula(nb_step:int=24, seed:int|None=None) -> str:
     """
-    Génère une formule de mélange du cube aléatoire.
+    Génère une formule de mélange du cube aléatoire, sans deux mouvements consécutifs de la même face (F F' s'annulent).
     Paramètres:     nb_step (int) = nombre d'étapes de mélange
-    Retourne:       (pc.Formula) = formule de mélange
+                    seed (int|None) = graine du générateur aléatoire (formule reproductible) ; générateur global si None.
+    Retourne:       (str) = formule de mélange
     """
+    rng = random if seed is None else random.Random(seed)
     # On prend 24 en valeur par défaut ; 20 étant le "nombre de Dieu" d'un Rubik's Cube.
-    return pc.Formula([random.choice(ACTION_LIST) for _ in range(nb_step)])
+    formula = []
+    for _ in range(nb_step):
+        step = rng.choice(ACTION_LIST)
+        while formula and step[0] == formula[-1][0]: # même face que le mouvement précédent
+            step = rng.choice(ACTION_LIST)
+        formula.append(step)
+    return " ".join(formula)
+
+def invert_formula(formula:str) -> str:
+    """
+    Calcule la formule inverse (annule la formule donnée).
+    Paramètres:     formula (str) = formule aux conventions internationales.
+    Retourne:       (str) = formule inverse.
+    """
+    inverse = {"": "'", "'": "", "2": "2"}
+    return " ".join(step[0] + inverse[step[1:]] for step in reversed(formula.split()))
+
+def _facelet_tables() -> tuple[numpy.ndarray]:
+    """
+    Tables de passage des pièces aux cases, dans l'ordre de la représentation en liste de matrices.
+    Paramètres:     aucun.
+    Retourne:       (tuple[numpy.ndarray]) = cases des coins (8x3), couleurs des coins (8x3), cases des arêtes (12x2), couleurs des arêtes (12x2).
+    """
+    to_matrix_index = {}
+    for k_face, face in enumerate("URFDLB"):
+        for i in range(9):
+            to_matrix_index[k_face*9 + i] = FACES.index(face)*9 + i
+    color = {face: ord(SOLVED[FACES.index(face)]) for face in FACES}
+    corner_facelets = numpy.array([[to_matrix_index[f] for f in c] for c in Csolver.CORNER_FACELETS])
+    edge_facelets = numpy.array([[to_matrix_index[f] for f in e] for e in Csolver.EDGE_FACELETS])
+    corner_colors = numpy.array([[color[f] for f in c] for c in Csolver.CORNER_COLORS], dtype=numpy.uint8)
+    edge_colors = numpy.array([[color[f] for f in e] for e in Csolver.EDGE_COLORS], dtype=numpy.uint8)
+    return corner_facelets, corner_colors, edge_facelets, edge_colors
+
+def gen_states(n:int, seed:int|None=None) -> numpy.ndarray:
+    """
+    Génère n cubes aléatoires, tirés uniformément parmi tous les cubes solubles.
+    Paramètres:     n (int) = nombre de cubes.
+                    seed (int|None) = graine du générateur aléatoire (cubes reproductibles).
+    Retourne:       (numpy.ndarray) = tableau n x 54 des cases (codes ASCII, comme Cstate.State.facelets).
+    """
+    rng = numpy.random.default_rng(seed)
+    rows = numpy.arange(n)[:, None]
+    cp = numpy.argsort(rng.random((n, 8)), axis=1)
+    ep = numpy.argsort(rng.random((n, 12)), axis=1)
+    co = rng.integers(0, 3, (n, 8))
+    co[:, 7] = (-co[:, :7].sum(axis=1)) % 3
+    eo = rng.integers(0, 2, (n, 12))
+    eo[:, 11] = eo[:, :11].sum(axis=1) % 2
+    # Parités différentes : échange de deux arêtes (bijection entre cubes pairs et impairs, le tirage reste uniforme)
+    cp_parity = (numpy.triu(cp[:, None, :] < cp[:, :, None], 1).sum(axis=(1, 2))) % 2
+    ep_parity = (numpy.triu(ep[:, None, :] < ep[:, :, None], 1).sum(axis=(1, 2))) % 2
+    swap = cp_parity != ep_parity
+    ep[swap, 10], ep[swap, 11] = ep[swap, 11], ep[swap, 10].copy()
 
-def convert_to_matrix(cube:pc.Cube) -> list:
+    corner_facelets, corner_colors, edge_facelets, edge_colors = _FACELET_TABLES
+    states = numpy.repeat(State().facelets[None, :], n, axis=0) # centres
+    for j in range(3):
+        states[rows, corner_facelets[numpy.arange(8), (j + co) % 3]] = corner_colors[cp, j]
+    for j in range(2):
+        states[rows, edge_facelets[numpy.arange(12), (j + eo) % 2]] = edge_colors[ep, j]
+    return states
+
+def gen_scrambles(n:int, seed:int|None=None, formulas:bool=False) -> tuple[numpy.ndarray, list[str]|None]:
+    """
+    Génère n cubes aléatoires uniformes et, si demandé, une formule de mélange courte pour chacun (inverse de sa solution).
+    Paramètres:     n (int) = nombre de cubes.
+                    seed (int|None) = graine du générateur aléatoire.
+                    formulas (bool) = calcule aussi les formules de mélange (une résolution par cube).
+    Retourne:       (tuple[numpy.ndarray, list[str]|None]) = cases des cubes (n x 54), formules de mélange (ou None).
+    """
+    states = gen_states(n, seed)
+    if not formulas:
+        return states, None
+    return states, [invert_formula(get_formula_to_solve(State(s).to_matrix())) for s in states]
+
+_FACELET_TABLES = _facelet_tables()
+
+def convert_to_matrix(cube) -> list:
     """
     Convertit un cube en matrice.
-    Paramètres:     cube (pc.Cube) = objet cube (comprend celui du fichier __init__.py par héritage)
+    Paramètres:     cube (Cube|State|pc.Cube) = objet cube (celui du fichier __init__.py, un état Cstate.State, ou un cube pycuber)
     Retourne:       (list) = représentation en liste de matrices d'un cube.
     """
+    if isinstance(cube, State):
+        return cube.to_matrix()
+    if isinstance(getattr(cube, "state", None), State): # objet Cube du fichier __init__.py
+        return cube.state.to_matrix()
+    # cube pycuber : lecture case par case
     index = {"L": cube.L, "U": cube.U, "F": cube.F, "D": cube.D, "R": cube.R, "B": cube.B}
     m = []
     m.append(list())
@@ -47,7 +154,7 @@ def copy_3by3(mat:list) -> list:
     """
     return [[[mat[i][j][k] for k in range(len(mat[i][j]))] for j in range(len(mat[i]))] for i in range(len(mat))]
 
-def get_value(square:pc.Square) -> str:
+def get_value(square) -> str:
     """
     Retourne la couleur d'une case modélisée par pycuber.
     Paramètres:     square (pc.Square) = case pycuber.
@@ -66,6 +173,7 @@ def get_value(square:pc.Square) -> str:
 def get_k_string(m:list) -> str:
     """
     Transforme la représentation en matrice d'un cube en chaîne de caractères compatible avec la librairie kociemba.
+    Chaque case prend la lettre de la face dont le centre a sa couleur (quel que soit le jeu de couleurs).
     Paramètres:     m (list) = représentation en liste de matrices d'un cube
     Retourne:       (str) = chaîne de représentation d'un cube avec kociemba.
     """
@@ -78,13 +186,39 @@ def get_k_string(m:list) -> str:
     f = []
     for face in d_transfo:
         f.append(str().join(face)) # liste en chaîne
-    return str().join(f) \
-                .replace('y', 'U') \
-                .replace('r', 'L') \
-                .replace('g', 'F') \
-                .replace('o', 'R') \
-                .replace('b', 'B') \
-                .replace('w', 'D') # remplacement avec convention de la librairie
+    letters = {m[i][1][1]: FACES[i] for i in range(6)} # couleur du centre -> face (convention de la librairie)
+    return str().join(letters.get(c, c) for c in str().join(f))
+
+def set_backend(backend:str) -> None:
+    """
+    Change le solveur utilisé par get_formula_to_solve et solve_many.
+    Paramètres:     backend (str) = "kociemba" ou "twophase".
+    Retourne:       rien.
+    """
+    global BACKEND
+    if backend not in ("kociemba", "twophase"):
+        raise ValueError(f"Solveur inconnu : {backend}")
+    if backend != BACKEND:
+        solution_cache.clear() # les formules dépendent du solveur
+        solution_cache.namespace = backend # cache sur disque : clés propres à chaque solveur
+    BACKEND = backend
+
+def solve_k_string(k:str) -> str:
+    """
+    Résout un cube représenté par une chaîne kociemba, avec le solveur choisi.
+    Paramètres:     k (str) = chaîne de représentation d'un cube avec kociemba.
+    Retourne:       (str) = formule de résolution.
+    """
+    if BACKEND == "twophase":
+        return Csolver.solve(k)
+    try:
+        return kociemba.solve(k)
+    except ValueError:
+        raise CombinaisonError("Le cube saisi n'est pas valide")
+
+# Cache des formules de résolution (cubes équivalents à une rotation et un changement de couleurs près)
+# Cache sur disque activable avec solution_cache.open_disk(chemin)
+solution_cache = SolutionCache(solve_k_string, namespace=BACKEND)
 
 def get_formula_to_solve(mtx:list) -> str:
     """
@@ -92,10 +226,99 @@ def get_formula_to_solve(mtx:list) -> str:
     Paramètres:     mtx (list) = représentation en liste de matrices d'un cube
     Retourne:       (str) = formule de résolution
     """
-    k = get_k_string(mtx)
+    validate(mtx) # vérification rapide : un cube invalide n'atteint pas le solveur
+    return solution_cache.solve(State.from_matrix(mtx))+" " # pour fomattage
+
+def solve_async(mtx:list) -> Future:
+    """
+    Lance la résolution d'un cube en arrière-plan et rend la main immédiatement.
+    Paramètres:     mtx (list) = représentation en liste de matrices d'un cube (copiée).
+    Retourne:       (Future) = résolution en cours : future.result() renvoie la formule, ou lève CombinaisonError si le cube est invalide
+                    (TimeoutError si le solveur "twophase" n'a pas trouvé de solution à temps).
+                    future.cancel() annule la résolution si elle n'a pas commencé (sinon, il suffit d'ignorer son résultat).
+    """
+    return _executor.submit(get_formula_to_solve, copy_3by3(mtx))
+
+def _init_worker(backend:str) -> None:
+    """
+    Initialise un processus de calcul : choisit le solveur et charge ses tables une seule fois.
+    Paramètres:     backend (str) = solveur utilisé ("kociemba" ou "twophase").
+    Retourne:       rien.
+    """
+    global BACKEND
+    signal.signal(signal.SIGTERM, signal.SIG_DFL) # SDL (pygame) détourne SIGTERM dans le processus parent : terminate() resterait bloqué
+    BACKEND = backend
+    solve_k_string(SOLVED_K_STRING)
+
+def _solve_matrix(mtx:list) -> str|CombinaisonError|TimeoutError:
+    """
+    Résout un cube (exécuté dans un processus de calcul).
+    Paramètres:     mtx (list) = représentation en liste de matrices d'un cube.
+    Retourne:       (str|CombinaisonError|TimeoutError) = formule de résolution, ou l'erreur si le cube n'est pas valide
+                                                          (ou si le solveur "twophase" n'a pas trouvé de solution à temps).
+    """
     try:
-        s = kociemba.solve(k)
-    except ValueError:
-        raise CombinaisonError("Le cube saisi n'est pas valide")
-    else:
-        return s+" " # pour fomattage
\ No newline at end of file
+        return get_formula_to_solve(mtx)
+    except (CombinaisonError, TimeoutError) as e:
+        return e
+
+def _to_matrix(state) -> list:
+    """
+    Convertit un cube (matrice, Cube, CubeByMatrix, Cstate.State ou ligne de gen_states) en représentation en liste de matrices.
+    Paramètres:     state (list|Cube|CubeByMatrix|State|numpy.ndarray) = cube à convertir.
+    Retourne:       (list) = représentation en liste de matrices du cube.
+    """
+    if isinstance(state, State):
+        return state.to_matrix()
+    if isinstance(state, numpy.ndarray): # 54 cases (codes ASCII), comme une ligne de gen_states
+        return State(state).to_matrix()
+    if hasattr(state, "get_matrix"):
+        return state.get_matrix()
+    return state
+
+def get_pool(workers:int|None=None) -> multiprocessing.pool.Pool:
+    """
+    Renvoie un groupe de processus de calcul persistant (créé au premier appel, puis réutilisé).
+    Paramètres:     workers (int|None) = nombre de processus ; nombre de cœurs si None.
+    Retourne:       (multiprocessing.pool.Pool) = groupe de processus.
+    """
+    workers = workers or multiprocessing.cpu_count()
+    if (workers, BACKEND) not in _pools:
+        if BACKEND == "twophase":
+            Csolver.get_tables() # génère le fichier des tables une seule fois, avant les processus
+        _pools[workers, BACKEND] = multiprocessing.Pool(workers, initializer=_init_worker, initargs=(BACKEND,))
+    return _pools[workers, BACKEND]
+
+@atexit.register
+def close_pools() -> None:
+    """
+    Arrête les processus de calcul persistants : ils finissent leurs tâches en cours, et sont interrompus
+    s'ils n'ont pas fini au bout de POOL_TIMEOUT secondes.
+    Paramètres:     aucun.
+    Retourne:       rien.
+    """
+    deadline = time.monotonic() + POOL_TIMEOUT
+    for pool in _pools.values():
+        pool.close()
+    for pool in _pools.values():
+        joiner = threading.Thread(target=pool.join, daemon=True) # Pool.join n'accepte pas de délai
+        joiner.start()
+        joiner.join(max(0.0, deadline - time.monotonic()))
+        if joiner.is_alive():
+            pool.terminate()
+            joiner.join()
+    _pools.clear()
+
+def solve_many(states:Iterable, workers:int|None=None, chunksize:int=16) -> Iterator[str|CombinaisonError|TimeoutError]:
+    """
+    Résout un ensemble de cubes en parallèle.
+    Les résultats sont renvoyés au fur et à mesure, dans l'ordre des cubes fournis.
+    Un cube invalide n'interrompt pas le calcul : son résultat est une CombinaisonError (non levée) ; de même pour
+    une TimeoutError du solveur "twophase".
+    Paramètres:     states (Iterable) = cubes à résoudre (matrices, Cube, CubeByMatrix, Cstate.State ou lignes de gen_states).
+                    workers (int|None) = nombre de processus de calcul ; nombre de cœurs si None.
+                    chunksize (int) = nombre de cubes envoyés à la fois à un processus.
+    Retourne:       (Iterator[str|CombinaisonError|TimeoutError]) = formules de résolution (ou erreurs), dans l'ordre.
+    """
+    matrices = (_to_matrix(state) for state in states)
+    return get_pool(workers).imap(_solve_matrix, matrices, chunksize)
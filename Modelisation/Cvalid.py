@@ -0,0 +1,106 @@
+"""
+Vérification de la validité d'un cube à partir de sa représentation en liste de matrices, sans passer par un solveur.
+Contrôles, dans l'ordre : dimensions, couleurs des centres, nombre de cases par couleur, identité des coins et des arêtes,
+orientation des coins, orientation des arêtes, parité des permutations.
+La vérification ne dépend pas du jeu de couleurs : chaque case est renommée d'après la face dont le centre a sa couleur,
+comme pour le cache des formules (Ccache.canonical_form). Seuls 6 centres de couleurs différentes sont exigés ; les
+couleurs de faces opposées (jamais sur une même pièce) sont contrôlées par l'identité des coins et des arêtes.
+"""
+
+from Exceptions import CombinaisonError
+from Modelisation.Cstate import FACES, CENTERS
+from Modelisation.Csolver import CORNER_FACELETS, EDGE_FACELETS, CORNER_COLORS, EDGE_COLORS, parity
+
+COLOR_NAMES = {"y": "jaune", "r": "rouge", "g": "vert", "o": "orange", "b": "bleu", "w": "blanc"}
+KOCIEMBA_ORDER = [FACES.index(f) for f in "URFDLB"] # ordre des faces attendu par kociemba
+
+def _sticker_name(i:int) -> str:
+    """
+    Nom d'une case de la représentation en liste de matrices (face puis numéro de 1 à 9, ligne par ligne).
+    Paramètres:     i (int) = indice de la case (0 à 53).
+    Retourne:       (str) = nom de la case, exemple : "F5".
+    """
+    return FACES[i // 9] + str(i % 9 + 1)
+
+def _color_name(c:str) -> str:
+    """
+    Nom d'une couleur.
+    Paramètres:     c (str) = caractère représentant la couleur.
+    Retourne:       (str) = nom de la couleur.
+    """
+    return COLOR_NAMES.get(c, repr(c))
+
+def diagnose(mtx:list) -> list[str]:
+    """
+    Liste les problèmes rendant un cube invalide.
+    Paramètres:     mtx (list) = représentation en liste de matrices d'un cube.
+    Retourne:       (list[str]) = description de chaque problème ; liste vide si le cube est valide.
+    """
+    if len(mtx) != 6 or any(len(face) != 3 or any(len(row) != 3 for row in face) for face in mtx):
+        return ["le cube doit comporter 6 faces de 3x3 cases"]
+    s = str().join(str(c) for face in mtx for row in face for c in row)
+    if len(s) != 54:
+        return ["chaque case doit contenir une seule couleur"]
+
+    # Centres
+    centers = str().join(s[i] for i in CENTERS)
+    if len(set(centers)) != 6:
+        return [f"les centres doivent être de 6 couleurs différentes ({', '.join(_color_name(c) for c in centers)})"]
+    unknown = [_sticker_name(i) for i in range(54) if s[i] not in centers]
+    if unknown:
+        return ["cases sans couleur valide : " + ", ".join(unknown)]
+
+    # Nombre de cases par couleur
+    problems = [f"{_color_name(c)} : {s.count(c)} cases au lieu de 9" for c in centers if s.count(c) != 9]
+    if problems:
+        return problems
+
+    # Identité des pièces, sur la chaîne kociemba (chaque case renommée d'après la face de son centre)
+    letter = {centers[f]: FACES[f] for f in range(6)}
+    k = str().join(letter[c] for f in KOCIEMBA_ORDER for c in s[f*9:f*9+9])
+    color = {FACES[f]: centers[f] for f in range(6)}
+    cp, co, ep, eo = [], [], [], []
+    for i, facelets in enumerate(CORNER_FACELETS):
+        name = str().join(k[f] for f in facelets)
+        ori = next((o for o in range(3) if name[o] in "UD"), None)
+        piece = None if ori is None else name[ori:] + name[:ori]
+        if piece not in CORNER_COLORS:
+            problems.append(f"coin {CORNER_COLORS[i]} : couleurs {'-'.join(_color_name(color[c]) for c in name)} impossibles")
+        else:
+            cp.append(CORNER_COLORS.index(piece))
+            co.append(ori)
+    for i, facelets in enumerate(EDGE_FACELETS):
+        name = str().join(k[f] for f in facelets)
+        if name in EDGE_COLORS:
+            ep.append(EDGE_COLORS.index(name))
+            eo.append(0)
+        elif name[::-1] in EDGE_COLORS:
+            ep.append(EDGE_COLORS.index(name[::-1]))
+            eo.append(1)
+        else:
+            problems.append(f"arête {EDGE_COLORS[i]} : couleurs {'-'.join(_color_name(color[c]) for c in name)} impossibles")
+    for kind, found, names in (("coin", cp, CORNER_COLORS), ("arête", ep, EDGE_COLORS)):
+        for j, piece in enumerate(names):
+            if found.count(j) > 1:
+                problems.append(f"{kind} {'-'.join(_color_name(color[c]) for c in piece)} présent {found.count(j)} fois")
+    if problems:
+        return problems
+
+    # Orientations et parité
+    if sum(co) % 3 != 0:
+        problems.append("un coin est tourné sur lui-même")
+    if sum(eo) % 2 != 0:
+        problems.append("une arête est retournée")
+    if parity(cp) != parity(ep):
+        problems.append("deux pièces sont échangées")
+    return problems
+
+def validate(mtx:list) -> None:
+    """
+    Vérifie qu'un cube est valide (soluble) ; lève une CombinaisonError détaillant les problèmes sinon.
+    Paramètres:     mtx (list) = représentation en liste de matrices d'un cube.
+    Retourne:       rien.
+    """
+    problems = diagnose(mtx)
+    if problems:
+        raise CombinaisonError("Le cube saisi n'est pas valide : " + " ; ".join(problems))
@@ -1,16 +1,17 @@
+import Modelisation.Cstate
 import Modelisation.Cutils
-
-import pycuber as pc
+import Modelisation.Cvalid
 
 """
 Module de modélisation d'un Rubik's Cube (mélange, représentation matricielle...)
+Cstate : représentation compacte de l'état d'un cube (54 cases, tables de permutation)
 Cutils : fonctions auxiliaires aux objets Cube
+Cvalid : vérification de la validité d'un cube, sans solveur
 """
 
-class Cube(pc.Cube):
+class Cube():
     """
-    Classe modélisant un cube, crée avec la librairie pycuber.
-    Hérite de pycuber.Cube.
+    Classe modélisant un cube, dont l'état est un objet Cstate.State.
     """
     def __init__(self) -> None:
         """
@@ -18,7 +19,7 @@ class Cube(pc.Cube):
         Paramètres:     aucun.
         Retourne:       rien.
         """
-        pc.Cube.__init__(self)
+        self.state = Cstate.State() # cube résolu
         self.formula = ""
         self.Cube_GL = None # Classe cube de AnimEngine/Cube_Interface.py
     
@@ -31,13 +32,22 @@ class Cube(pc.Cube):
         self.formula = Cutils.gen_formula() # génération formule
         self.apply(self.formula)
     
-    def apply(self, formula:str|pc.Formula) -> None:
+    def apply(self, formula:str|list) -> None:
         """
         Applique une formule au cube ; permet + de cohérence dans notation.
-        Paramètres:     formula (str) = formule aux conventions internationales.
+        Paramètres:     formula (str|list) = formule aux conventions internationales.
         Retourne:       rien.
         """
-        self(formula)
+        self.state.apply(formula)
+
+    def __call__(self, formula:str|list) -> "Cube":
+        """
+        Applique une formule au cube (même usage qu'un cube pycuber).
+        Paramètres:     formula (str|list) = formule aux conventions internationales.
+        Retourne:       (Cube) = le cube lui-même.
+        """
+        self.apply(formula)
+        return self
     
     def get_matrix(self) -> list:
         """
@@ -68,6 +78,15 @@ class CubeByMatrix():
         self.matrix = matrice
         self.Cube_GL = None # Classe cube de AnimEngine/Cube_Interface.py
 
+    @property
+    def state(self) -> Cstate.State:
+        """
+        État compact correspondant à la matrice (recalculé à chaque appel : la matrice peut être modifiée).
+        Paramètres:     aucun.
+        Retourne:       (Cstate.State) = état du cube.
+        """
+        return Cstate.State.from_matrix(self.matrix)
+
     def print(self) -> None:
         """
         Affiche le cube.
@@ -90,4 +109,12 @@ class CubeByMatrix():
         Paramètres:     aucun.
         Retourne:       (str) formule permettant de résoudre le cube.
         """
-        return Cutils.get_formula_to_solve(self.matrix) # formule de résolution
\ No newline at end of file
+        return Cutils.get_formula_to_solve(self.matrix) # formule de résolution
+
+    def validate(self) -> None:
+        """
+        Vérifie que le cube est valide ; lève une CombinaisonError détaillant les problèmes sinon.
+        Paramètres:     aucun.
+        Retourne:       rien.
+        """
+        Cvalid.validate(self.matrix)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pygame import mixer
+from pygame import mixer, error
 from os import path
 
 G_path = path.realpath(__file__).replace("__init__.py","")
@@ -16,10 +16,14 @@ correspondances = {
     "R'":"Re1#",
     "F":"Si1",
     "F'":"Sol1#"
-} # les mouvements U2, F2, R2, etc sont décomposés.
+} # les mouvements U2, F2, R2, etc jouent le son du quart de tour.
 
-mixer.init()
-mixer.music.set_volume(1)
+try:
+    mixer.init()
+    mixer.music.set_volume(1)
+    available = True
+except error: # aucun périphérique audio (serveur, rendu hors écran) : sons désactivés
+    available = False
 
 def play_mvt(mvt_rubix:str,volume:float=1.0) -> None:
     """
@@ -28,6 +32,9 @@ def play_mvt(mvt_rubix:str,volume:float=1.0) -> None:
                     volume (float) = volume du son (entre 0.0 et 1.0)
     Retourne:       rien.
     """
+    mvt_rubix = mvt_rubix.replace("2", "")
+    if not available or mvt_rubix not in correspondances: # tranches du milieu (M, E, S) : pas de son
+        return
     path = G_path+"/enregistrements/"+correspondances[mvt_rubix]+".mp3"
     mixer.music.load(path)
     mixer.music.set_volume(volume) # selon entrée utilisateur
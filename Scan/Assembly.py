@@ -0,0 +1,84 @@
+"""
+Assemblage d'un cube scanné dans n'importe quel ordre et n'importe quelle orientation.
+Chaque face est identifiée par la couleur de son centre, qui donne sa place dans la représentation en liste de matrices.
+Son orientation (quart de tour près) est déduite de la cohérence des arêtes et des coins entre faces voisines :
+seules les orientations formant des pièces existantes, chacune présente une fois, et un cube valide sont retenues.
+"""
+
+from Modelisation.Cstate import POSITIONS, FACES, SOLVED
+from Modelisation import Cvalid
+
+import numpy
+
+SCAN_TURNS = {"U": 1, "L": 0, "F": 0, "R": 0, "B": 0, "D": 0} # quarts de tour anti-horaires d'une face tenue comme dans le tutoriel
+
+def _build_pieces() -> list[tuple[int]]:
+    """
+    Regroupe les cases des arêtes et des coins (cases d'une même position du cube).
+    Paramètres:     aucun.
+    Retourne:       (list[tuple[int]]) = indices des cases (représentation en liste de matrices) de chaque pièce.
+    """
+    groups = {}
+    for i in range(54):
+        groups.setdefault(tuple(POSITIONS[i]), []).append(i)
+    return [tuple(group) for group in groups.values() if len(group) > 1]
+
+PIECES = _build_pieces()
+PIECE_COLORS = {frozenset(SOLVED[i // 9] for i in piece) for piece in PIECES} # couleurs des 20 pièces
+
+def rotate(face:list[list], turns:int) -> list[list]:
+    """
+    Tourne une face de quarts de tour dans le sens inverse des aiguilles d'une montre.
+    Paramètres:     face (list[list]) = matrice 3x3.
+                    turns (int) = nombre de quarts de tour.
+    Retourne:       (list[list]) = matrice 3x3 tournée.
+    """
+    return numpy.rot90(numpy.array(face, dtype=object), turns).tolist()
+
+def orientations(faces:dict[str, list]) -> list[dict[str, int]]:
+    """
+    Cherche les orientations des faces formant un cube valide : les faces sont tournées l'une après l'autre, et une
+    orientation est abandonnée dès qu'une pièce dont toutes les faces sont placées est impossible ou déjà présente.
+    Paramètres:     faces (dict[str, list]) = matrice 3x3 de chaque face (telle que scannée), selon la couleur de son centre.
+    Retourne:       (list[dict[str, int]]) = quarts de tour anti-horaires de chaque face (selon la couleur de son centre),
+                                             pour chaque cube valide.
+    """
+    stickers = numpy.full(54, "", dtype=object)
+    turns = {}
+    pieces = [[piece for piece in PIECES if max(piece) // 9 == f] for f in range(6)] # pièces complètes une fois la face f placée
+    found = []
+
+    def place(f:int, used:set) -> None:
+        if f == len(FACES):
+            mtx = stickers.reshape(6, 3, 3).tolist()
+            if not Cvalid.diagnose(mtx): # orientation des pièces et parité
+                found.append(dict(turns))
+            return
+        color = SOLVED[f]
+        seen = [] # faces symétriques : une orientation donnant la même face n'est essayée qu'une fois
+        for turn in range(4):
+            face = rotate(faces[color], turn + SCAN_TURNS[FACES[f]])
+            if face in seen:
+                continue
+            seen.append(face)
+            stickers[f*9:f*9+9] = numpy.array(face, dtype=object).reshape(9)
+            placed = [frozenset(stickers[list(piece)]) for piece in pieces[f]]
+            if len(set(placed)) == len(placed) and all(p in PIECE_COLORS and p not in used for p in placed):
+                turns[color] = turn
+                place(f + 1, used | set(placed))
+
+    place(0, set())
+    return found
+
+def assemble(faces:dict[str, list]) -> list:
+    """
+    Assemble les faces scannées en représentation en liste de matrices, en tournant chaque face pour former un cube valide.
+    Parmi les cubes valides, celui qui tourne le moins de faces par rapport au scan est retenu ; si aucun n'est valide,
+    les faces sont placées telles que scannées (la validation du cube signalera le problème).
+    Paramètres:     faces (dict[str, list]) = matrice 3x3 de chaque face (telle que scannée), selon la couleur de son centre.
+    Retourne:       (list) = représentation en liste de matrices du cube (ordre U, L, F, R, B, D).
+    """
+    found = orientations(faces)
+    best = min(found, key=lambda turns: (sum(t != 0 for t in turns.values()), sum(min(t, 4 - t) for t in turns.values())),
+               default={color: 0 for color in SOLVED})
+    return [rotate(faces[color], best[color] + SCAN_TURNS[FACES[f]]) for f, color in enumerate(SOLVED)]
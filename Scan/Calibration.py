@@ -0,0 +1,151 @@
+"""
+Étalonnage des couleurs du scan selon l'éclairage et la caméra.
+Les couleurs sont comparées dans l'espace Lab (perceptuel), moins sensible que RVB aux variations de luminosité.
+Le centre de chaque face validée donne un échantillon de couleur connue : la référence de cette couleur s'en rapproche,
+si l'échantillon en est déjà la couleur la plus proche (une mauvaise face présentée ne fausse pas le profil).
+Les références apprises sont enregistrées par caméra ; le scan suivant commence étalonné.
+Le classement reste celui de la référence la plus proche, et non un regroupement (k-means) des 54 cases en fin de scan :
+chaque image doit être classée dès sa lecture pour le vote des couleurs, et les centres sont les seuls échantillons
+de couleur connue (un regroupement sans étiquettes peut échanger deux couleurs proches, comme rouge et orange).
+"""
+
+import cv2
+import json
+import numpy
+import os
+
+PROFILES_PATH = os.path.join(os.path.expanduser("~"), ".rubix", "calibration.json") # profils enregistrés, par caméra
+HISTORY = 10 # nombre d'échantillons pris en compte par référence : les plus anciens s'effacent (éclairage changeant)
+LIGHTNESS_WEIGHT = 0.5 # poids de la luminosité (L) face à la teinte (a, b) dans la distance entre couleurs
+
+def to_lab(samples:list|numpy.ndarray) -> numpy.ndarray:
+    """
+    Convertit des couleurs RVB dans l'espace Lab.
+    Paramètres:     samples (list|numpy.ndarray) = couleurs, une ligne (R, G, B) par couleur (entre 0 et 255).
+    Retourne:       (numpy.ndarray) = couleurs Lab, une ligne (L, a, b) par couleur (L entre 0 et 100).
+    """
+    rgb = numpy.asarray(samples, dtype=numpy.float32).reshape(-1, 1, 3) / 255
+    return cv2.cvtColor(rgb, cv2.COLOR_RGB2Lab).reshape(-1, 3)
+
+class ColorProfile():
+    """
+    Classe modélisant les couleurs de référence des cases pour une caméra : une couleur Lab par caractère de couleur.
+    """
+    def __init__(self, names:list[str], references:list|numpy.ndarray, counts:list[int]|None=None) -> None:
+        """
+        Instancie un objet ColorProfile.
+        Paramètres:     names (list[str]) = caractère de chaque couleur (r, b, g, y, o, w).
+                        references (list|numpy.ndarray) = couleur Lab de chaque caractère (une ligne (L, a, b) par couleur).
+                        counts (list[int]|None) = nombre d'échantillons déjà appris par couleur ; None : aucun (références théoriques).
+        Retourne:       rien.
+        """
+        self.names = list(names)
+        self.references = numpy.array(references, dtype=numpy.float32).reshape(len(self.names), 3)
+        self.counts = numpy.zeros(len(self.names), dtype=int) if counts is None else numpy.array(counts, dtype=int)
+        self.weights = numpy.array([LIGHTNESS_WEIGHT, 1, 1], dtype=numpy.float32)
+
+    @classmethod
+    def from_rgb(cls, names:list[str], colors:list|numpy.ndarray) -> "ColorProfile":
+        """
+        Crée un profil à partir de couleurs RVB théoriques (aucun échantillon appris).
+        Paramètres:     names (list[str]) = caractère de chaque couleur.
+                        colors (list|numpy.ndarray) = couleur RVB de chaque caractère.
+        Retourne:       (ColorProfile) = profil non étalonné.
+        """
+        return cls(names, to_lab(colors))
+
+    def classify(self, samples:list|numpy.ndarray) -> list[str]:
+        """
+        Associe à chaque case la couleur de référence la plus proche (distance Lab pondérée), en un seul calcul ;
+        l'adaptation à la session vient des références, étalonnées par les centres (voir calibrate).
+        Paramètres:     samples (list|numpy.ndarray) = couleurs des cases, une ligne (R, G, B) par case.
+        Retourne:       (list[str]) = caractère de la couleur de chaque case.
+        """
+        lab = to_lab(samples)[:, None, :]
+        distances = numpy.sum(((lab - self.references) * self.weights)**2, axis=2) # case x couleur de référence
+        return [self.names[i] for i in numpy.argmin(distances, axis=1)]
+
+    def learn(self, name:str, sample:list|numpy.ndarray) -> None:
+        """
+        Rapproche une couleur de référence d'un échantillon de couleur connue (moyenne des HISTORY derniers échantillons).
+        Sans échantillon appris, la référence de départ compte comme un échantillon : un seul échantillon ne la remplace pas.
+        Paramètres:     name (str) = caractère de la couleur de l'échantillon.
+                        sample (list|numpy.ndarray) = couleur RVB de l'échantillon.
+        Retourne:       rien.
+        """
+        i = self.names.index(name)
+        n = min(max(self.counts[i], 1), HISTORY - 1) # échantillons déjà pris en compte (au moins la référence de départ)
+        self.references[i] = (self.references[i]*n + to_lab(sample)[0]) / (n + 1)
+        self.counts[i] += 1
+
+    def calibrate(self, name:str, sample:list|numpy.ndarray|None) -> bool:
+        """
+        Étalonne une couleur avec le centre d'une face validée, si l'échantillon est déjà classé dans cette couleur
+        (mauvaise face présentée, ou fond pris pour le centre : le profil n'est pas modifié).
+        Paramètres:     name (str) = caractère de la couleur attendue du centre.
+                        sample (list|numpy.ndarray|None) = couleur RVB du centre ; None : centre non mesuré.
+        Retourne:       (bool) = True si le profil a été étalonné.
+        """
+        if sample is None or self.classify([sample])[0] != name:
+            return False
+        self.learn(name, sample)
+        return True
+
+    def to_dict(self) -> dict:
+        """
+        Représentation enregistrable du profil.
+        Paramètres:     aucun.
+        Retourne:       (dict) = caractère de chaque couleur : {"lab": [L, a, b], "count": nombre d'échantillons}.
+        """
+        return {name: {"lab": self.references[i].tolist(), "count": int(self.counts[i])} for i, name in enumerate(self.names)}
+
+    def update(self, data:dict) -> None:
+        """
+        Reprend les références apprises d'un profil enregistré (les couleurs absentes ou invalides sont ignorées).
+        Paramètres:     data (dict) = représentation du profil (voir to_dict).
+        Retourne:       rien.
+        """
+        for i, name in enumerate(self.names):
+            try:
+                lab = numpy.array(data[name]["lab"], dtype=numpy.float32).reshape(3)
+                count = int(data[name]["count"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            self.references[i], self.counts[i] = lab, min(count, HISTORY)
+
+def load_profile(camera:str, default:ColorProfile) -> ColorProfile:
+    """
+    Charge le profil enregistré d'une caméra.
+    Paramètres:     camera (str) = identifiant de la caméra.
+                    default (ColorProfile) = profil de départ, complété par le profil enregistré (copié, non modifié).
+    Retourne:       (ColorProfile) = profil de la caméra ; copie de default si aucun n'est enregistré.
+    """
+    profile = ColorProfile(default.names, default.references, default.counts)
+    try:
+        with open(PROFILES_PATH, encoding="utf-8") as file:
+            profile.update(json.load(file)[camera])
+    except (OSError, ValueError, KeyError, TypeError): # aucun profil enregistré, ou fichier illisible
+        pass
+    return profile
+
+def save_profile(camera:str, profile:ColorProfile) -> None:
+    """
+    Enregistre le profil d'une caméra (sans effacer ceux des autres caméras). Échoue silencieusement.
+    Paramètres:     camera (str) = identifiant de la caméra.
+                    profile (ColorProfile) = profil à enregistrer.
+    Retourne:       rien.
+    """
+    try:
+        with open(PROFILES_PATH, encoding="utf-8") as file:
+            profiles = json.load(file)
+        if not isinstance(profiles, dict):
+            profiles = {}
+    except (OSError, ValueError):
+        profiles = {}
+    profiles[camera] = profile.to_dict()
+    try:
+        os.makedirs(os.path.dirname(PROFILES_PATH), exist_ok=True)
+        with open(PROFILES_PATH, "w", encoding="utf-8") as file:
+            json.dump(profiles, file, indent=1)
+    except OSError: # dossier personnel non accessible : l'étalonnage sera refait au prochain scan
+        pass
@@ -0,0 +1,193 @@
+"""
+Lecture de la caméra et analyse des images en parallèle de l'affichage.
+CameraStream lit la caméra dans un fil d'exécution dédié et ne conserve que l'image la plus récente :
+le tampon du pilote est réduit au minimum pour ne pas recevoir d'images périmées.
+DetectionWorker analyse, dans un autre fil, la dernière image disponible (les images lues pendant une analyse sont sautées).
+L'affichage reste dans le fil principal (cv2.imshow) et n'attend ni la caméra ni l'analyse.
+OpenCV libère le GIL pendant la lecture et les traitements d'image : les trois fils avancent réellement en parallèle.
+"""
+
+from Exceptions import CameraError
+
+import cv2
+import numpy
+import threading
+from collections.abc import Callable
+
+READ_TIMEOUT = 5.0 # secondes sans nouvelle image avant de considérer la caméra perdue
+
+class CameraStream():
+    """
+    Classe modélisant une caméra lue en continu : seule la dernière image est gardée.
+    """
+    def __init__(self, source:int|str=0, width:int|None=None, height:int|None=None, fps:float|None=None, codec:str|None=None) -> None:
+        """
+        Instancie un objet CameraStream : ouvre et configure la caméra (la lecture commence avec start).
+        Paramètres:     source (int|str) = indice de la caméra, ou chemin/URL d'une vidéo.
+                        width (int|None) = largeur d'image demandée ; None : celle du pilote.
+                        height (int|None) = hauteur d'image demandée ; None : celle du pilote.
+                        fps (float|None) = images par seconde demandées ; None : valeur du pilote.
+                        codec (str|None) = format de la caméra (FOURCC, ex. "MJPG") ; None : celui du pilote.
+        Retourne:       rien.
+        """
+        self.video = cv2.VideoCapture(source)
+        if not self.video.isOpened():
+            raise CameraError("Impossible d'ouvrir la source")
+        self.video.set(cv2.CAP_PROP_BUFFERSIZE, 1) # tampon minimal : pas d'images en retard (ignoré par certains pilotes)
+        if codec is not None: # avant la résolution : certains pilotes n'offrent les hautes résolutions qu'en MJPG
+            self.video.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*codec))
+        if width is not None:
+            self.video.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        if height is not None:
+            self.video.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        if fps is not None:
+            self.video.set(cv2.CAP_PROP_FPS, fps)
+        # valeurs réellement obtenues (le pilote arrondit aux modes disponibles)
+        self.width = int(self.video.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.video.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = self.video.get(cv2.CAP_PROP_FPS)
+
+        self.frame = None # dernière image lue
+        self.index = 0 # numéro de la dernière image lue (0 : aucune)
+        self.failed = False # lecture impossible (caméra débranchée, fin de vidéo)
+        self.running = False
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def start(self) -> "CameraStream":
+        """
+        Lance la lecture en continu.
+        Paramètres:     aucun.
+        Retourne:       (CameraStream) = l'objet lui-même.
+        """
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self._capture, name="camera", daemon=True)
+            self.thread.start()
+        return self
+
+    def _capture(self) -> None:
+        """
+        Boucle du fil de lecture : remplace la dernière image à chaque image lue.
+        Paramètres:     aucun.
+        Retourne:       rien.
+        """
+        while self.running:
+            is_ok, image = self.video.read()
+            with self.condition:
+                if not is_ok:
+                    self.failed = True
+                    self.condition.notify_all()
+                    return
+                self.frame = image
+                self.index += 1
+                self.condition.notify_all()
+
+    def read(self, last:int=0, timeout:float=READ_TIMEOUT) -> tuple[int, numpy.ndarray]:
+        """
+        Renvoie la dernière image lue, en attendant qu'elle soit plus récente que la précédente obtenue.
+        Paramètres:     last (int) = numéro de la dernière image déjà traitée par l'appelant (0 : aucune).
+                        timeout (float) = attente maximale (secondes).
+        Retourne:       (tuple) = numéro de l'image, image (à ne pas modifier : elle peut être partagée).
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.index > last or self.failed or not self.running, timeout):
+                raise CameraError("La caméra ne répond plus")
+            if self.index <= last: # arrêt ou échec sans nouvelle image
+                raise CameraError("Impossible de lire la source")
+            return self.index, self.frame
+
+    def release(self) -> None:
+        """
+        Arrête la lecture et libère la caméra.
+        Paramètres:     aucun.
+        Retourne:       rien.
+        """
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.video.release()
+
+    def __enter__(self) -> "CameraStream":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.release()
+
+class DetectionWorker():
+    """
+    Classe modélisant l'analyse en continu des images d'une caméra, dans un fil d'exécution dédié.
+    """
+    def __init__(self, stream:CameraStream, detect:Callable[[numpy.ndarray], object]) -> None:
+        """
+        Instancie un objet DetectionWorker (l'analyse commence avec start).
+        Paramètres:     stream (CameraStream) = caméra lue en continu.
+                        detect (Callable) = analyse d'une image ; ne doit pas modifier l'image.
+        Retourne:       rien.
+        """
+        self.stream = stream
+        self.detect = detect
+        self.result = None # (numéro de l'image, résultat de l'analyse) le plus récent
+        self.error = None # exception levée par la lecture ou l'analyse
+        self.running = False
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def start(self) -> "DetectionWorker":
+        """
+        Lance l'analyse en continu.
+        Paramètres:     aucun.
+        Retourne:       (DetectionWorker) = l'objet lui-même.
+        """
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self._work, name="detection", daemon=True)
+            self.thread.start()
+        return self
+
+    def _work(self) -> None:
+        """
+        Boucle du fil d'analyse : analyse la dernière image, puis la suivante disponible.
+        Paramètres:     aucun.
+        Retourne:       rien.
+        """
+        last = 0
+        try:
+            while self.running:
+                last, image = self.stream.read(last)
+                result = self.detect(image)
+                with self.lock:
+                    self.result = (last, result)
+        except Exception as e: # transmis au fil principal par latest
+            self.error = e
+
+    def latest(self) -> tuple[int, object]|None:
+        """
+        Renvoie le résultat de la dernière analyse terminée, sans attendre.
+        Paramètres:     aucun.
+        Retourne:       (tuple|None) = numéro de l'image analysée, résultat ; None si aucune analyse n'est terminée.
+        """
+        if self.error is not None:
+            raise self.error
+        with self.lock:
+            return self.result
+
+    def stop(self) -> None:
+        """
+        Arrête l'analyse (attend la fin de l'analyse en cours).
+        Paramètres:     aucun.
+        Retourne:       rien.
+        """
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def __enter__(self) -> "DetectionWorker":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,225 @@
+"""
+Scan de trois faces à la fois : le cube est présenté par un coin, face à la caméra.
+Les cases des faces visibles apparaissent comme des parallélogrammes dont les côtés suivent les arêtes du cube partant de
+ce coin (axes) : chaque case est rattachée à la face de ses deux axes, la grille 3x3 de chaque face est placée
+(Grid.fit_grid), puis la face est redressée par une transformation de perspective avant la mesure de ses 9 couleurs.
+Deux positions du cube (deux coins opposés) suffisent pour ses 6 faces ; chaque face est identifiée par son centre et
+son orientation est déduite des autres faces (Assembly.assemble).
+"""
+
+import Scan
+from Scan import Calibration, Grid, Tracking
+
+import cv2
+import math
+import numpy
+
+CORNER_AREA = (300, 3000) # aire d'une case candidate, pour une image de REFERENCE_WIDTH pixels de large (cases vues de biais : plus petites)
+APPROX_EPSILON = 0.08 # écart maximal entre un contour et le quadrilatère qui l'approche, en part du périmètre
+MIN_SIDE_RATIO = 0.3 # rapport minimal entre les deux côtés d'une case (case très écrasée : rejetée)
+AXIS_TOLERANCE = 15 # écart maximal entre le côté d'une case et l'axe du cube le plus proche (degrés)
+RECTIFIED_CELL = 32 # côté d'une case de la face redressée (pixels)
+CELL_MARGIN = 0.25 # part du côté d'une case ignorée de chaque bord lors de la mesure de sa couleur
+# Position d'origine de chaque case d'une face tournée de 0 à 3 quarts de tour (sens inverse des aiguilles d'une montre)
+TURNS = [numpy.rot90(numpy.arange(9).reshape(3, 3), turn).reshape(9).tolist() for turn in range(4)]
+
+def to_quad(contour:numpy.ndarray, scale:float=1.0) -> numpy.ndarray|None:
+    """
+    Approche un contour par un quadrilatère convexe, s'il peut correspondre à une case vue de biais.
+    Paramètres:     contour (numpy.ndarray) = contour openCV.
+                    scale (float) = largeur de l'image analysée divisée par REFERENCE_WIDTH.
+    Retourne:       (numpy.ndarray|None) = sommets du quadrilatère (4 x 2) ; None si le contour ne correspond pas.
+    """
+    area = cv2.contourArea(contour)
+    if not CORNER_AREA[0]*scale*scale < area < CORNER_AREA[1]*scale*scale:
+        return None
+    quad = cv2.approxPolyDP(contour, APPROX_EPSILON*cv2.arcLength(contour, True), True)
+    if len(quad) != 4 or not cv2.isContourConvex(quad):
+        return None
+    quad = quad.reshape(4, 2).astype(numpy.float32)
+    a, b = numpy.linalg.norm(sides(quad), axis=1)
+    if min(a, b) < MIN_SIDE_RATIO * max(a, b):
+        return None
+    return quad
+
+def sides(quad:numpy.ndarray) -> numpy.ndarray:
+    """
+    Côtés moyens d'un quadrilatère : moyenne de chaque paire de côtés opposés.
+    Paramètres:     quad (numpy.ndarray) = sommets du quadrilatère (4 x 2), dans l'ordre du contour.
+    Retourne:       (numpy.ndarray) = les deux côtés (2 x 2).
+    """
+    return numpy.array([quad[1] - quad[0] + quad[2] - quad[3], quad[3] - quad[0] + quad[2] - quad[1]]) / 2
+
+def angle_gap(a:numpy.ndarray, b:float) -> numpy.ndarray:
+    """
+    Écart entre des directions (sans sens : à 180° près).
+    Paramètres:     a (numpy.ndarray) = angles (radians).
+                    b (float) = angle de référence (radians).
+    Retourne:       (numpy.ndarray) = écarts, entre 0 et 90° (radians).
+    """
+    gap = numpy.abs(a - b) % math.pi
+    return numpy.minimum(gap, math.pi - gap)
+
+def cube_axes(angles:numpy.ndarray) -> list[float]:
+    """
+    Directions des arêtes du cube sur l'image : les directions les plus fréquentes parmi les côtés des cases (3 au plus).
+    Paramètres:     angles (numpy.ndarray) = direction de chaque côté de case (radians).
+    Retourne:       (list[float]) = direction de chaque axe (radians, à 180° près), suivie par au moins Grid.MIN_CELLS côtés.
+    """
+    degrees = numpy.rint(numpy.degrees(angles)).astype(int) % 180
+    histogram = numpy.bincount(degrees, minlength=180)
+    window = numpy.concatenate([histogram[-AXIS_TOLERANCE:], histogram, histogram[:AXIS_TOLERANCE]]) # circulaire
+    counts = numpy.convolve(window, numpy.ones(2*AXIS_TOLERANCE + 1, dtype=int), "valid") # côtés à moins de AXIS_TOLERANCE
+    axes = []
+    while len(axes) < 3:
+        peak = int(numpy.argmax(counts))
+        if counts[peak] < Grid.MIN_CELLS:
+            break
+        near = angle_gap(angles, math.radians(peak)) < math.radians(AXIS_TOLERANCE)
+        # moyenne circulaire des directions proches (angles doublés : direction sans sens)
+        axes.append(math.atan2(numpy.sin(2*angles[near]).sum(), numpy.cos(2*angles[near]).sum()) / 2)
+        gaps = numpy.minimum(numpy.abs(numpy.arange(180) - peak), 180 - numpy.abs(numpy.arange(180) - peak))
+        counts[gaps <= 2*AXIS_TOLERANCE] = 0 # deux axes ne peuvent pas être aussi proches
+    return axes
+
+def face_basis(centers:numpy.ndarray, u:numpy.ndarray, v:numpy.ndarray) -> numpy.ndarray|None:
+    """
+    Vecteurs du réseau des cases d'une face vue de biais (voir Grid.lattice), à partir des côtés de ses cases.
+    Paramètres:     centers (numpy.ndarray) = centres des cases de la face (x, y).
+                    u (numpy.ndarray) = côté de chaque case selon le premier axe de la face (orientés dans le même sens).
+                    v (numpy.ndarray) = côté de chaque case selon le second axe de la face (orientés dans le même sens).
+    Retourne:       (numpy.ndarray|None) = matrice 2x2 dont les colonnes sont les deux vecteurs (colonne suivante, ligne suivante),
+                                           dans le sens de lecture d'une face vue de l'extérieur ; None sans cases voisines.
+    """
+    cell = numpy.column_stack([numpy.median(u, axis=0), numpy.median(v, axis=0)]) # côtés d'une case
+    coords = ((centers[None, :, :] - centers[:, None, :]).reshape(-1, 2)) @ numpy.linalg.inv(cell).T # en côtés de case
+    pitches = []
+    for along in range(2): # écart entre cases voisines selon chaque axe, en côtés de case
+        steps = numpy.abs(coords[:, along])
+        neighbors = ((steps > Grid.NEIGHBOR_RANGE[0]) & (steps < Grid.NEIGHBOR_RANGE[1])
+                     & (numpy.abs(coords[:, 1 - along]) < Grid.TOLERANCE))
+        if not neighbors.any():
+            return None
+        pitches.append(numpy.median(steps[neighbors]))
+    basis = cell * pitches
+    if basis[0, 0]*basis[1, 1] - basis[1, 0]*basis[0, 1] < 0: # lecture en miroir : on inverse le sens des lignes
+        basis[:, 1] = -basis[:, 1]
+    return basis
+
+def rectify(image:numpy.ndarray, positions:numpy.ndarray) -> numpy.ndarray:
+    """
+    Redresse une face vue de biais : transformation de perspective amenant ses 9 cases sur une grille carrée.
+    Paramètres:     image (numpy.ndarray) = image de la caméra (BGR).
+                    positions (numpy.ndarray) = centres des 9 cases dans l'ordre de lecture (9 x 2).
+    Retourne:       (numpy.ndarray) = face redressée (BGR), de 3 x RECTIFIED_CELL pixels de côté.
+    """
+    target = (Grid.GRID + 0.5) * RECTIFIED_CELL
+    homography = cv2.findHomography(target, positions.astype(numpy.float32))[0] # face redressée -> image
+    side = 3 * RECTIFIED_CELL
+    return cv2.warpPerspective(image, homography, (side, side), flags=cv2.INTER_LINEAR | cv2.WARP_INVERSE_MAP)
+
+def detect_corner(image:numpy.ndarray, frame_width:int|None=None) -> tuple[list, list]:
+    """
+    Détecte les faces d'un cube présenté par un coin (jusqu'à 3) et calcule la couleur de leurs cases
+    (n'affiche rien, ne modifie pas l'image).
+    Paramètres:     image (numpy.ndarray) = image de la caméra (BGR).
+                    frame_width (int|None) = largeur de l'image entière de la caméra (échelle des seuils) ; None : largeur de image.
+    Retourne:       (tuple) = contours des cases retenues (pleine résolution),
+                              pour chaque face : centres des 9 cases dans l'ordre de lecture (9 x 2), couleur de chacune
+                              (9 x [R, G, B]) mesurée sur la face redressée, case détectée ou déduite de la grille (9 booléens).
+    """
+    contours, factor, scale = Scan.find_contours(image, frame_width)
+    quads = [quad for quad in (to_quad(contour, scale) for contour in contours) if quad is not None]
+    if len(quads) < Grid.MIN_CELLS:
+        return [], []
+    quads = numpy.array(quads) * factor # coordonnées pleine résolution
+    edges = numpy.array([sides(quad) for quad in quads]) # N x 2 côtés x (x, y)
+    angles = numpy.arctan2(edges[:, :, 1], edges[:, :, 0])
+    axes = cube_axes(angles.reshape(-1))
+
+    # Rattachement de chaque case à une face : la paire d'axes suivie par ses deux côtés
+    nearest = numpy.array([[angle_gap(angles[:, k], axis) for axis in axes] for k in range(2)]) # côté x axe x case
+    first, second = nearest.argmin(axis=1)
+    aligned = (nearest.min(axis=1) < math.radians(AXIS_TOLERANCE)).all(axis=0) & (first != second)
+    cases, faces = [], []
+    for i, j in ((0, 1), (0, 2), (1, 2)):
+        if j >= len(axes):
+            continue
+        members = numpy.flatnonzero(aligned & (numpy.minimum(first, second) == i) & (numpy.maximum(first, second) == j))
+        if len(members) < Grid.MIN_CELLS:
+            continue
+        # côté de chaque case selon l'axe i puis l'axe j, orientés comme l'axe
+        u = numpy.where((first[members] == i)[:, None], edges[members, 0], edges[members, 1])
+        v = numpy.where((first[members] == i)[:, None], edges[members, 1], edges[members, 0])
+        u *= numpy.sign(u @ (math.cos(axes[i]), math.sin(axes[i])))[:, None]
+        v *= numpy.sign(v @ (math.cos(axes[j]), math.sin(axes[j])))[:, None]
+        centers = quads[members].mean(axis=1)
+        basis = face_basis(centers, u, v)
+        if basis is None:
+            continue
+        sizes = numpy.sqrt(numpy.abs(u[:, 0]*v[:, 1] - u[:, 1]*v[:, 0]))
+        grid = Grid.fit_grid(centers, sizes, basis)
+        if grid is None:
+            continue
+        positions, cells = grid
+        found = members[cells[cells >= 0]]
+        cases.extend(quads[found].astype(numpy.int32).reshape(-1, 4, 1, 2))
+        rgb = cv2.cvtColor(rectify(image, positions), cv2.COLOR_BGR2RGB)
+        boxes = numpy.hstack([Grid.GRID * RECTIFIED_CELL, numpy.full((9, 2), RECTIFIED_CELL)]) # cases de la face redressée
+        colors = Scan.calcul_couleurs(rgb, boxes, margin=round(RECTIFIED_CELL * CELL_MARGIN))
+        faces.append((positions, colors.tolist(), (cells >= 0).tolist()))
+    return cases, faces
+
+class CornerVotes():
+    """
+    Classe modélisant le vote des couleurs des faces vues par un coin : un vote par face, selon la couleur de son centre.
+    Le sens de lecture d'une face vue de biais peut changer d'une image à l'autre (ordre des axes) : chaque observation
+    est tournée pour correspondre au mieux au vote en cours.
+    """
+    def __init__(self, profile:Calibration.ColorProfile|None=None) -> None:
+        """
+        Instancie un objet CornerVotes.
+        Paramètres:     profile (ColorProfile|None) = couleurs de référence (Lab), étalonnées par les centres des faces validées ;
+                                                      None : classification RVB fixe.
+        Retourne:       rien.
+        """
+        self.profile = profile
+        self.votes = {} # vote des couleurs de chaque face (FaceVotes), selon la couleur de son centre
+        self.centers = {} # dernière couleur mesurée du centre de chaque face (R, G, B)
+
+    def add(self, faces:list) -> None:
+        """
+        Classe les couleurs des cases détectées de chaque face et les ajoute au vote de la face de même centre.
+        Paramètres:     faces (list) = faces détectées sur une image (voir detect_corner).
+        Retourne:       rien.
+        """
+        for positions, colors, detected in faces:
+            cells = [cell for cell in range(9) if detected[cell]] # cases déduites de la grille : le plus souvent masquées
+            if 4 not in cells: # face identifiée par son centre
+                continue
+            samples = [colors[cell] for cell in cells]
+            names = Scan.classify_colors(samples) if self.profile is None else self.profile.classify(samples)
+            observed = dict(zip(cells, names))
+            votes = self.votes.setdefault(observed[4], Tracking.FaceVotes())
+            current = votes.result()[0]
+            turned = [{i: observed[turn[i]] for i in range(9) if turn[i] in observed} for turn in TURNS]
+            votes.add(max(turned, key=lambda face: sum(current[i] == color for i, color in face.items()))) # premier en cas d'égalité
+            self.centers[observed[4]] = colors[4]
+
+    def accepted(self, scanned:dict) -> dict[str, list]:
+        """
+        Faces nouvellement validées ; étalonne le profil avec leur centre.
+        Paramètres:     scanned (dict) = faces déjà validées, selon la couleur de leur centre (ignorées).
+        Retourne:       (dict[str, list]) = matrice 3x3 de chaque face nouvellement validée, selon la couleur de son centre.
+        """
+        faces = {}
+        for center, votes in self.votes.items():
+            if center in scanned or not votes.accepted():
+                continue
+            face = votes.result()[0]
+            if face[4] != center:
+                continue
+            if self.profile is not None:
+                self.profile.calibrate(center, self.centers[center])
+            faces[center] = Scan.to_matrix(face)
+        return faces
@@ -0,0 +1,92 @@
+"""
+Modèle de grille 3x3 d'une face du cube.
+Les cases candidates (contours acceptés par conditions_ok) sont placées sur un réseau régulier : l'écart entre cases et
+l'orientation de la face sont estimés à partir des vecteurs entre cases voisines ; les candidates hors du réseau
+(reflets, fond) sont écartées. L'homographie de la face est ensuite calculée sur les cases retenues : la position des
+9 cases en découle, y compris celles qui n'ont pas été détectées, et l'ordre des lignes et colonnes vient de la géométrie.
+"""
+
+import cv2
+import math
+import numpy
+
+MIN_CELLS = 5 # cases détectées minimales (dont les 4 coins de la grille : lignes et colonnes extrêmes) pour placer la grille
+NEIGHBOR_RANGE = (1.0, 1.8) # distance entre deux cases voisines, en tailles de case
+TOLERANCE = 0.3 # écart maximal d'une case au nœud du réseau le plus proche, en écarts entre cases
+
+# Nœuds de la grille (colonne, ligne), dans l'ordre de lecture
+GRID = numpy.array([(col, row) for row in range(3) for col in range(3)], dtype=numpy.float32)
+
+def lattice(centers:numpy.ndarray, sizes:numpy.ndarray) -> numpy.ndarray|None:
+    """
+    Estime les deux vecteurs du réseau des cases : colonne suivante (vers la droite), ligne suivante (vers le bas).
+    Paramètres:     centers (numpy.ndarray) = centres des cases candidates (x, y).
+                    sizes (numpy.ndarray) = taille (côté) de chaque case candidate.
+    Retourne:       (numpy.ndarray|None) = matrice 2x2 dont les colonnes sont les deux vecteurs ; None sans cases voisines.
+    """
+    size = numpy.median(sizes)
+    vectors = (centers[None, :, :] - centers[:, None, :]).reshape(-1, 2)
+    lengths = numpy.linalg.norm(vectors, axis=1)
+    neighbors = (lengths > NEIGHBOR_RANGE[0]*size) & (lengths < NEIGHBOR_RANGE[1]*size)
+    if not neighbors.any():
+        return None
+    angles = numpy.arctan2(vectors[neighbors, 1], vectors[neighbors, 0])
+    # les vecteurs entre voisines sont orientés à un multiple de 90° près : moyenne circulaire de 4 fois l'angle
+    angle = math.atan2(numpy.sin(4*angles).sum(), numpy.cos(4*angles).sum()) / 4 # entre -45° et 45°
+    pitch = numpy.median(lengths[neighbors])
+    return pitch * numpy.array([[math.cos(angle), -math.sin(angle)], [math.sin(angle), math.cos(angle)]])
+
+def fit_grid(centers:numpy.ndarray, sizes:numpy.ndarray, basis:numpy.ndarray|None=None) -> tuple[numpy.ndarray, numpy.ndarray]|None:
+    """
+    Place la grille 3x3 sur des cases candidates.
+    Paramètres:     centers (numpy.ndarray) = centres des cases candidates (x, y).
+                    sizes (numpy.ndarray) = taille (côté) de chaque case candidate.
+                    basis (numpy.ndarray|None) = vecteurs du réseau (voir lattice), pour une face vue de biais ;
+                                                 None : estimés par lattice (face vue de face).
+    Retourne:       (tuple|None) = centres des 9 cases dans l'ordre de lecture (9 x 2),
+                                   indice de la candidate retenue pour chaque case (-1 si la case n'a pas été détectée) ;
+                                   None si la grille ne peut pas être placée.
+    """
+    if len(centers) < MIN_CELLS:
+        return None
+    basis = lattice(centers, sizes) if basis is None else basis
+    if basis is None:
+        return None
+    inverse = numpy.linalg.inv(basis)
+    best = None
+    tested = numpy.zeros(len(centers), dtype=bool) # candidates déjà placées sur un réseau essayé
+    for k, anchor in enumerate(centers): # chaque candidate comme origine du réseau : le plus cohérent l'emporte
+        if tested[k]: # même réseau qu'une origine précédente
+            continue
+        coords = (centers - anchor) @ inverse.T # coordonnées dans le réseau (colonne, ligne)
+        nodes = numpy.rint(coords)
+        residuals = numpy.abs(coords - nodes).max(axis=1)
+        on_lattice = residuals < TOLERANCE
+        tested |= on_lattice
+        if on_lattice.sum() < MIN_CELLS:
+            continue
+        # fenêtre 3x3 du réseau contenant le plus de cases
+        for col0 in numpy.unique(nodes[on_lattice, 0]):
+            for row0 in numpy.unique(nodes[on_lattice, 1]):
+                grid = nodes - (col0, row0)
+                inside = on_lattice & (grid >= 0).all(axis=1) & (grid <= 2).all(axis=1)
+                cells = numpy.full(9, -1)
+                for i in numpy.flatnonzero(inside)[numpy.argsort(residuals[inside])]: # une candidate par case, la plus proche
+                    cell = int(grid[i, 1]*3 + grid[i, 0])
+                    if cells[cell] < 0:
+                        cells[cell] = i
+                found = cells >= 0
+                score = (found.sum(), -residuals[cells[found]].sum())
+                if best is None or score > best[0]:
+                    best = (score, cells)
+    if best is None:
+        return None
+    cells = best[1]
+    found = cells >= 0
+    rows, cols = numpy.flatnonzero(found) // 3, numpy.flatnonzero(found) % 3
+    if found.sum() < MIN_CELLS or {0, 2} - set(rows) or {0, 2} - set(cols): # grille non délimitée
+        return None
+    homography = cv2.findHomography(GRID[found], centers[cells[found]].astype(numpy.float32))[0]
+    if homography is None:
+        return None
+    return cv2.perspectiveTransform(GRID.reshape(-1, 1, 2), homography).reshape(9, 2), cells
@@ -0,0 +1,135 @@
+"""
+Scan sans caméra ni fenêtre, sur des séances enregistrées : vidéo ou dossier d'images (une image par instant, dans l'ordre
+alphabétique des noms). La détection est celle du scan en direct sans tutoriel (FaceTracker, FaceVotes, étalonnage par les centres) : les faces
+apparaissent dans n'importe quel ordre et n'importe quelle orientation, chacune identifiée par la couleur de son centre.
+Les séances où le cube est présenté par un coin sont lues comme le scan par un coin (voir scan_corner_frames).
+Plusieurs séances peuvent être analysées en parallèle (un processus par séance, voir scan_many) : un ensemble de séances
+enregistrées sert de mesure reproductible de la latence et de la précision du scan.
+"""
+
+from Exceptions import CameraError
+from Scan import Assembly, Calibration, Corner, Tracking
+import Scan
+
+from collections.abc import Iterable, Iterator
+from functools import partial
+import multiprocessing
+import os
+import time
+import cv2
+import numpy
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+def read_frames(source:str) -> Iterator[numpy.ndarray]:
+    """
+    Lit les images d'une séance enregistrée.
+    Paramètres:     source (str) = chemin d'une vidéo, ou d'un dossier d'images (IMAGE_EXTENSIONS).
+    Retourne:       (Iterator[numpy.ndarray]) = images (BGR), dans l'ordre.
+    """
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                image = cv2.imread(os.path.join(source, name), cv2.IMREAD_COLOR)
+                if image is None:
+                    raise CameraError(f"Impossible de lire l'image : {name}")
+                yield image
+        return
+    video = cv2.VideoCapture(source)
+    if not video.isOpened():
+        raise CameraError(f"Impossible d'ouvrir la source : {source}")
+    try:
+        while True:
+            is_ok, image = video.read()
+            if not is_ok: # fin de la vidéo
+                return
+            yield image
+    finally:
+        video.release()
+
+def scan_frames(frames:Iterable[numpy.ndarray], profile:Calibration.ColorProfile|None=None) -> dict:
+    """
+    Scanne les 6 faces d'un cube sur une suite d'images.
+    Paramètres:     frames (Iterable[numpy.ndarray]) = images (BGR), les faces dans n'importe quel ordre.
+                    profile (ColorProfile|None) = couleurs de référence, étalonnées au fil du scan (modifiées) ;
+                                                  None : copie des références par défaut (résultat reproductible).
+    Retourne:       (dict) = "matrix" : représentation en liste de matrices du cube ; liste vide si les 6 faces n'ont pas été validées,
+                             "faces" : matrices 3x3 des faces validées (telles que scannées), selon la couleur de leur centre,
+                             "accepted" : numéro de l'image validant chaque face,
+                             "timings" : durée de l'analyse de chaque image (secondes).
+    """
+    if profile is None:
+        profile = Calibration.ColorProfile(Scan.DEFAULT_PROFILE.names, Scan.DEFAULT_PROFILE.references)
+    faces, accepted, timings = {}, [], []
+    tracker, votes = Tracking.FaceTracker(Scan.detect_face), Tracking.FaceVotes()
+    current = None # couleur du centre de la face votée
+    for n, image in enumerate(frames):
+        if len(faces) == len(Scan.FACE_KEYS):
+            break
+        start = time.perf_counter()
+        cases, cells = tracker(image)
+        observed = Scan.observe(cells, votes, profile) if cells else {}
+        if observed.get(4, current) != current: # autre face présentée : nouveau vote
+            current, votes = observed[4], Tracking.FaceVotes()
+            votes.add(observed)
+        if votes.accepted():
+            face = votes.result()[0]
+            votes = Tracking.FaceVotes()
+            if face[4] not in faces: # une face déjà scannée est ignorée
+                profile.calibrate(face[4], dict(cells).get(4)) # face validée : son centre étalonne sa couleur
+                faces[face[4]] = Scan.to_matrix(face)
+                accepted.append(n)
+        timings.append(time.perf_counter() - start)
+    return {"matrix": Assembly.assemble(faces) if len(faces) == len(Scan.FACE_KEYS) else [], "faces": faces,
+            "accepted": accepted, "timings": timings}
+
+def scan_corner_frames(frames:Iterable[numpy.ndarray], profile:Calibration.ColorProfile|None=None) -> dict:
+    """
+    Scanne les 6 faces d'un cube présenté par un coin (trois faces par image, voir Corner), sur une suite d'images.
+    Paramètres:     frames (Iterable[numpy.ndarray]) = images (BGR), le cube présenté par deux coins opposés.
+                    profile (ColorProfile|None) = couleurs de référence, étalonnées au fil du scan (modifiées) ;
+                                                  None : copie des références par défaut (résultat reproductible).
+    Retourne:       (dict) = même contenu que scan_frames.
+    """
+    if profile is None:
+        profile = Calibration.ColorProfile(Scan.DEFAULT_PROFILE.names, Scan.DEFAULT_PROFILE.references)
+    faces, accepted, timings = {}, [], []
+    votes = Corner.CornerVotes(profile)
+    for n, image in enumerate(frames):
+        if len(faces) == len(Scan.FACE_KEYS):
+            break
+        start = time.perf_counter()
+        cases, detected = Corner.detect_corner(image)
+        votes.add(detected)
+        for center, face in votes.accepted(faces).items():
+            faces[center] = face
+            accepted.append(n)
+        timings.append(time.perf_counter() - start)
+    return {"matrix": Assembly.assemble(faces) if len(faces) == len(Scan.FACE_KEYS) else [], "faces": faces,
+            "accepted": accepted, "timings": timings}
+
+def scan_recording(source:str, corner:bool=False) -> dict:
+    """
+    Scanne les 6 faces d'un cube sur une séance enregistrée.
+    Paramètres:     source (str) = chemin d'une vidéo, ou d'un dossier d'images.
+                    corner (bool) = cube présenté par un coin (scan_corner_frames) ; False : face par face (scan_frames).
+    Retourne:       (dict) = résultat de scan_frames ou scan_corner_frames.
+    """
+    return scan_corner_frames(read_frames(source)) if corner else scan_frames(read_frames(source))
+
+def scan_many(sources:list[str], workers:int|None=None, corner:bool=False) -> list[dict]:
+    """
+    Scanne plusieurs séances enregistrées en parallèle, une par processus à la fois.
+    Paramètres:     sources (list[str]) = chemins des vidéos ou dossiers d'images.
+                    workers (int|None) = nombre de processus ; nombre de processeurs si None.
+                    corner (bool) = séances où le cube est présenté par un coin (voir scan_recording).
+    Retourne:       (list[dict]) = résultat de scan_recording pour chaque séance.
+    """
+    if workers == 1:
+        return [scan_recording(source, corner) for source in sources]
+    pool = multiprocessing.Pool(workers)
+    try:
+        return pool.map(partial(scan_recording, corner=corner), sources, chunksize=1)
+    finally: # fermeture sans terminate() : SDL (pygame), s'il est chargé, détourne SIGTERM dans les processus
+        pool.close()
+        pool.join()
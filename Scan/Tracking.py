@@ -0,0 +1,125 @@
+"""
+Suivi d'une face du cube d'une image à l'autre, et vote des couleurs de ses cases.
+FaceTracker ne cherche plus la face qu'autour de sa dernière position (région d'intérêt) une fois la grille 3x3 placée,
+et la suit dans ses déplacements.
+FaceVotes accumule les couleurs de chaque position sur les dernières images ; la face est validée dès que
+chaque position a une couleur assez sûre.
+"""
+
+import numpy
+from collections import Counter, deque
+from collections.abc import Callable
+
+ROI_MARGIN = 1.5 # marge de la région d'intérêt autour de la grille, en écarts entre cases
+LOST_FRAMES = 5 # images consécutives sans grille avant de chercher à nouveau dans toute l'image
+VOTE_WINDOW = 10 # nombre d'images prises en compte par le vote
+MIN_VOTES = 3 # observations minimales d'une position pour la valider
+ACCEPT_CONFIDENCE = 0.8 # part minimale des observations d'une position donnant la même couleur
+
+class FaceTracker():
+    """
+    Classe modélisant la détection d'une face, restreinte à la région de la grille une fois celle-ci localisée.
+    Utilisée comme fonction d'analyse d'un DetectionWorker.
+    """
+    def __init__(self, detect:Callable[[numpy.ndarray, int], tuple[list, tuple|None]]) -> None:
+        """
+        Instancie un objet FaceTracker.
+        Paramètres:     detect (Callable) = détection d'une face sur une partie d'image, selon la largeur de l'image entière :
+                                            contours, grille (centres des 9 cases, couleur de chacune, détection) ou None
+                                            (voir detect_face).
+        Retourne:       rien.
+        """
+        self.detect = detect
+        self.grid = None # centres des 9 positions (9 x 2, ordre de lecture), None si la grille n'est pas localisée
+        self.pitch = 0.0 # écart moyen entre deux cases voisines (pixels)
+        self.lost = 0 # images consécutives sans grille
+
+    def roi(self, width:int, height:int) -> tuple[int, int, int, int]:
+        """
+        Région d'intérêt : rectangle de la grille élargi de ROI_MARGIN écarts entre cases.
+        Paramètres:     width (int) = largeur de l'image.
+                        height (int) = hauteur de l'image.
+        Retourne:       (tuple) = x0, y0, x1, y1 ; toute l'image si la grille n'est pas localisée.
+        """
+        if self.grid is None:
+            return 0, 0, width, height
+        margin = ROI_MARGIN * self.pitch
+        x0, y0 = numpy.maximum(self.grid.min(axis=0) - margin, 0).astype(int)
+        x1, y1 = numpy.minimum(self.grid.max(axis=0) + margin, (width, height)).astype(int)
+        return x0, y0, x1, y1
+
+    def __call__(self, image:numpy.ndarray) -> tuple[list, list]:
+        """
+        Détecte la face sur une image, dans la région d'intérêt si la grille est localisée, et suit la grille.
+        Paramètres:     image (numpy.ndarray) = image de la caméra (BGR, non modifiée).
+        Retourne:       (tuple) = contours des cases retenues (coordonnées de l'image entière),
+                                  et (position, [R, G, B]) de chaque case détectée, mesurée au centre donné par la grille ;
+                                  liste vide si la face n'est pas trouvée. Les cases seulement déduites de la grille ne sont
+                                  pas renvoyées : une case non détectée est le plus souvent masquée (doigt, reflet).
+        """
+        height, width = image.shape[:2]
+        x0, y0, x1, y1 = self.roi(width, height)
+        cases, grid = self.detect(image[y0:y1, x0:x1], width)
+        offset = numpy.array((x0, y0), dtype=numpy.int32)
+        cases = [contour + offset for contour in cases]
+        if grid is None:
+            if self.grid is not None:
+                self.lost += 1
+                if self.lost >= LOST_FRAMES: # face perdue : recherche dans toute l'image
+                    self.grid = None
+            return cases, []
+        centers, colors, detected = grid
+        self.grid, self.lost = centers + offset, 0
+        rows = self.grid.reshape(3, 3, 2)
+        self.pitch = float((numpy.linalg.norm(numpy.diff(rows, axis=1), axis=2).mean()
+                            + numpy.linalg.norm(numpy.diff(rows, axis=0), axis=2).mean()) / 2)
+        return cases, [(cell, colors[cell]) for cell in range(9) if detected[cell]]
+
+class FaceVotes():
+    """
+    Classe modélisant le vote des couleurs des 9 positions d'une face sur les dernières images.
+    """
+    def __init__(self, window:int=VOTE_WINDOW) -> None:
+        """
+        Instancie un objet FaceVotes.
+        Paramètres:     window (int) = nombre d'images prises en compte.
+        Retourne:       rien.
+        """
+        self.frames = deque(maxlen=window) # pour chaque image : {position: couleur}
+
+    def add(self, observed:dict[int, str]) -> None:
+        """
+        Ajoute les couleurs observées sur une image.
+        Paramètres:     observed (dict[int, str]) = caractère de couleur de chaque position observée (0 à 8).
+        Retourne:       rien.
+        """
+        self.frames.append(observed)
+
+    def result(self) -> tuple[list, float]:
+        """
+        Couleur majoritaire de chaque position et confiance de la face.
+        Paramètres:     aucun.
+        Retourne:       (tuple) = caractère de couleur de chaque position (0 si jamais observée),
+                                  confiance : part des observations en accord, pour la position la moins sûre
+                                  (0 si une position a moins de MIN_VOTES observations).
+        """
+        face, confidence = [], 1.0
+        for cell in range(9):
+            votes = Counter(frame[cell] for frame in self.frames if cell in frame)
+            total = sum(votes.values())
+            if not total:
+                face.append(0)
+                confidence = 0.0
+                continue
+            color, count = votes.most_common(1)[0]
+            face.append(color)
+            confidence = min(confidence, count / total if total >= MIN_VOTES else 0.0)
+        return face, confidence
+
+    def accepted(self) -> bool:
+        """
+        Indique si la face peut être validée.
+        Paramètres:     aucun.
+        Retourne:       (bool) = True si chaque position a une couleur sûre (confiance d'au moins ACCEPT_CONFIDENCE).
+        """
+        return self.result()[1] >= ACCEPT_CONFIDENCE
@@ -1,21 +1,45 @@
 from Exceptions import CameraError
+from Scan.Capture import CameraStream, DetectionWorker
+from Scan import Assembly, Calibration, Corner, Grid, Tracking
 
 import cv2
 from datetime import datetime
 import numpy
-from scipy.spatial import KDTree
 from os import path
 
 G_path = path.realpath(__file__).replace("__init__.py","")
 
 # Constantes
 SECONDS_WAITING = 5
-MARGE_PIXEL = 15
+TUTORIAL = True # scan guidé (faces dans l'ordre de FACE_KEYS, image et vidéos d'attente) ; False : faces dans n'importe quel ordre, sans attente
+CORNER_VIEW = False # scan par un coin : trois faces par image, deux positions du cube (voir Scan.Corner)
+SCAN_TIMING = False # affiche en fin de scan le nombre d'images analysées et la durée de lecture de chaque face (voir metrics_report)
+MARGE_PIXEL = 15 # pour une image de REFERENCE_WIDTH pixels de large
+REFERENCE_WIDTH = 640 # largeur des images ayant servi à régler la détection (seuils de conditions_ok, MARGE_PIXEL)
+DETECTION_WIDTH = 640 # largeur maximale de l'image de détection : les images plus larges sont réduites de moitié (pyramide) ; None : pas de réduction
+COLOR_STATISTIC = "mean" # couleur d'une case : "mean", "median" ou "trimmed" (voir calcul_couleurs)
+TRIM_RATIO = 0.2 # part des valeurs ignorées de chaque côté par la moyenne tronquée
 WINDOW_NAME = ""
 PATH_LOGO = ""
+# Couleurs de référence des cases (RVB) et caractère associé
+REFERENCE_COLORS = numpy.array([(255, 0, 0), (0, 0, 255), (0, 255, 0), (255, 255, 0), (255, 165, 0), (255, 255, 255)], dtype=numpy.float32)
+COLOR_NAMES = ["r", "b", "g", "y", "o", "w"]
+FACE_KEYS = ["blanc", "vert", "rouge", "bleu", "orange", "jaune"] # ordre des faces du scan
+KEY_COLORS = {"blanc": "w", "vert": "g", "rouge": "r", "bleu": "b", "orange": "o", "jaune": "y"} # couleur des centres
+# Références de départ (non étalonnées) de la classification en Lab : couleurs typiques des cases vues par une webcam (RVB),
+# moins saturées que REFERENCE_COLORS
+CAMERA_COLORS = [(170, 30, 35), (20, 70, 160), (20, 150, 70), (210, 210, 50), (235, 100, 30), (200, 200, 200)]
+DEFAULT_PROFILE = Calibration.ColorProfile.from_rgb(COLOR_NAMES, CAMERA_COLORS)
+# Configuration de la caméra (None : valeur du pilote)
+CAMERA_SOURCE = 0 # indice de la caméra, ou chemin/URL d'une vidéo
+CAMERA_WIDTH = None # largeur d'image (pixels)
+CAMERA_HEIGHT = None # hauteur d'image (pixels)
+CAMERA_FPS = None # images par seconde
+CAMERA_CODEC = None # format de la caméra (FOURCC), ex. "MJPG"
 
 # Variant d'exécution
 running = True
+scan_metrics = [] # pour chaque face du dernier scan : (centre, nombre d'images analysées avant validation, durée en secondes)
 
 def read_camera(video:cv2.VideoCapture) -> numpy.ndarray:
     """
@@ -28,17 +52,20 @@ def read_camera(video:cv2.VideoCapture) -> numpy.ndarray:
         return image
     raise CameraError("Impossible de lire la source")
 
-def conditions_ok(contour:numpy.ndarray) -> bool:
+def conditions_ok(contour:numpy.ndarray, scale:float=1.0) -> bool:
     """
     Vérifie, pour un contour, s'il peut correspondre à une case de Rubik's Cube.
+    Les seuils, issus de tests sur des images de REFERENCE_WIDTH pixels de large, sont des aires : ils suivent le carré de l'échelle.
     Paramètres:     contour (numpy.ndarray) = contour openCV
+                    scale (float) = largeur de l'image analysée divisée par REFERENCE_WIDTH.
     Retourne:       (bool) = True si le contour correspond, False sinon.
     """
     area = cv2.contourArea(contour)
-    if not 1000 < area < 3000: # taille du cube
+    surface = scale * scale
+    if not 1000*surface < area < 3000*surface: # taille du cube
         return False
     perimeter = cv2.arcLength(contour, True)
-    return cv2.norm(((perimeter / 4) * (perimeter / 4)) - area) < 150 # condition issue de tests
+    return cv2.norm(((perimeter / 4) * (perimeter / 4)) - area) < 150*surface # condition issue de tests
 
 def to_int_list(obj:list|tuple|dict|set) -> list[int]:
     """
@@ -48,26 +75,39 @@ def to_int_list(obj:list|tuple|dict|set) -> list[int]:
     """
     return [int(x) for x in list(obj)]
 
-def calcul_couleur(image:numpy.ndarray, x:float, y:float, w:float, h:float) -> list:
+def calcul_couleurs(image:numpy.ndarray, boxes:numpy.ndarray, statistic:str=COLOR_STATISTIC, margin:int=MARGE_PIXEL) -> numpy.ndarray:
     """
-    Calcule la couleur moyenne d'une case.
-    Paramètres:     obj (iterable) = itérable à convertir.
-                    x (float) = l'abscisse de la case
-                    y (float) = l'ordonnée de la case
-                    w (float) = la longueur de la case
-                    h (float) = la hauteur de la case
-    Retourne:       (list) = liste contenant :
-                        - (int) = valeur moyenne HUE
-                        - (int) = valeur moyenne SATURATION
-                        - (int) = valeur moyenne VALUE
-                        - (float) = une valeur indicatrice de l'emplacement de la case
-    """
-    val = 50*y + 10*x
-    hsv = cv2.cvtColor(image, cv2.COLOR_BGR2RGB) # image en RGB
-    # moyenne des couleurs de chaque pixel de la case
-    # on réduit la case pour que la couleur noir des contours ne soit pas prise en compte
-    echantillon = to_int_list(cv2.mean(hsv[y+MARGE_PIXEL:y+h-MARGE_PIXEL,x+MARGE_PIXEL:x+w-MARGE_PIXEL]))
-    return echantillon + [val]
+    Calcule la couleur de toutes les cases d'une image en une passe.
+    Chaque case est réduite d'une marge de chaque côté pour que la couleur noire des contours ne soit pas prise en compte.
+    Paramètres:     image (numpy.ndarray) = image en RGB (convertie une seule fois par image, avant tout affichage).
+                    boxes (numpy.ndarray) = rectangles des cases, une ligne (x, y, w, h) par case.
+                    statistic (str) = "mean" : moyenne (image intégrale, toutes les cases d'un coup) ;
+                                      "median" ou "trimmed" (moyenne sans les TRIM_RATIO valeurs extrêmes) : résistent aux reflets.
+                    margin (int) = marge retirée de chaque côté des cases (pixels).
+    Retourne:       (numpy.ndarray) = couleur de chaque case, une ligne (R, G, B) par case (entiers) ; (0, 0, 0) si la case réduite est vide.
+    """
+    boxes = numpy.asarray(boxes, dtype=numpy.intp).reshape(-1, 4)
+    height, width = image.shape[:2]
+    x0 = numpy.clip(boxes[:, 0] + margin, 0, width)
+    y0 = numpy.clip(boxes[:, 1] + margin, 0, height)
+    x1 = numpy.maximum(numpy.clip(boxes[:, 0] + boxes[:, 2] - margin, 0, width), x0)
+    y1 = numpy.maximum(numpy.clip(boxes[:, 1] + boxes[:, 3] - margin, 0, height), y0)
+    counts = (x1 - x0) * (y1 - y0)
+    colors = numpy.zeros((len(boxes), 3))
+    if statistic == "mean":
+        integral = cv2.integral(image) # sommes cumulées : somme d'un rectangle en 4 lectures
+        sums = integral[y1, x1] - integral[y0, x1] - integral[y1, x0] + integral[y0, x0]
+        filled = counts > 0
+        colors[filled] = sums[filled] / counts[filled, None]
+    else:
+        for i in numpy.flatnonzero(counts):
+            pixels = numpy.sort(image[y0[i]:y1[i], x0[i]:x1[i]].reshape(-1, 3), axis=0) # tri par canal
+            if statistic == "median":
+                colors[i] = numpy.median(pixels, axis=0)
+            else:
+                trim = int(len(pixels) * TRIM_RATIO)
+                colors[i] = numpy.mean(pixels[trim:len(pixels)-trim], axis=0)
+    return colors.astype(int)
 
 def to_matrix(l:list) -> list[list]:
     """
@@ -84,6 +124,16 @@ def to_matrix(l:list) -> list[list]:
             x += 1
     return new
 
+def classify_colors(samples:list|numpy.ndarray) -> list[str]:
+    """
+    Associe une couleur à chaque case, en un seul calcul : couleur de référence la plus proche (distance euclidienne RVB).
+    Paramètres:     samples (list|numpy.ndarray) = couleurs moyennes des cases, une ligne (R, G, B) par case (entre 0 et 255).
+    Retourne:       (list[str]) = caractère représentant la couleur de chaque case : r, b, g, y, o ou w.
+    """
+    samples = numpy.asarray(samples, dtype=numpy.float32).reshape(-1, 1, 3)
+    distances = numpy.sum((samples - REFERENCE_COLORS)**2, axis=2) # case x couleur de référence
+    return [COLOR_NAMES[i] for i in numpy.argmin(distances, axis=1)]
+
 def association_couleurs(r:int, g:int, b:int) -> str:
     """
     Associe une couleur à une case.
@@ -92,72 +142,170 @@ def association_couleurs(r:int, g:int, b:int) -> str:
                     b (int) = Blue (entre 0 et 255)
     Retourne:       (str) = caractère représentant la couleur de la case : r, b, g, y, o ou w.
     """
-    colors = [(255, 0, 0), (0, 0, 255), (0, 255, 0), (255, 255, 0), (255, 165, 0), (255, 255, 255)]
-    trad = ["r", "b", "g", "y", "o", "w"]
-    kdt_db = KDTree(colors) # arbre de classification (Deep Learning)
-    distance, index = kdt_db.query((r, g, b)) # prédiction du modèle
-    return trad[index]
+    return classify_colors([(r, g, b)])[0]
+
+def pyramid_levels(width:int) -> int:
+    """
+    Nombre de réductions de moitié amenant une image à DETECTION_WIDTH pixels de large au plus.
+    Paramètres:     width (int) = largeur de l'image (pixels).
+    Retourne:       (int) = nombre de réductions.
+    """
+    levels = 0
+    while DETECTION_WIDTH is not None and width > DETECTION_WIDTH:
+        width = (width + 1) // 2
+        levels += 1
+    return levels
+
+def find_contours(image:numpy.ndarray, frame_width:int|None=None) -> tuple[list, int, float]:
+    """
+    Cherche les contours d'une image, sur l'image réduite (pyramid_levels).
+    Paramètres:     image (numpy.ndarray) = image de la caméra (BGR), ou partie de cette image.
+                    frame_width (int|None) = largeur de l'image entière de la caméra (échelle des seuils) ; None : largeur de image.
+    Retourne:       (tuple) = contours (coordonnées de l'image réduite), facteur de réduction,
+                              échelle des seuils (largeur de l'image réduite divisée par REFERENCE_WIDTH).
+    """
+    frame_width = image.shape[1] if frame_width is None else frame_width
+    levels = pyramid_levels(frame_width)
+    factor = 2**levels
+
+    # Gommage des "trous" de mauvaise couleur + optimisation pour analyse
+    gray = cv2.cvtColor(image,cv2.COLOR_BGR2GRAY)
+    for _ in range(levels): # réduction en niveaux de gris : 3 fois moins de données
+        gray = cv2.pyrDown(gray)
+    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE,(2,2))
+    gray = cv2.morphologyEx(gray, cv2.MORPH_OPEN, kernel)
+    gray = cv2.morphologyEx(gray, cv2.MORPH_CLOSE, kernel)
+    gray = cv2.adaptiveThreshold(gray,20,cv2.ADAPTIVE_THRESH_GAUSSIAN_C,cv2.THRESH_BINARY_INV,5,0)
+
+    #Détection des contours (sans hiérarchie, segments droits compressés : mêmes aires et périmètres)
+    contours = cv2.findContours(gray,cv2.RETR_LIST,cv2.CHAIN_APPROX_SIMPLE)[0]
+    return contours, factor, frame_width / factor / REFERENCE_WIDTH
+
+def detect_face(image:numpy.ndarray, frame_width:int|None=None) -> tuple[list, tuple|None]:
+    """
+    Détecte une face du cube sur une image et calcule la couleur de ses 9 cases (n'affiche rien, ne modifie pas l'image).
+    La détection se fait sur l'image réduite (pyramid_levels), la couleur est mesurée sur l'image en pleine résolution.
+    Les cases candidates sont placées sur une grille 3x3 (Grid.fit_grid) : les cases non détectées sont déduites de la grille.
+    Paramètres:     image (numpy.ndarray) = image de la caméra (BGR), ou partie de cette image.
+                    frame_width (int|None) = largeur de l'image entière de la caméra (échelle des seuils) ; None : largeur de image.
+    Retourne:       (tuple) = contours des cases retenues par la grille (pleine résolution),
+                              grille : centres des 9 cases dans l'ordre de lecture (9 x 2), couleur de chacune (9 x [R, G, B]),
+                              case détectée ou déduite de la grille (9 booléens) ; None si la grille n'a pas été placée.
+    """
+    frame_width = image.shape[1] if frame_width is None else frame_width
+    contours, factor, scale = find_contours(image, frame_width)
+
+    # Vérification des contours et calcul des couleurs
+    cases = [contour*factor for contour in contours if conditions_ok(contour, scale)] # coordonnées pleine résolution
+    if not cases:
+        return [], None
+    moments = [cv2.moments(contour) for contour in cases]
+    centers = numpy.array([(m["m10"]/m["m00"], m["m01"]/m["m00"]) if m["m00"] else contour.reshape(-1, 2).mean(axis=0)
+                           for m, contour in zip(moments, cases)], dtype=numpy.float32)
+    sizes = numpy.sqrt([abs(m["m00"]) for m in moments]) # côté des cases
+    grid = Grid.fit_grid(centers, sizes)
+    if grid is None:
+        return [], None
+    positions, cells = grid
+    found = cells[cells >= 0]
+    size = numpy.median(sizes[found])
+    boxes = numpy.rint(numpy.hstack([positions - size/2, numpy.full((9, 2), size)])).astype(int) # rectangles des 9 cases
+    height, width = image.shape[:2]
+    x0, y0 = numpy.clip(boxes[:, :2].min(axis=0), 0, (width, height))
+    x1, y1 = numpy.clip((boxes[:, :2] + boxes[:, 2:]).max(axis=0), 0, (width, height))
+    rgb = cv2.cvtColor(image[y0:y1, x0:x1], cv2.COLOR_BGR2RGB) # région des cases en RGB, une fois par image
+    colors = calcul_couleurs(rgb, boxes - (x0, y0, 0, 0), margin=round(MARGE_PIXEL * frame_width / REFERENCE_WIDTH))
+    return [cases[i] for i in found], (positions, colors.tolist(), (cells >= 0).tolist())
+
+def observe(cells:list, votes:Tracking.FaceVotes, profile:Calibration.ColorProfile|None=None) -> dict[int, str]:
+    """
+    Classe les couleurs des positions observées sur une image et les ajoute au vote (le profil n'est pas modifié :
+    il n'est étalonné qu'une fois la face validée, voir ColorProfile.calibrate).
+    Paramètres:     cells (list) = (position, [R, G, B]) de chaque case détectée de la grille (voir FaceTracker).
+                    votes (FaceVotes) = vote des couleurs de la face.
+                    profile (ColorProfile|None) = couleurs de référence (Lab) ; None : classification RVB fixe.
+    Retourne:       (dict[int, str]) = caractère de couleur de chaque position observée.
+    """
+    positions = [cell for cell, color in cells]
+    samples = [color for cell, color in cells] # R, G, B
+    if not samples:
+        return {}
+    colors = classify_colors(samples) if profile is None else profile.classify(samples)
+    observed = dict(zip(positions, colors))
+    votes.add(observed)
+    return observed
 
-def analize_face(video:cv2.VideoCapture, text1:str=" ", text2:str=" ") -> list[list]:
+def analize_face(video:CameraStream, text1:str=" ", text2:str=" ", profile:Calibration.ColorProfile|None=None, center:str|None=None,
+                 scanned:set|None=None) -> list[list]:
     """
     Détecte, analyse et modélise une face du cube.
-    Paramètres:     video (cv2.VideoCapture) = objet représentant l'entrée video.
+    L'analyse tourne en arrière-plan (DetectionWorker) ; l'affichage suit la caméra avec les cases de la dernière analyse.
+    Une fois la grille localisée, les cases ne sont cherchées qu'autour d'elle (FaceTracker) ; la couleur de chaque position
+    est votée sur les dernières images (FaceVotes) et la face est validée dès que toutes les positions sont sûres.
+    Sans centre attendu, la face est identifiée par la couleur de son centre : le vote repart de zéro quand le centre change,
+    et une face déjà scannée est ignorée.
+    Le nombre d'images analysées avant validation et la durée sont ajoutés à scan_metrics.
+    Paramètres:     video (CameraStream) = caméra lue en continu.
                     text1 (str) = premier texte à afficher.
                     text2 (str) = second texte à afficher.
+                    profile (ColorProfile|None) = couleurs de référence (Lab), étalonnées par le centre ; None : classification RVB fixe.
+                    center (str|None) = caractère de la couleur du centre attendu (échantillon d'étalonnage) ; None : n'importe quelle face.
+                    scanned (set|None) = couleurs des centres des faces déjà scannées (ignorées si center est None).
     Retourne:       (list) = matrice 3x3 représentant une face.
     """
     global running # variant d'exécution
-    while True: # s'arrête lorsque face complète
-        image = read_camera(video) # lecture
+    shown, checked = 0, 0 # numéros de la dernière image affichée, et de la dernière image analysée examinée
+    frames, start = 0, datetime.now() # images analysées examinées, début de la lecture
+    votes = Tracking.FaceVotes() # couleurs de chaque position sur les dernières images
+    current = None # couleur du centre de la face votée (sans centre attendu)
+    with DetectionWorker(video, Tracking.FaceTracker(detect_face)) as worker:
+        while True: # s'arrête lorsque face complète
+            shown, image = video.read(shown) # lecture
+            image = image.copy() # l'image est partagée avec l'analyse
+            result = worker.latest()
+            cases, cells = [], []
+            if result is not None:
+                index, (cases, cells) = result
 
-        # Gommage des "trous" de mauvaise couleur + optimisation pour analyse
-        gray = cv2.cvtColor(image,cv2.COLOR_BGR2GRAY)
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE,(2,2))
-        gray = cv2.morphologyEx(gray, cv2.MORPH_OPEN, kernel)
-        gray = cv2.morphologyEx(gray, cv2.MORPH_CLOSE, kernel)
-        gray = cv2.adaptiveThreshold(gray,20,cv2.ADAPTIVE_THRESH_GAUSSIAN_C,cv2.THRESH_BINARY_INV,5,0)
+            # Affichage du texte et des cases identifiées
+            image = cv2.putText(image, text1, (50, 50), cv2.FONT_HERSHEY_DUPLEX, 1, (255, 255, 0), 2) # affichage texte
+            image = cv2.putText(image, text2, (50, 100), cv2.FONT_HERSHEY_DUPLEX, 1, (255, 255, 0), 2) # affichage texte
+            image = cv2.drawContours(image, cases, -1, (255, 255, 0), 2) # on trace les cases identifiées
+            cv2.imshow(WINDOW_NAME, image) # on affiche la fenêtre
+            key_pressed = cv2.waitKey(1) & 0xFF # non-bloquant
+            if key_pressed == 27 or key_pressed == ord('q'):
+                # Fermeture du scan
+                running = False
+                cv2.destroyAllWindows()
+                break
+            if result is None or index == checked: # pas de nouvelle analyse
+                continue
+            checked = index
+            frames += 1
+            if not cells: # grille non localisée
+                continue
 
-        #Détection des contours
-        contours = cv2.findContours(gray,cv2.RETR_CCOMP,cv2.CHAIN_APPROX_NONE)[0]
+            observed = observe(cells, votes, profile) # couleurs des positions observées, ajoutées au vote
+            if center is None and observed.get(4, current) != current: # autre face présentée : nouveau vote
+                current, votes = observed[4], Tracking.FaceVotes()
+                votes.add(observed)
 
-        # Affichage du texte
-        image = cv2.putText(image, text1, (50, 50), cv2.FONT_HERSHEY_DUPLEX, 1, (255, 255, 0), 2) # affichage texte
-        image = cv2.putText(image, text2, (50, 100), cv2.FONT_HERSHEY_DUPLEX, 1, (255, 255, 0), 2) # affichage texte
-        
-        # Vérification des contours et calcul des couleurs
-        _colors = []
-        for contour in contours:
-            if conditions_ok(contour):
-                x, y, w, h = cv2.boundingRect(contour) # coordonnées de la case
-                image = cv2.drawContours(image, [contour], 0, (255, 255, 0), 2) # on trace la case identifiée
-                _colors.append(calcul_couleur(image, x, y, w, h)) # association de la couleur à la case et enregistrement
-        cv2.imshow(WINDOW_NAME, image) # on affiche la fenêtre
-        key_pressed = cv2.waitKey(1) & 0xFF # non-bloquant
-        if key_pressed == 27 or key_pressed == ord('q'):
-            # Fermeture du scan
-            running = False
-            cv2.destroyAllWindows()
-            break
-        if len(_colors) != 9: # face incomplète
-            continue
-
-        # couleurs triées par indice par la valeur de (50*y + 10*x) --> ordre des cases
-        colors = sorted(_colors, key=lambda x: x[4], reverse=False) 
-        
-        # Création de la matrice de la face
-        face = [0, 0, 0, 0, 0, 0, 0, 0, 0] # initialisation de la face (en liste simplifiée)
-        for i in range(len(colors)):
-            r, g, b = colors[i][0], colors[i][1], colors[i][2] # R, G, B
-            face[i] = association_couleurs(r, g, b)
-        print(to_matrix(face))
-        if 0 in face: # couleur non identifiée = face incomplète
-            continue
-        return to_matrix(face) # face sous forme de matrice
+            # Création de la matrice de la face (en liste simplifiée), dès que chaque position est sûre
+            if not votes.accepted():
+                continue
+            face = votes.result()[0]
+            if center is None and face[4] in (scanned or set()): # face déjà scannée
+                votes = Tracking.FaceVotes()
+                continue
+            if profile is not None: # face validée : son centre étalonne la couleur attendue
+                profile.calibrate(face[4] if center is None else center, dict(cells).get(4))
+            scan_metrics.append((face[4], frames, (datetime.now() - start).total_seconds()))
+            return to_matrix(face) # face sous forme de matrice
 
-def wait_with_video(video:cv2.VideoCapture, vid:str, tstamp:int=8, text1:str=" ", text2:str=" ") -> None:
+def wait_with_video(video:CameraStream, vid:str, tstamp:int=8, text1:str=" ", text2:str=" ") -> None:
     """
     Fait patienter le scan en affichant un texte, en gardant la caméra visible.
-    Paramètres:     video (cv2.VideoCapture) = objet représentant l'entrée de la caméra
+    Paramètres:     video (CameraStream) = caméra lue en continu.
                     vid (str) = chemin d'accès à la vidéo.
                     tstamp (int) = nombre de secondes d'attente.
                     text1 (str) = premier texte à afficher.
@@ -167,8 +315,7 @@ def wait_with_video(video:cv2.VideoCapture, vid:str, tstamp:int=8, text1:str=" "
     global running
     start = datetime.now()
     video_asked = cv2.VideoCapture(vid)
-    width = int(video.get(cv2.CAP_PROP_FRAME_WIDTH))
-    height = int(video.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    width, height = video.width, video.height
     while True:
         image = read_camera(video_asked)
         image = cv2.resize(image, (width, height), interpolation=cv2.INTER_AREA)
@@ -184,10 +331,10 @@ def wait_with_video(video:cv2.VideoCapture, vid:str, tstamp:int=8, text1:str=" "
             continue
         break
 
-def wait_with_image(video:cv2.VideoCapture, img:str, tstamp:int=8, text1:str=" ", text2:str=" ") -> None:
+def wait_with_image(video:CameraStream, img:str, tstamp:int=8, text1:str=" ", text2:str=" ") -> None:
     """
     Fait patienter le scan en affichant un texte et une image.
-    Paramètres:     video (cv2.VideoCapture) = objet représentant l'entrée de la caméra
+    Paramètres:     video (CameraStream) = caméra lue en continu.
                     img (str) = chemin d'accès à l'image.
                     tstamp (int) = nombre de secondes d'attente.
                     text1 (str) = premier texte à afficher.
@@ -196,8 +343,7 @@ def wait_with_image(video:cv2.VideoCapture, img:str, tstamp:int=8, text1:str=" "
     """
     global running
     start = datetime.now()
-    width = int(video.get(cv2.CAP_PROP_FRAME_WIDTH))
-    height = int(video.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    width, height = video.width, video.height
     print(width, height)
     while True:
         image = cv2.imread(img, cv2.IMREAD_UNCHANGED)
@@ -222,18 +368,117 @@ def rot90_anticlockwise(m:list[list]) -> list[list]:
     """
     return [[m[j][i] for j in range(len(m))] for i in range(len(m[0])-1,-1,-1)]
 
-def main() -> None:
+def main(tutorial:bool=TUTORIAL, corner:bool=CORNER_VIEW) -> list:
     """
     Exécution du processus de scan.
-    Paramètres:     aucun.
-    Retourne:       rien.
+    Paramètres:     tutorial (bool) = scan guidé (voir scan_faces) ; False : faces dans n'importe quel ordre (voir scan_any_order).
+                    corner (bool) = scan par un coin, trois faces à la fois (voir scan_corner) ; prioritaire sur tutorial.
+    Retourne:       (list) = représentation en liste de matrices du cube ; liste vide si le scan est interrompu.
     """
     global running
     running = True
-    video = cv2.VideoCapture(0)
-    video.read()
-    keys = ["blanc", "vert", "rouge", "bleu", "orange", "jaune"] # ordre des faces
+    with CameraStream(CAMERA_SOURCE, CAMERA_WIDTH, CAMERA_HEIGHT, CAMERA_FPS, CAMERA_CODEC) as video:
+        if corner:
+            return scan_corner(video)
+        return scan_faces(video) if tutorial else scan_any_order(video)
+
+def scan_corner(video:CameraStream) -> list:
+    """
+    Scanne le cube présenté par un coin : trois faces par image (Corner.detect_corner), deux positions du cube.
+    Chaque face est identifiée par son centre et validée par vote (Corner.CornerVotes) ; son orientation est déduite
+    des autres faces (Assembly.assemble).
+    Le nombre d'images analysées avant la validation de chaque face et la durée depuis le début du scan sont ajoutés à scan_metrics.
+    Paramètres:     video (CameraStream) = caméra lue en continu.
+    Retourne:       (list) = représentation en liste de matrices du cube ; liste vide si le scan est interrompu.
+    """
+    global running # variant d'exécution
+    faces = {} # matrice 3x3 de chaque face validée, selon la couleur de son centre
+    camera = f"{CAMERA_SOURCE}:{video.width}x{video.height}" # identifiant du profil de couleurs
+    profile = Calibration.load_profile(camera, DEFAULT_PROFILE)
+    votes = Corner.CornerVotes(profile)
+    shown, checked = 0, 0 # numéros de la dernière image affichée, et de la dernière image analysée examinée
+    frames, start = 0, datetime.now() # images analysées examinées, début de la lecture
+    scan_metrics.clear()
+    with DetectionWorker(video, Corner.detect_corner) as worker:
+        while len(faces) < len(FACE_KEYS):
+            shown, image = video.read(shown) # lecture
+            image = image.copy() # l'image est partagée avec l'analyse
+            result = worker.latest()
+            cases, detected = [], []
+            if result is not None:
+                index, (cases, detected) = result
+
+            # Affichage du texte et des cases identifiées
+            text1 = "Montrez un coin du cube (3 faces)" if len(faces) < 3 else "Montrez le coin oppose"
+            image = cv2.putText(image, text1, (50, 50), cv2.FONT_HERSHEY_DUPLEX, 1, (255, 255, 0), 2) # affichage texte
+            image = cv2.putText(image, f"{len(faces)}/{len(FACE_KEYS)} faces lues", (50, 100), cv2.FONT_HERSHEY_DUPLEX, 1, (255, 255, 0), 2)
+            image = cv2.drawContours(image, cases, -1, (255, 255, 0), 2) # on trace les cases identifiées
+            cv2.imshow(WINDOW_NAME, image) # on affiche la fenêtre
+            key_pressed = cv2.waitKey(1) & 0xFF # non-bloquant
+            if key_pressed == 27 or key_pressed == ord('q'):
+                # Fermeture du scan
+                running = False
+                cv2.destroyAllWindows()
+                return []
+            if result is None or index == checked: # pas de nouvelle analyse
+                continue
+            checked = index
+            frames += 1
+            votes.add(detected) # couleurs des faces observées, ajoutées au vote de chacune
+            for center, face in votes.accepted(faces).items():
+                faces[center] = face
+                scan_metrics.append((center, frames, (datetime.now() - start).total_seconds()))
+    cv2.destroyAllWindows()
+    Calibration.save_profile(camera, profile) # le prochain scan commence étalonné
+    if SCAN_TIMING:
+        print(metrics_report())
+    return Assembly.assemble(faces)
+
+def metrics_report() -> str:
+    """
+    Résume la lecture de chaque face du dernier scan (scan_metrics).
+    Paramètres:     aucun.
+    Retourne:       (str) = une ligne par face : couleur du centre, images analysées avant validation, durée.
+    """
+    if not scan_metrics:
+        return "aucune face lue"
+    names = {color: key for key, color in KEY_COLORS.items()}
+    return "\n".join(f"face {names.get(center, center)} : {frames} images analysées, {duration:.1f} s" for center, frames, duration in scan_metrics)
+
+def scan_any_order(video:CameraStream) -> list:
+    """
+    Scanne les 6 faces du cube dans n'importe quel ordre et n'importe quelle orientation, sans attente entre deux faces.
+    Chaque face est identifiée par son centre ; son orientation est déduite des autres faces (Assembly.assemble).
+    Paramètres:     video (CameraStream) = caméra lue en continu.
+    Retourne:       (list) = représentation en liste de matrices du cube ; liste vide si le scan est interrompu.
+    """
+    faces = {} # matrice 3x3 de chaque face scannée, selon la couleur de son centre
+    camera = f"{CAMERA_SOURCE}:{video.width}x{video.height}" # identifiant du profil de couleurs
+    profile = Calibration.load_profile(camera, DEFAULT_PROFILE)
+    scan_metrics.clear()
+    while len(faces) < len(FACE_KEYS):
+        face = analize_face(video, text1="Montrez une face au choix", text2=f"{len(faces)}/{len(FACE_KEYS)} faces lues",
+                            profile=profile, scanned=set(faces))
+        if not running: # arrêt du programme
+            return []
+        faces[face[1][1]] = face
+    cv2.destroyAllWindows()
+    Calibration.save_profile(camera, profile) # le prochain scan commence étalonné
+    if SCAN_TIMING:
+        print(metrics_report())
+    return Assembly.assemble(faces)
+
+def scan_faces(video:CameraStream) -> list:
+    """
+    Scanne les 6 faces du cube, dans l'ordre, en guidant l'utilisateur (image de départ, vidéo entre deux faces).
+    Paramètres:     video (CameraStream) = caméra lue en continu.
+    Retourne:       (list) = représentation en liste de matrices du cube ; liste vide si le scan est interrompu.
+    """
+    keys = FACE_KEYS # ordre des faces
     faces = [None for _ in range(0, 6)]
+    camera = f"{CAMERA_SOURCE}:{video.width}x{video.height}" # identifiant du profil de couleurs
+    profile = Calibration.load_profile(camera, DEFAULT_PROFILE)
+    scan_metrics.clear()
     wait_with_image(
         video,
         G_path+"/videos/position_depart_cube.png",
@@ -243,7 +488,7 @@ def main() -> None:
     for i in range(len(keys)): # pour chaque face
         if not running: # arrêt du programme
             return []
-        faces[i] = analize_face(video, text1=f"Lecture de la face dont", text2=f"le centre est {keys[i]}...")
+        faces[i] = analize_face(video, text1=f"Lecture de la face dont", text2=f"le centre est {keys[i]}...", profile=profile, center=KEY_COLORS[keys[i]])
         if i < len(keys)-1 and running: # face suivante
             wait_with_video(
                 video,
@@ -252,7 +497,12 @@ def main() -> None:
                 text2=f"le centre est {keys[i+1]}..."
             ) # vidéo tuto : comment tourner le cube ?
     cv2.destroyAllWindows()
-    return [rot90_anticlockwise(faces[5]), faces[2], faces[1], faces[4], faces[3], faces[0]] # on tourne la face 1 pour correspondre à notre modèle de représentation
+    if not running: # scan interrompu pendant la dernière face
+        return []
+    Calibration.save_profile(camera, profile) # le prochain scan commence étalonné
+    if SCAN_TIMING:
+        print(metrics_report())
+    return Assembly.assemble({KEY_COLORS[key]: face for key, face in zip(keys, faces)}) # faces mal tournées corrigées
 
 def initInterface(path_logo:str, name:str) -> None:
     """
@@ -10,17 +10,19 @@ class App(Tk) :
     Classe modélisant l'UI de Rubix.
     Hérite de tkinter.Tk (UI faite avec tkinter).
     """                                                                                                      
-    def __init__(self, path_logo:str, win_title:str, win_resizable:bool=False, camera_anim_opt:list=["Rotation double","Rotation triple","Rotation horizontale","Rotation verticale","Rotation pivot","Pas de rotation"]) -> None:
+    def __init__(self, path_logo:str, win_title:str, win_resizable:bool=False, camera_anim_opt:list=["Rotation double","Rotation triple","Rotation horizontale","Rotation verticale","Rotation pivot","Pas de rotation"], scan_mode_opt:list=["Scan guidé","Scan libre","Scan par un coin"]) -> None:
         """
         Instancie un objet App.
         Paramètres: path_logo (str) = chemin d'accès au logo de Rubix.
                     win_title (str) = nom de la fenêtre.
                     win_resizable (bool) = True si fenêtre redimensionnable, False sinon.
                     camera_anim_opt (list) = Liste des modes d'animations possibles.
+                    scan_mode_opt (list) = Liste des modes de scan possibles.
         Retourne:   rien.
         """
         Tk.__init__(self) # initialisation fenêtre tkinter
         self.camera_anim_opt = camera_anim_opt
+        self.scan_mode_opt = scan_mode_opt
 
         # Paramètres de la fenêtre
         self.title(win_title)
@@ -76,6 +78,12 @@ class App(Tk) :
         self.camera_anim_opt = OptionMenu(self.frame,self.camera_anim_opt_var,*self.camera_anim_opt)
         self.camera_anim_opt.config(width=13,height=2)
         self.camera_anim_opt.grid(row=3, column=1, pady=5, padx=10)
+
+        self.scan_mode_var = StringVar()
+        self.scan_mode_var.set(self.scan_mode_opt[0])
+        self.scan_mode_opt = OptionMenu(self.frame,self.scan_mode_var,*self.scan_mode_opt)
+        self.scan_mode_opt.config(width=28)
+        self.scan_mode_opt.grid(row=4, column=0, columnspan=2, pady=5, padx=10)
         
         self.volume_scale_var = DoubleVar()
         self.volume_scale_var.set(2.0)
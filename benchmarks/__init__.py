@@ -0,0 +1,4 @@
+"""
+Scripts de mesure des performances de Rubix.
+À lancer depuis la racine du projet, par exemple : python -m benchmarks.solve_many
+"""
@@ -0,0 +1,37 @@
+"""
+Débit du rendu hors écran (images par seconde) des vidéos de résolution, selon le nombre de processus.
+Usage : python -m benchmarks.render [nombre_de_videos] [dossier_de_sortie]
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from Modelisation import Cutils
+from AnimEngine import GL_Headless
+from benchmarks.solve_many import gen_matrices
+
+def main(n:int=8, folder:str|None=None) -> None:
+    """
+    Rend n vidéos de résolution de cubes mélangés, avec 1, 2, 4... processus, et affiche le débit.
+    Paramètres:     n (int) = nombre de vidéos par mesure.
+                    folder (str|None) = dossier des vidéos ; dossier temporaire si None.
+    Retourne:       rien.
+    """
+    matrices = gen_matrices(n)
+    solutions = [formula.split() for formula in Cutils.solve_many(matrices)]
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = tmp if folder is None else folder
+        jobs = [(os.path.join(folder, f"resolution_{i}.mp4"), solutions[i], matrices[i]) for i in range(n)]
+        workers = 1
+        while workers <= multiprocessing.cpu_count():
+            start = time.perf_counter()
+            frames = sum(GL_Headless.render_many(jobs, workers=workers, anim_speed=6))
+            duration = time.perf_counter() - start
+            print(f"{workers} processus : {frames} images en {duration:.1f} s, {frames/duration:.1f} images/s")
+            workers *= 2
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]], *sys.argv[2:3])
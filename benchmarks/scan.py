@@ -0,0 +1,191 @@
+"""
+Latence et précision du scan sur des séances enregistrées (Scan.Offline), selon le nombre de processus.
+Sans dossier, des séances synthétiques sont générées (cubes mélangés, faces dessinées à plat avec des cases masquées,
+dans un ordre et une orientation aléatoires), ainsi que des séances où le cube est vu par un coin (Scan.Corner) :
+trois faces en perspective par image, deux positions du cube.
+Un dossier de séances contient des vidéos ou des dossiers d'images ; le fichier "<séance>.json" facultatif
+donne la représentation en liste de matrices attendue, pour mesurer la précision.
+Usage : python -m benchmarks.scan [nombre_de_seances] [dossier_de_seances]
+"""
+
+import json
+import math
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import cv2
+import numpy
+
+import Scan
+from Scan import Assembly, Offline
+from benchmarks.solve_many import gen_matrices
+
+SIDE, GAP = 54, 8 # taille des cases et écart entre elles (pixels)
+FACE_FRAMES, TURN_FRAMES = 8, 6 # images par face, images sans face entre deux faces (rotation du cube)
+CORNER_FRAMES = 10 # images par position du cube vu par un coin
+CORNER_SIZE = (150, 200) # côté d'une face vue par un coin (pixels)
+CORNER_ROTATION = 8 # rotation maximale du cube dans l'image (degrés)
+CORNER_PERSPECTIVE = 0.1 # déformation de perspective (agrandissement relatif d'une face à l'autre bord du cube)
+CORNER_POSES = ([5, 1, 4], [0, 3, 2]) # faces visibles de chaque position (indices de scan_order) : U, F, R puis D, B, L
+
+def scan_order(matrix:list) -> list:
+    """
+    Faces d'un cube dans l'ordre du scan guidé, tenues comme dans le tutoriel (voir Assembly.SCAN_TURNS).
+    Paramètres:     matrix (list) = représentation en liste de matrices du cube.
+    Retourne:       (list) = matrices 3x3 des faces, dans l'ordre de Scan.FACE_KEYS.
+    """
+    up = Scan.rot90_anticlockwise(Scan.rot90_anticlockwise(Scan.rot90_anticlockwise(matrix[0])))
+    return [matrix[5], matrix[2], matrix[1], matrix[4], matrix[3], up]
+
+def write_session(folder:str, matrix:list, rng:numpy.random.Generator) -> None:
+    """
+    Écrit une séance synthétique : les faces dans un ordre aléatoire, chacune tournée d'un nombre aléatoire de quarts de tour,
+    légèrement déplacée d'une image à l'autre, entière sur ses 2 premières images puis avec 0 à 2 cases masquées.
+    Paramètres:     folder (str) = dossier des images.
+                    matrix (list) = représentation en liste de matrices du cube.
+                    rng (numpy.random.Generator) = générateur aléatoire.
+    Retourne:       rien.
+    """
+    colors = {name: tuple(int(c) for c in reversed(rgb)) for name, rgb in zip(Scan.COLOR_NAMES, Scan.CAMERA_COLORS)} # BGR
+    os.makedirs(folder, exist_ok=True)
+    count = 0
+    faces = scan_order(matrix)
+    for f in rng.permutation(len(faces)):
+        face = Assembly.rotate(faces[f], rng.integers(0, 4))
+        x0, y0 = rng.integers(100, 400), rng.integers(50, 250)
+        for k in range(FACE_FRAMES):
+            image = numpy.full((480, 640, 3), 40, dtype=numpy.uint8)
+            x0, y0 = x0 + rng.integers(-3, 4), y0 + rng.integers(-3, 4)
+            hidden = rng.choice(9, rng.integers(0, 3) if k >= 2 else 0, replace=False)
+            for i in range(9):
+                if i not in hidden:
+                    x, y = x0 + (i % 3)*(SIDE + GAP), y0 + (i // 3)*(SIDE + GAP)
+                    cv2.rectangle(image, (int(x), int(y)), (int(x) + SIDE, int(y) + SIDE), colors[face[i // 3][i % 3]], -1)
+            cv2.imwrite(os.path.join(folder, f"{count:05d}.png"), image)
+            count += 1
+        for _ in range(TURN_FRAMES):
+            cv2.imwrite(os.path.join(folder, f"{count:05d}.png"), numpy.full((480, 640, 3), 40, dtype=numpy.uint8))
+            count += 1
+
+def write_corner_session(folder:str, matrix:list, rng:numpy.random.Generator) -> None:
+    """
+    Écrit une séance synthétique de cube vu par un coin : pour chacune des deux positions (CORNER_POSES), trois faces
+    tournées d'un nombre aléatoire de quarts de tour, en perspective, cases séparées par le plastique noir du cube ;
+    entières sur les 2 premières images puis avec 0 à 2 cases masquées.
+    Paramètres:     folder (str) = dossier des images.
+                    matrix (list) = représentation en liste de matrices du cube.
+                    rng (numpy.random.Generator) = générateur aléatoire.
+    Retourne:       rien.
+    """
+    colors = {name: tuple(int(c) for c in reversed(rgb)) for name, rgb in zip(Scan.COLOR_NAMES, Scan.CAMERA_COLORS)} # BGR
+    os.makedirs(folder, exist_ok=True)
+    faces = scan_order(matrix)
+    count = 0
+    for pose in CORNER_POSES:
+        drawn = [Assembly.rotate(faces[f], rng.integers(0, 4)) for f in pose]
+        size = rng.uniform(*CORNER_SIZE)
+        rotation = rng.uniform(-CORNER_ROTATION, CORNER_ROTATION)
+        # arêtes partant du coin (vers la droite, vers la gauche, vers le bas), d'une case de long
+        right, left, down = [numpy.array((math.cos(a), math.sin(a))) * size / 3
+                             for a in numpy.radians(numpy.array([-30, -150, 90]) + rotation)]
+        spans = ((left, right), (down, left), (right, down)) # (colonne suivante, ligne suivante) de chaque face, vue de l'extérieur
+        corner = numpy.array((rng.uniform(220, 420), rng.uniform(200, 280)))
+        for k in range(CORNER_FRAMES):
+            image = numpy.full((480, 640, 3), 40, dtype=numpy.uint8)
+            corner = corner + rng.integers(-3, 4, 2)
+            hidden = rng.choice(27, rng.integers(0, 3) if k >= 2 else 0, replace=False)
+
+            def project(col:float, row:float, columns:numpy.ndarray, rows:numpy.ndarray) -> numpy.ndarray:
+                point = col*columns + row*rows
+                return corner + point * (1 + CORNER_PERSPECTIVE * point[1] / size) # faces plus grandes vers le bas
+
+            for f, (face, (columns, rows)) in enumerate(zip(drawn, spans)):
+                body = [project(c, r, columns, rows) for c, r in ((0, 0), (3, 0), (3, 3), (0, 3))]
+                cv2.fillConvexPoly(image, numpy.rint(body).astype(numpy.int32), (10, 10, 10))
+                for i in range(9):
+                    if f*9 + i in hidden:
+                        continue
+                    c, r = i % 3, i // 3
+                    sticker = [project(c + dc, r + dr, columns, rows) for dc, dr in ((0.08, 0.08), (0.92, 0.08), (0.92, 0.92), (0.08, 0.92))]
+                    cv2.fillConvexPoly(image, numpy.rint(sticker).astype(numpy.int32), colors[face[r][c]], lineType=cv2.LINE_AA)
+            cv2.imwrite(os.path.join(folder, f"{count:05d}.png"), image)
+            count += 1
+        for _ in range(TURN_FRAMES):
+            cv2.imwrite(os.path.join(folder, f"{count:05d}.png"), numpy.full((480, 640, 3), 40, dtype=numpy.uint8))
+            count += 1
+
+def load_sessions(folder:str) -> tuple[list[str], list]:
+    """
+    Liste les séances d'un dossier et leur résultat attendu.
+    Paramètres:     folder (str) = dossier de séances.
+    Retourne:       (tuple) = chemins des séances, représentation attendue de chacune (None si inconnue).
+    """
+    sources, expected = [], []
+    for name in sorted(os.listdir(folder)):
+        if name.endswith(".json"):
+            continue
+        sources.append(os.path.join(folder, name))
+        truth = os.path.join(folder, os.path.splitext(name)[0] + ".json")
+        if os.path.exists(truth):
+            with open(truth, encoding="utf-8") as file:
+                expected.append(json.load(file))
+        else:
+            expected.append(None)
+    return sources, expected
+
+def report(results:list[dict], expected:list) -> None:
+    """
+    Affiche la latence par image, le nombre d'images avant validation de chaque face, et la précision.
+    Paramètres:     results (list[dict]) = résultats de Offline.scan_many.
+                    expected (list) = représentation attendue de chaque séance (None si inconnue).
+    Retourne:       rien.
+    """
+    timings = numpy.concatenate([result["timings"] for result in results]) * 1000
+    print(f"analyse : {timings.mean():.2f} ms/image en moyenne, {numpy.percentile(timings, 95):.2f} ms au 95e centile")
+    waits = [numpy.diff([-1] + result["accepted"]) for result in results if result["accepted"]]
+    if waits:
+        print(f"images avant validation d'une face (rotations comprises) : {numpy.concatenate(waits).mean():.1f}")
+    scanned = sum(1 for result in results if result["matrix"])
+    print(f"cubes complets : {scanned}/{len(results)}")
+    known = [(result["matrix"], truth) for result, truth in zip(results, expected) if truth is not None]
+    if known:
+        stickers = [numpy.mean(numpy.array(matrix) == numpy.array(truth)) if matrix else 0.0 for matrix, truth in known]
+        print(f"précision : {numpy.mean(stickers)*100:.1f} % des cases, {sum(s == 1 for s in stickers)}/{len(known)} cubes exacts")
+
+def main(n:int=8, folder:str|None=None) -> None:
+    """
+    Scanne les séances avec 1, 2, 4... processus et affiche le débit, puis la latence et la précision ;
+    sans dossier, mesure aussi la latence et la précision du scan par un coin.
+    Paramètres:     n (int) = nombre de séances synthétiques (sans dossier).
+                    folder (str|None) = dossier de séances enregistrées ; séances synthétiques si None.
+    Retourne:       rien.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        if folder is None:
+            rng = numpy.random.default_rng(0)
+            expected = gen_matrices(n)
+            sources = [os.path.join(tmp, f"seance_{i}") for i in range(n)]
+            for source, matrix in zip(sources, expected):
+                write_session(source, matrix, rng)
+        else:
+            sources, expected = load_sessions(folder)
+        workers = 1
+        while workers <= multiprocessing.cpu_count():
+            start = time.perf_counter()
+            results = Offline.scan_many(sources, workers=workers)
+            duration = time.perf_counter() - start
+            frames = sum(len(result["timings"]) for result in results)
+            print(f"{workers} processus : {len(sources)} séances en {duration:.1f} s, {frames/duration:.0f} images/s")
+            workers *= 2
+        report(results, expected)
+        if folder is None:
+            corners = [os.path.join(tmp, f"coin_{i}") for i in range(n)]
+            for source, matrix in zip(corners, expected):
+                write_corner_session(source, matrix, rng)
+            print("cube vu par un coin :")
+            report(Offline.scan_many(corners, workers=1, corner=True), expected)
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]], *sys.argv[2:3])
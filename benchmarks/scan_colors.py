@@ -0,0 +1,49 @@
+"""
+Coût de la classification des couleurs des cases d'une face, par image :
+ancienne méthode (un KDTree scipy construit pour chaque case) comparée à Scan.classify_colors (un seul calcul vectorisé).
+Usage : python -m benchmarks.scan_colors [nombre_d_images]
+"""
+
+import sys
+import time
+import numpy
+
+import Scan
+
+def kdtree_classify(samples:numpy.ndarray) -> list[str]:
+    """
+    Ancienne classification : construction d'un KDTree des couleurs de référence puis une requête, pour chaque case.
+    Paramètres:     samples (numpy.ndarray) = couleurs moyennes des cases (R, G, B).
+    Retourne:       (list[str]) = caractère représentant la couleur de chaque case.
+    """
+    from scipy.spatial import KDTree
+    face = []
+    for r, g, b in samples:
+        kdt_db = KDTree(Scan.REFERENCE_COLORS)
+        distance, index = kdt_db.query((r, g, b))
+        face.append(Scan.COLOR_NAMES[index])
+    return face
+
+def main(n:int=2000) -> None:
+    """
+    Affiche le temps moyen de classification des 9 cases d'une image, avec chaque méthode.
+    Paramètres:     n (int) = nombre d'images (9 cases aléatoires chacune).
+    Retourne:       rien.
+    """
+    frames = numpy.random.default_rng(0).integers(0, 256, size=(n, 9, 3))
+    methods = [("Scan.classify_colors", Scan.classify_colors)]
+    try:
+        import scipy
+        methods.insert(0, ("KDTree par case", kdtree_classify))
+    except ImportError:
+        print("scipy absent : ancienne méthode non mesurée")
+    results = []
+    for name, classify in methods:
+        start = time.perf_counter()
+        results.append([classify(samples) for samples in frames])
+        print(f"{name} : {(time.perf_counter()-start)/n*1e6:.1f} µs/image")
+    if len(results) == 2:
+        print("résultats identiques" if results[0] == results[1] else "résultats différents")
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,34 @@
+"""
+Débit de génération de cubes aléatoires : Cutils.gen_states (tirage uniforme, par lots) comparé à Cube.scramble (un cube à la fois).
+Usage : python -m benchmarks.scramble [nombre_de_cubes]
+"""
+
+import sys
+import time
+
+import Modelisation
+from Modelisation import Cutils
+
+def main(n:int=100000) -> None:
+    """
+    Affiche le nombre de cubes générés par seconde avec chaque méthode.
+    Paramètres:     n (int) = nombre de cubes générés par gen_states.
+    Retourne:       rien.
+    """
+    start = time.perf_counter()
+    Cutils.gen_states(n, seed=0)
+    print(f"gen_states : {n/(time.perf_counter()-start):.0f} cubes/s")
+    m = max(n // 100, 1)
+    start = time.perf_counter()
+    for _ in range(m):
+        cube = Modelisation.Cube()
+        cube.scramble()
+        cube.get_matrix()
+    print(f"Cube.scramble : {m/(time.perf_counter()-start):.0f} cubes/s")
+    m = max(n // 10000, 1)
+    start = time.perf_counter()
+    Cutils.gen_scrambles(m, seed=0, formulas=True)
+    print(f"gen_scrambles avec formules : {m/(time.perf_counter()-start):.1f} cubes/s")
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,48 @@
+"""
+Débit de résolution (résolutions par seconde) de Cutils.solve_many selon le nombre de processus.
+Usage : python -m benchmarks.solve_many [nombre_de_cubes]
+"""
+
+import multiprocessing
+import sys
+import time
+
+import Modelisation
+from Modelisation import Cutils
+
+def gen_matrices(n:int) -> list:
+    """
+    Génère n cubes mélangés.
+    Paramètres:     n (int) = nombre de cubes.
+    Retourne:       (list) = représentations en liste de matrices des cubes.
+    """
+    matrices = []
+    for _ in range(n):
+        cube = Modelisation.Cube()
+        cube.scramble()
+        matrices.append(cube.get_matrix())
+    return matrices
+
+def main(n:int=2000) -> None:
+    """
+    Affiche le débit de résolution séquentiel, puis pour 1, 2, 4... processus.
+    Paramètres:     n (int) = nombre de cubes résolus par mesure.
+    Retourne:       rien.
+    """
+    matrices = gen_matrices(n)
+    Cutils.get_formula_to_solve(matrices[0]) # chargement des tables de kociemba
+    start = time.perf_counter()
+    for m in matrices:
+        Cutils.get_formula_to_solve(m)
+    print(f"séquentiel : {n/(time.perf_counter()-start):.1f} résolutions/s")
+    workers = 1
+    while workers <= multiprocessing.cpu_count():
+        Cutils.get_pool(workers) # démarrage des processus hors mesure
+        start = time.perf_counter()
+        for _ in Cutils.solve_many(matrices, workers=workers):
+            pass
+        print(f"{workers} processus : {n/(time.perf_counter()-start):.1f} résolutions/s")
+        workers *= 2
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
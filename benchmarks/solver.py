@@ -0,0 +1,44 @@
+"""
+Comparaison du solveur en deux phases du projet (Csolver) avec la librairie kociemba :
+temps de chargement des tables, temps moyen de résolution et longueur moyenne des solutions.
+Usage : python -m benchmarks.solver [nombre_de_cubes]
+"""
+
+import sys
+import time
+
+import kociemba
+from Modelisation import Csolver, Cutils
+from benchmarks.solve_many import gen_matrices
+
+def measure(name:str, solve, k_strings:list[str]) -> None:
+    """
+    Affiche le temps du premier appel (chargement des tables), puis le temps moyen et la longueur moyenne des solutions.
+    Paramètres:     name (str) = nom du solveur.
+                    solve (function) = fonction de résolution d'une chaîne kociemba.
+                    k_strings (list[str]) = cubes à résoudre.
+    Retourne:       rien.
+    """
+    start = time.perf_counter()
+    solve(Cutils.SOLVED_K_STRING)
+    first = time.perf_counter() - start
+    lengths = []
+    start = time.perf_counter()
+    for k in k_strings:
+        lengths.append(len(solve(k).split()))
+    duration = time.perf_counter() - start
+    print(f"{name} : premier appel {first*1000:.1f} ms, {duration/len(k_strings)*1000:.1f} ms/cube, "
+          f"{sum(lengths)/len(lengths):.2f} mouvements en moyenne")
+
+def main(n:int=100) -> None:
+    """
+    Compare les deux solveurs sur n cubes mélangés.
+    Paramètres:     n (int) = nombre de cubes.
+    Retourne:       rien.
+    """
+    k_strings = [Cutils.get_k_string(m) for m in gen_matrices(n)]
+    measure("kociemba", kociemba.solve, k_strings)
+    measure("twophase", Csolver.solve, k_strings)
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
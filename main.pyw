@@ -5,11 +5,16 @@ import Modelisation
 import Scan
 from os import path
 from functools import partial
+from collections import deque
+import time
 
 G_path = path.realpath(__file__).replace("main.pyw","") # chemin absolu
 # Constantes
 NAME_INTERFACE = "Rubix"
+DEFAULT_TEXT = "Trophées NSI 2022 - Terminale"
 PATH_LOGO = G_path + "UI/images/logo.png"
+TIMING = False # affiche régulièrement la répartition du temps de chaque itération (interface / rendu 3D)
+SCAN_MODES = {"Scan guidé": (True, False), "Scan libre": (False, False), "Scan par un coin": (False, True)} # mode -> (tutorial, corner) de Scan.main
 DEFAULT_CUBE = [[['0', '0', '0'], ['0', 'y', '0'], ['0', '0', '0']], [['0', '0', '0'], ['0', 'r', '0'], ['0', '0', '0']], [['0', '0', '0'], ['0', 'g', '0'], ['0', '0', '0']], [['0', '0', '0'], ['0', 'o', '0'], ['0', '0', '0']], [['0', '0', '0'], ['0', 'b', '0'], ['0', '0', '0']], [['0', '0', '0'], ['0', 'w', '0'], ['0', '0', '0']]]
 
 def set_anim(anim_mode:str, anim_speed:float) -> None:
@@ -49,6 +54,74 @@ def set_volume(volume:float) -> None:
     global Rubix
     Rubix.sound_volume = volume
 
+def set_scan_mode(mode:str) -> None:
+    """
+    Change le mode du prochain scan par caméra.
+    Paramètres:     mode (str) = mode de scan (scan guidé, scan libre, scan par un coin ; voir SCAN_MODES).
+    Retourne:       rien.
+    """
+    global scan_tutorial, scan_corner
+    scan_tutorial, scan_corner = SCAN_MODES[mode]
+
+def apply_settings(*args) -> None:
+    """
+    Applique tous les réglages de l'interface (animation de caméra, vitesse, volume) au cube 3D.
+    Paramètres:     args = paramètres des traces tkinter (ignorés).
+    Retourne:       rien.
+    """
+    set_anim(Ui.camera_anim_opt_var.get(), float(Ui.cam_anim_scale_var.get()))
+    set_res_speed(Ui.anim_scale_var.get())
+    set_volume(float(Ui.volume_scale_var.get()))
+
+def bind_settings() -> None:
+    """
+    Associe chaque réglage de l'interface à sa fonction : un réglage n'est appliqué que lorsqu'il change (traces tkinter).
+    Paramètres:     aucun.
+    Retourne:       rien.
+    """
+    camera = lambda *args: set_anim(Ui.camera_anim_opt_var.get(), float(Ui.cam_anim_scale_var.get()))
+    Ui.camera_anim_opt_var.trace_add("write", camera)
+    Ui.cam_anim_scale_var.trace_add("write", camera)
+    Ui.anim_scale_var.trace_add("write", lambda *args: set_res_speed(Ui.anim_scale_var.get()))
+    Ui.volume_scale_var.trace_add("write", lambda *args: set_volume(float(Ui.volume_scale_var.get())))
+    Ui.scan_mode_var.trace_add("write", lambda *args: set_scan_mode(Ui.scan_mode_var.get()))
+
+def run_frame() -> None:
+    """
+    Itération de la boucle principale, planifiée dans la boucle d'évènements tkinter : rendu 3D, puis planification de la suivante.
+    Entre deux itérations, tkinter attend ses évènements sans consommer de processeur.
+    Mesure le temps pris par l'interface (retard sur l'heure prévue) et par le rendu 3D.
+    Paramètres:     aucun.
+    Retourne:       rien.
+    """
+    global next_frame
+    start = time.perf_counter()
+    ui_time = max(0.0, start - next_frame) # évènements tkinter traités après l'heure prévue de l'itération
+    if block_3d: # animation bloquée
+        interval = 1/AnimEngine.IDLE_FPS
+    else:
+        check_solve() # résolution en arrière-plan terminée ?
+        interval = AnimEngine.update(Rubix, wait=False) # actualisation
+    end = time.perf_counter()
+    frame_timing.append((ui_time, end - start))
+    if TIMING and len(frame_timing) == frame_timing.maxlen:
+        print(timing_report())
+        frame_timing.clear()
+    next_frame = max(end, start + interval)
+    Ui.after(int((next_frame - end)*1000), run_frame)
+
+def timing_report() -> str:
+    """
+    Résume la répartition du temps des dernières itérations de la boucle principale.
+    Paramètres:     aucun.
+    Retourne:       (str) = temps moyens (ms) de l'interface et du rendu 3D par itération.
+    """
+    if not frame_timing:
+        return "aucune itération"
+    ui = sum(t[0] for t in frame_timing) / len(frame_timing)
+    render = sum(t[1] for t in frame_timing) / len(frame_timing)
+    return f"{len(frame_timing)} itérations : interface {ui*1000:.2f} ms, rendu 3D {render*1000:.2f} ms par itération"
+
 def new_cube() -> None:
     """
     Crée un nouveau cube aléatoire (en variable globale) et l'affiche.
@@ -56,47 +129,67 @@ def new_cube() -> None:
     Renvoie:        rien.
     """
     global Rubix,Cube,Ui
+    cancel_solve() # résolution de l'ancien cube
     Cube, Rubix = None, None # réinitialisation
     Rubix = AnimEngine.init()
     Cube = Modelisation.Cube() # nouveau cube
     Cube.Cube_GL = Rubix # lien 3d/cube
     Cube.scramble() # mélange
     if "Ui" in globals(): # si l'interface est lancée, alors on la réinitialise
-        Ui.show_formule_resolution("Trophées NSI 2022 - Terminale")
+        Ui.show_formule_resolution(DEFAULT_TEXT)
         Ui.enable_resolve()
+        apply_settings() # réglages appliqués au nouveau cube 3D
     mtx = Cube.get_matrix()
     Rubix.load_color_matrix(mtx) # affichage cube
 
 def solve() -> None:
     """
-    Résout le Rubik's Cube en variable globale. Vérifie sa validité.
-    Affiche la liste des mouvements ; lance les animations 3D ; et la musique.
+    Lance la résolution du Rubik's Cube en variable globale, en arrière-plan : l'interface et la 3D restent actives.
+    Le résultat est traité par check_solve.
     Paramètres:     aucun.
     Retourne:       rien.
     """
-    global Rubix
-    global Cube
+    global solving
+    cancel_solve()
+    Ui.disable_resolve() # bouton résoudre non cliquable
+    Ui.show_formule_resolution("Calcul de la solution...")
+    solving = Modelisation.Cutils.solve_async(Cube.get_matrix())
+
+def check_solve() -> None:
+    """
+    Traite la résolution en arrière-plan si elle est terminée (appelée à chaque itération de la boucle principale).
+    Vérifie sa validité. Affiche la liste des mouvements ; lance les animations 3D ; et la musique.
+    Paramètres:     aucun.
+    Retourne:       rien.
+    """
+    global solving
+    if solving is None or not solving.done():
+        return
+    future, solving = solving, None
     try:
-        x = Cube.get_formula_to_solve()
-    except CombinaisonError as e: # cube invalide
+        x = future.result()
+    except (CombinaisonError, TimeoutError) as e: # cube invalide, ou pas de solution trouvée à temps
+        Ui.show_formule_resolution(DEFAULT_TEXT)
+        Ui.enable_resolve()
         Ui.show_error(str(e))
     else:
-        mvt_lst = []
-        mvt = ""
-        for char_id in range(0,len(x)) :
-            if x[char_id] == " " :
-                if "2" in mvt : # double mouvement : U2, R2...
-                    mvt_lst.append(mvt[0])
-                    mvt_lst.append(mvt[0])
-                else :
-                    mvt_lst.append(mvt)
-                mvt = ""
-            else :
-                mvt = mvt + x[char_id]
+        mvt_lst = x.split() # les doubles mouvements (U2, R2...) sont animés en une seule rotation de 180°
         Ui.show_formule_resolution(x)
-        Ui.update()
-        Ui.disable_resolve() # bouton résoudre non cliquable
         Rubix.play_sequence(mvt_lst, awaited=False, enable_sound=True) # animations et sons
+        set_res_speed(Ui.anim_scale_var.get()) # vitesse choisie dans l'interface
+
+def cancel_solve() -> None:
+    """
+    Annule la résolution en arrière-plan (cube remplacé) : son résultat sera ignoré.
+    Paramètres:     aucun.
+    Retourne:       rien.
+    """
+    global solving
+    if solving is not None:
+        solving.cancel() # sans effet si le calcul a déjà commencé
+        solving = None
+        Ui.show_formule_resolution(DEFAULT_TEXT)
+        Ui.enable_resolve()
 
 def pause() -> None:
     """
@@ -128,7 +221,7 @@ def launch_camera() -> None:
     Ui.update()
     AnimEngine.stop() # arrêt de l'interface 3d
     try:
-        matrice = Scan.main() # récupération résultat caméra
+        matrice = Scan.main(tutorial=scan_tutorial, corner=scan_corner) # récupération résultat caméra
         assert len(matrice) == 6 # valeur [] retournée si arrêt du programme
     except CameraError as e: # pb de lecture
         AnimEngine.main() # relance 3d
@@ -143,11 +236,12 @@ def launch_camera() -> None:
         AnimEngine.main()
         Ui.go()
         Ui.update()
+        cancel_solve() # résolution de l'ancien cube
         Cube = Modelisation.CubeByMatrix(matrice) # nouveau cube
         try:
-            Cube.get_formula_to_solve() # test de validité
-        except CombinaisonError:
-            Ui.show_warning("Le cube scanné est invalide. Veuillez le corriger !")
+            Cube.validate() # test de validité
+        except CombinaisonError as e:
+            Ui.show_warning("Le cube scanné est invalide. Veuillez le corriger !\n" + str(e))
             mat = Cube.get_matrix()
             for i in range(0, 6):
                 mat[i][1][1] = DEFAULT_CUBE[i][1][1] # on fixe les centres
@@ -209,9 +303,9 @@ def confirm_editor(editor:Editor.ToplevelApp) -> None:
                     m[-1][-1].append("0") # valeur par défaut
                     redo = True
     try:
-        Modelisation.CubeByMatrix(m).get_formula_to_solve() # vérification solvabilité
-    except CombinaisonError:
-        Ui.show_warning("Le cube n'est pas valide !")
+        Modelisation.CubeByMatrix(m).validate() # vérification solvabilité
+    except CombinaisonError as e:
+        Ui.show_warning("Le cube n'est pas valide !\n" + str(e))
         editor.destroy()
         launch_editor(m) # nouvel éditeur
     else:
@@ -223,6 +317,7 @@ def confirm_editor(editor:Editor.ToplevelApp) -> None:
             editor.destroy()
             block_3d = False
             AnimEngine.main()
+            cancel_solve() # résolution de l'ancien cube
             Cube = Modelisation.CubeByMatrix(m) # nouveau cube valide
             Cube.Cube_GL = Rubix
             Rubix.load_color_matrix(Modelisation.Cutils.copy_3by3(m)) # affichage cube
@@ -234,14 +329,16 @@ def stop_execution() -> None:
     Paramètres:     aucun.
     Retourne:       rien.
     """
-    global execution
-    execution = False
+    Ui.quit() # fin de la boucle d'évènements tkinter
 
 if __name__ == "__main__" : # si le script est exécuté lui-même
 
     # Variants de boucle pour exécution
-    execution = True
     block_3d = False # animation 3D
+    solving = None # résolution en arrière-plan (concurrent.futures.Future), None si aucune
+    next_frame = time.perf_counter() # heure prévue de la prochaine itération
+    frame_timing = deque(maxlen=300) # (temps interface, temps rendu 3D) des dernières itérations, en secondes
+    scan_tutorial, scan_corner = Scan.TUTORIAL, Scan.CORNER_VIEW # mode de scan (réglable dans l'interface)
 
     # Nouveau cube
     new_cube()
@@ -250,25 +347,23 @@ if __name__ == "__main__" : # si le script est exécuté lui-même
     Scan.initInterface(PATH_LOGO, NAME_INTERFACE+" Scanner")
 
     # Config interface graphique
-    Ui = Base.App(PATH_LOGO, NAME_INTERFACE+" UI")
+    Ui = Base.App(PATH_LOGO, NAME_INTERFACE+" UI", scan_mode_opt=list(SCAN_MODES))
+    Ui.scan_mode_var.set("Scan par un coin" if scan_corner else "Scan guidé" if scan_tutorial else "Scan libre")
     Ui.cam_anim_scale_var.set(Rubix.camera_speed)
     Ui.new_color_btn.configure(command=new_cube)
     Ui.resolve_btn.configure(command=solve)
-    Ui.volume_scale_wd.configure(command=lambda x: set_volume(float(Ui.volume_scale_var.get()))) # changement volume
     Ui.pause_btn.configure(command=pause)
     Ui.scan_cube_btn.configure(command=launch_camera)
     Ui.resume_btn.configure(command=resume)
     Ui.enter_cube_btn.configure(command=launch_editor)
     Ui.protocol("WM_DELETE_WINDOW", stop_execution) # croix rouge = arrêt de l'exécution
+    bind_settings() # réglages appliqués à chaque changement
+    apply_settings()
     
     # Configuration modélisation 3D
     AnimEngine.initInterface(PATH_LOGO, NAME_INTERFACE+" 3D")
     AnimEngine.main()
 
-    while execution: # boucle principale
-        Ui.update() # actualisation interface graphique
-        if not block_3d: # animation bloquée
-            set_anim(Ui.camera_anim_opt_var.get(), float(Ui.cam_anim_scale_var.get())) # actualisation animation
-            set_res_speed(Ui.anim_scale_var.get()) # actualisation vitesse
-            set_volume(float(Ui.volume_scale_var.get())) # actualisation volume
-            AnimEngine.update(Rubix) # actualisation
\ No newline at end of file
+    # Boucle principale : évènements tkinter et itérations planifiées (run_frame)
+    Ui.after(0, run_frame)
+    Ui.mainloop()
\ No newline at end of file
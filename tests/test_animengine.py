@@ -0,0 +1,39 @@
+"""
+Tests du regroupement des mouvements animés (AnimEngine), sans fenêtre OpenGL.
+"""
+
+import os
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import AnimEngine
+from AnimEngine.GL_Headless import FrameWriter
+
+import numpy
+
+def groups(sequence:list[str]) -> list[list[str]]:
+    """
+    Découpe une séquence en groupes de mouvements animés ensemble.
+    """
+    cube = AnimEngine.EntireCube.__new__(AnimEngine.EntireCube) # sans contexte OpenGL
+    cube.async_slices_moves, cube.index_move = sequence, 0
+    found = []
+    while cube.index_move < len(sequence):
+        found.append(cube.next_moves_group())
+        cube.index_move += len(found[-1])
+    return found
+
+def test_parallel_moves_are_grouped():
+    assert groups(["R", "L'", "U", "D", "E'", "F"]) == [["R", "L'"], ["U", "D", "E'"], ["F"]]
+
+def test_quarter_and_half_turns_are_not_grouped():
+    assert groups(["U", "D2", "R2", "L2", "M"]) == [["U"], ["D2"], ["R2", "L2"], ["M"]]
+
+def test_fuse_moves():
+    assert AnimEngine.fuse_moves(["R", "L", "R"]) == ["R2", "L"]
+    assert AnimEngine.fuse_moves(["U", "U'", "F"]) == ["F"]
+
+def test_frame_writer_creates_directory(tmp_path):
+    writer = FrameWriter(str(tmp_path / "images" / "cube.png"), 30, (8, 6))
+    writer.write(numpy.zeros((6, 8, 3), dtype=numpy.uint8))
+    writer.close()
+    assert (tmp_path / "images" / "cube_00000.png").exists()
@@ -0,0 +1,55 @@
+"""
+Tests du cache de solutions (Modelisation.Ccache).
+"""
+
+from Modelisation.Ccache import SolutionCache
+from Modelisation.Cstate import State, ROTATIONS
+from Modelisation.Cutils import gen_states
+
+import kociemba
+import numpy
+
+def recolor(state:State, colors:str) -> State:
+    """
+    Change les couleurs d'un cube : la couleur SOLVED[i] devient colors[i].
+    """
+    lut = numpy.arange(256, dtype=numpy.uint8)
+    lut[numpy.frombuffer(b"yrgobw", dtype=numpy.uint8)] = numpy.frombuffer(colors.encode(), dtype=numpy.uint8)
+    return State(lut[state.facelets])
+
+def test_rotated_and_recolored_cube_hits_cache():
+    calls = []
+    cache = SolutionCache(lambda k: calls.append(k) or kociemba.solve(k))
+    state = State(gen_states(1, seed=3)[0])
+    cache.solve(state)
+    for p, colors in ((ROTATIONS[7], "yrgobw"), (ROTATIONS[0], "wbogry"), (ROTATIONS[19], "gyrwbo")):
+        other = recolor(State(state.facelets[p]), colors)
+        formula = cache.solve(other)
+        other.apply(formula)
+        assert other.is_solved()
+    assert len(calls) == 1
+    assert cache.cache_info()["hits"] == 3
+
+def test_disk_tier(tmp_path):
+    state = State(gen_states(1, seed=4)[0])
+    cache = SolutionCache(kociemba.solve, path=str(tmp_path / "cache"))
+    formula = cache.solve(state)
+    cache.close_disk()
+    cache = SolutionCache(lambda k: None, path=str(tmp_path / "cache"))
+    assert cache.solve(state) == formula
+    assert cache.cache_info()["disk_hits"] == 1
+    cache.close_disk()
+
+def test_disk_tier_is_per_solver(tmp_path):
+    state = State(gen_states(1, seed=5)[0])
+    cache = SolutionCache(lambda k: "R", path=str(tmp_path / "cache"), namespace="kociemba")
+    cache.solve(state)
+    cache.namespace = "twophase"
+    cache.clear()
+    calls = []
+    cache.solver = lambda k: calls.append(k) or kociemba.solve(k)
+    formula = cache.solve(state)
+    assert len(calls) == 1 and cache.cache_info()["disk_hits"] == 0
+    state.apply(formula)
+    assert state.is_solved()
+    cache.close_disk()
@@ -0,0 +1,49 @@
+"""
+Tests du solveur en deux phases (Modelisation.Csolver).
+"""
+
+from Exceptions import CombinaisonError
+from Modelisation import Csolver
+from Modelisation.Cstate import State
+from Modelisation.Cutils import gen_states, get_k_string, SOLVED_K_STRING
+
+import pytest
+
+@pytest.mark.parametrize("row", gen_states(3, seed=1))
+def test_solution_solves_cube(row):
+    state = State(row)
+    formula = Csolver.solve(get_k_string(state.to_matrix()))
+    assert len(formula.split()) <= Csolver.MAX_LENGTH
+    state.apply(formula)
+    assert state.is_solved()
+
+def test_timeout_keeps_best_solution():
+    state = State(gen_states(1, seed=2)[0])
+    formula = Csolver.solve(get_k_string(state.to_matrix()), max_length=0, timeout=0.5)
+    state.apply(formula)
+    assert state.is_solved()
+
+def test_timeout_without_solution():
+    k = get_k_string(State(gen_states(1, seed=2)[0]).to_matrix())
+    with pytest.raises(TimeoutError):
+        Csolver.solve(k, timeout=0.0)
+
+def test_solved_cube():
+    assert Csolver.solve(SOLVED_K_STRING) == ""
+
+def test_unsolvable_cube():
+    a, b, c = Csolver.CORNER_FACELETS[0] # coin URF tourné sur lui-même
+    k = list(SOLVED_K_STRING)
+    k[a], k[b], k[c] = k[c], k[a], k[b]
+    k = str().join(k)
+    with pytest.raises(CombinaisonError):
+        Csolver.solve(k)
+
+def test_generate_tables_replaces_file(tmp_path):
+    filename = tmp_path / "tables.bin"
+    filename.write_bytes(b"incomplet")
+    Csolver.generate_tables(str(filename))
+    assert [p.name for p in tmp_path.iterdir()] == ["tables.bin"]
+    assert filename.read_bytes().startswith(Csolver.MAGIC)
+    tables = Csolver.Tables(str(filename))
+    assert (tables.twist_slice_prun == Csolver.get_tables().twist_slice_prun).all()
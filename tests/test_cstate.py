@@ -0,0 +1,51 @@
+"""
+Tests de la représentation compacte (Modelisation.Cstate), comparée à pycuber.
+"""
+
+from Modelisation.Cstate import State, MOVES, ROTATIONS, compile_formula, parse_formula
+from Modelisation.Cutils import convert_to_matrix
+
+import pycuber as pc
+import pytest
+import random
+
+def random_formula(rng:random.Random, length:int=30) -> str:
+    """
+    Tire une formule aléatoire parmi tous les mouvements connus de Cstate (notation pycuber : X2 plutôt que X2').
+    """
+    names = [name for name in MOVES if not name.endswith(("2'", "'2"))]
+    return " ".join(rng.choice(names) for _ in range(length))
+
+@pytest.mark.parametrize("seed", range(20))
+def test_apply_matches_pycuber(seed):
+    formula = random_formula(random.Random(seed))
+    state = State()
+    state.apply(formula)
+    cube = pc.Cube()
+    cube(formula)
+    assert state.to_matrix() == convert_to_matrix(cube)
+
+@pytest.mark.parametrize("seed", range(20))
+def test_compile_formula_matches_apply(seed):
+    formula = random_formula(random.Random(seed))
+    state = State()
+    for step in formula.split():
+        state.apply(step)
+    assert (State().facelets[compile_formula(formula)] == state.facelets).all()
+
+def test_wide_moves():
+    assert (compile_formula("r") == compile_formula("R M'")).all()
+    assert (compile_formula("Rw2") == compile_formula("r2")).all()
+    assert (compile_formula("u'") == compile_formula("U' E")).all()
+    assert (compile_formula("f") == compile_formula("F S")).all()
+
+def test_parse_formula_rejects_unknown_moves():
+    with pytest.raises(ValueError):
+        parse_formula("R U3")
+
+def test_rotations_keep_cube_solved():
+    assert len(ROTATIONS) == 24
+    assert len({p.tobytes() for p in ROTATIONS}) == 24
+    solved = State().facelets
+    for p in ROTATIONS:
+        assert State(solved[p]).is_solved()
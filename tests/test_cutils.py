@@ -0,0 +1,38 @@
+"""
+Tests des fonctions auxiliaires (Modelisation.Cutils) : résolution en parallèle.
+"""
+
+from Modelisation import Cutils
+from Modelisation.Cstate import State
+
+import pytest
+
+@pytest.fixture
+def pools():
+    yield
+    Cutils.close_pools()
+
+def test_solve_many_gen_states(pools):
+    states = Cutils.gen_states(3, seed=1)
+    formulas = list(Cutils.solve_many(states, workers=2))
+    assert len(formulas) == 3
+    for row, formula in zip(states, formulas):
+        assert isinstance(formula, str)
+        state = State(row.copy())
+        state.apply(formula)
+        assert state.is_solved()
+
+def test_solve_many_reports_invalid_cube(pools):
+    mtx = State().to_matrix()
+    mtx[0][0][0] = "r"
+    results = list(Cutils.solve_many([mtx, State()], workers=1))
+    assert isinstance(results[0], Cutils.CombinaisonError)
+    state = State()
+    state.apply(results[1])
+    assert state.is_solved()
+
+def test_close_pools_waits_for_pending_tasks():
+    results = Cutils.get_pool(1).map_async(Cutils._solve_matrix, [State(row).to_matrix() for row in Cutils.gen_states(4, seed=2)])
+    Cutils.close_pools()
+    assert results.ready() and all(isinstance(r, str) for r in results.get())
+    assert not Cutils._pools
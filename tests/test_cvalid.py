@@ -0,0 +1,50 @@
+"""
+Tests de la vérification de validité (Modelisation.Cvalid).
+"""
+
+from Modelisation import Cvalid
+from Modelisation.Cstate import State, FACES
+from Modelisation.Csolver import CORNER_FACELETS, EDGE_FACELETS
+from Modelisation.Cutils import gen_states, get_k_string
+
+import pytest
+
+def from_k_string(k:str) -> list:
+    """
+    Représentation en liste de matrices d'une chaîne kociemba (ordre U, R, F, D, L, B), couleurs = lettres des faces.
+    """
+    s = str().join(k["URFDLB".index(f)*9:"URFDLB".index(f)*9+9] for f in FACES)
+    return State.from_string(s).to_matrix()
+
+def swap(k:str, moves:dict) -> str:
+    """
+    Déplace des cases d'une chaîne kociemba : la case i prend la couleur de la case moves[i].
+    """
+    return str().join(k[moves.get(i, i)] for i in range(54))
+
+@pytest.fixture(params=range(4))
+def k(request):
+    return get_k_string(State(gen_states(1, seed=request.param)[0]).to_matrix())
+
+def test_valid_cube(k):
+    assert Cvalid.diagnose(from_k_string(k)) == []
+
+def test_twisted_corner(k):
+    a, b, c = CORNER_FACELETS[0]
+    problems = Cvalid.diagnose(from_k_string(swap(k, {a: c, b: a, c: b})))
+    assert problems == ["un coin est tourné sur lui-même"]
+
+def test_flipped_edge(k):
+    a, b = EDGE_FACELETS[3]
+    problems = Cvalid.diagnose(from_k_string(swap(k, {a: b, b: a})))
+    assert problems == ["une arête est retournée"]
+
+def test_swapped_pieces(k):
+    (a, b), (c, d) = EDGE_FACELETS[0], EDGE_FACELETS[5]
+    problems = Cvalid.diagnose(from_k_string(swap(k, {a: c, c: a, b: d, d: b})))
+    assert problems == ["deux pièces sont échangées"]
+
+def test_validate_raises(k):
+    a, b = EDGE_FACELETS[3]
+    with pytest.raises(Exception, match="arête est retournée"):
+        Cvalid.validate(from_k_string(swap(k, {a: b, b: a})))
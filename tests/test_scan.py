@@ -0,0 +1,61 @@
+"""
+Tests du placement de la grille (Scan.Grid) et de l'assemblage des faces (Scan.Assembly), sur des données synthétiques,
+et du résumé des durées de lecture.
+"""
+
+from Modelisation.Cstate import State, SOLVED, FACES
+from Modelisation.Cutils import gen_states
+from Scan import Assembly, Grid
+import Scan
+
+import math
+import numpy
+import pytest
+
+def synthetic_grid(angle:float, pitch:float=40.0, origin=(100.0, 80.0)) -> numpy.ndarray:
+    """
+    Centres des 9 cases d'une face tournée de angle (degrés), dans l'ordre de lecture.
+    """
+    a = math.radians(angle)
+    basis = pitch * numpy.array([[math.cos(a), -math.sin(a)], [math.sin(a), math.cos(a)]])
+    return (Grid.GRID @ basis.T + origin).astype(numpy.float32)
+
+@pytest.mark.parametrize("angle", [0, 15, -30, 40])
+def test_fit_grid_full(angle):
+    centers = synthetic_grid(angle)
+    fitted, cells = Grid.fit_grid(centers, numpy.full(9, 30.0))
+    assert numpy.abs(fitted - centers).max() < 1.0
+    assert cells.tolist() == list(range(9))
+
+def test_fit_grid_missing_cells_and_outlier():
+    centers = synthetic_grid(10)
+    rng = numpy.random.default_rng(0)
+    kept = [0, 2, 3, 4, 6, 8] # cases 1, 5 et 7 non détectées
+    candidates = numpy.vstack([centers[kept] + rng.normal(0, 1, (len(kept), 2)), [[400.0, 300.0]]]).astype(numpy.float32)
+    fitted, cells = Grid.fit_grid(candidates, numpy.full(len(candidates), 30.0))
+    assert numpy.abs(fitted - centers).max() < 3.0
+    assert cells.tolist() == [0, -1, 1, 2, 3, -1, 4, -1, 5]
+
+def test_fit_grid_too_few_cells():
+    centers = synthetic_grid(0)[[0, 1, 2]]
+    assert Grid.fit_grid(centers, numpy.full(3, 30.0)) is None
+
+@pytest.mark.parametrize("seed", range(4))
+def test_orientations_recover_scanned_turns(seed):
+    mtx = State(gen_states(1, seed=seed)[0]).to_matrix()
+    rng = numpy.random.default_rng(seed)
+    turns = {color: int(rng.integers(4)) for color in SOLVED}
+    # faces telles que scannées : tourner de turns + SCAN_TURNS redonne la face du cube
+    faces = {color: Assembly.rotate(mtx[f], -(turns[color] + Assembly.SCAN_TURNS[FACES[f]])) for f, color in enumerate(SOLVED)}
+    assert turns in Assembly.orientations(faces)
+    assert Assembly.orientations(faces) == [turns]
+    assert Assembly.assemble(faces) == mtx
+
+def test_assemble_solved_cube():
+    mtx = State().to_matrix()
+    faces = {color: mtx[f] for f, color in enumerate(SOLVED)}
+    assert Assembly.assemble(faces) == mtx
+
+def test_metrics_report_names_faces(monkeypatch):
+    monkeypatch.setattr(Scan, "scan_metrics", [("w", 12, 1.25), ("g", 30, 3.0)])
+    assert Scan.metrics_report().splitlines() == ["face blanc : 12 images analysées, 1.2 s", "face vert : 30 images analysées, 3.0 s"]